@@ -1,6 +1,7 @@
 import os
 import logging
-from logging.handlers import RotatingFileHandler
+from contextlib import asynccontextmanager
+from functools import partial
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -8,28 +9,64 @@ from fastapi.responses import JSONResponse  # Make sure to import JSONResponse
 from main.problem_generator.problem_generator_route import router as problem_generator_router
 from main.problem_submission.problem_submission_route import router as problem_submission_router
 from main.codeassist_chat.codeassist_chat_router import router as codeassist_chat_router
+from main.problem_submission.judge0_router import close_judge0_router
+from main.problem_submission.submission_scheduler import close_submission_scheduler
+from main.problem_submission.verdict_store import close_verdict_store
+from main.problem_submission.verdict_broadcaster import close_verdict_broadcaster
+from main.problem_submission.execution_backend import close_local_execution_backend
+from main.problem_submission.problem_submission_service import ProblemSubmissionService
+from main.problem_generator.problem_generator_service import ProblemGeneratorService
+from main.problem_generator.problem_pool import get_problem_pool, close_problem_pool
+from main.problem_generator.problem_repository import close_problem_repository
+from main.problem_generator.similarity_index import close_similarity_index
+from main.codeassist_chat.codeassist_chat_service import CodeAssistChatService
 
 # Import SlowAPI components
 # from slowapi import Limiter
 from main.shared.rate_limiter import limiter
+from main.shared.deadline import DeadlineMiddleware
+from main.shared.debug_capture import close_debug_capture
+from main.shared.logging_setup import configure_logging, stop_logging
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 
 load_dotenv()
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # No-op on first start (configured at import); re-attaches logging after a previous shutdown
+    configure_logging("app.log")
+    # Build the app-lifetime services once; routers get them via main.shared.dependencies
+    app.state.problem_submission_service = ProblemSubmissionService()
+    generator_service = ProblemGeneratorService()
+    # Pooled problems must be new; a live request would rather get a near-duplicate than nothing.
+    # Background refills aren't latency-bound, so they don't race speculative generations.
+    generator_service.problem_pool = get_problem_pool(
+        partial(generator_service.generate_new_problem, reject_duplicates=True, speculation=1)
+    )
+    if generator_service.problem_pool is not None:
+        generator_service.problem_pool.start()
+    app.state.problem_generator_service = generator_service
+    app.state.codeassist_chat_service = CodeAssistChatService()
+    yield
+    # Release the shared Judge0 connection pool and verdict store on shutdown
+    await close_problem_pool()
+    await close_submission_scheduler()
+    await close_verdict_broadcaster()
+    await close_local_execution_backend()
+    await close_judge0_router()
+    close_verdict_store()
+    close_problem_repository()
+    close_similarity_index()
+    close_debug_capture()
+    stop_logging()
+
+app = FastAPI(lifespan=lifespan)
 app.state.limiter = limiter
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        RotatingFileHandler("app.log", maxBytes=10000000, backupCount=5),
-        logging.StreamHandler(),
-    ],
-)
+# Configure logging: handlers run on a background thread fed by a queue
+configure_logging("app.log")
 
 # Add rate limit middleware - this must be added before CORS middleware
 app.add_middleware(SlowAPIMiddleware)
@@ -47,6 +84,14 @@ async def custom_rate_limit_handler(request: Request, exc: RateLimitExceeded):
         headers={"Retry-After": "60"}  # Fixed 60 seconds for 3/minute limit
     )
 
+# Give every request a deadline that bounds its outbound Judge0 calls; SSE streams keep their own timeout
+app.add_middleware(
+    DeadlineMiddleware,
+    default_seconds=float(os.getenv("REQUEST_DEADLINE_SECONDS", "60")),
+    max_seconds=float(os.getenv("REQUEST_DEADLINE_MAX_SECONDS", "120")),
+    exempt_paths=["/submissions-stream"],
+)
+
 # Apply CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -1,6 +1,6 @@
 from typing import Dict, List, Any, Tuple
 from main.type_mapping_system.java.java_type_mapper import JavaTypeMapper
-from main.type_mapping_system.java.java_name_converter import to_java_name
+from main.type_mapping_system.problem_plan import get_problem_plan
 from .base_generator import BaseBoilerplateGenerator
 
 class JavaBoilerplateGenerator(BaseBoilerplateGenerator):
@@ -200,25 +200,13 @@ class JavaBoilerplateGenerator(BaseBoilerplateGenerator):
     def convert_to_java_boilerplate(self, structure: Dict) -> str:
         """Convert problem structure to Java boilerplate code."""
         try:
-            # Get function name in Java convention
-            function_name = to_java_name(structure["function_name"])
-            
-            # Parse output type
-            output_type, _ = self.parse_input_field(
-                structure["output_structure"]["Output Field"]
-            )
-            java_output_type = JavaBoilerplateGenerator.convert_to_java_type(output_type)
-
-            # Parse input parameters
-            params = []
-            for input_field in structure["input_structure"]:
-                java_type, param_name = self.parse_input_field(
-                    input_field["Input Field"]
-                )
-                type_hint = JavaBoilerplateGenerator.convert_to_java_type(java_type)
-                # Convert parameter name using the centralized name converter
-                java_param_name = to_java_name(param_name)
-                params.append(f"{type_hint} {java_param_name}")
+            # Names and Java types come from the problem's precompiled plan
+            plan = get_problem_plan(structure)
+            if not plan.java_function_name:
+                raise ValueError("Missing function_name")
+            function_name = plan.java_function_name
+            java_output_type = plan.output.java_type
+            params = [f"{param.java_type} {param.java_name}" for param in plan.params]
 
             # Construct the boilerplate
             boilerplate = f"""public {java_output_type} {function_name}({", ".join(params)}) {{
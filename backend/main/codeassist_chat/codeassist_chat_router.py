@@ -1,14 +1,15 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 from .codeassist_chat_service import CodeAssistChatService
+from main.shared.dependencies import get_codeassist_chat_service
+from main.shared.logging_setup import log_text
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-chat_service = CodeAssistChatService()
 
 class TestCase(BaseModel):
     input: List[Any]
@@ -51,14 +52,18 @@ from main.shared.rate_limiter import limiter
 @router.post("/chat")
 @limiter.limit("3/minute")  
 # Need to include request in the function for ratelimiting
-async def chat(request: Request, chat_request: ChatRequest):
+async def chat(
+    request: Request,
+    chat_request: ChatRequest,
+    chat_service: CodeAssistChatService = Depends(get_codeassist_chat_service)
+):
     """
     Chat endpoint with rate limiting of 3 requests per minute
     """
     try:
         logger.info("=== Chat Request ===")
         logger.info(f"User ID: {chat_request.context.userId}")
-        logger.info(f"Message: {chat_request.message}")
+        logger.debug("Message: %s", log_text(chat_request.message))
         
         # Get the response generator
         response_generator = chat_service.get_chat_response(
@@ -0,0 +1,86 @@
+import re
+from typing import Any, Iterable, List, Optional, Tuple
+
+from main.shared.incremental_json import JSONPath
+from main.type_mapping_system.problem_plan import (
+    ParamPlan, ProblemPlanException, encode_input, field_of, param_plan,
+)
+
+# Same rule as the Output Field pattern in the function schema: one concrete type
+_ALTERNATIVE = re.compile(r"\bor\b")
+
+class GenerationAborted(ValueError):
+    """Raised mid-stream when a generated problem is already known to be invalid."""
+    pass
+
+class ProblemArgumentValidator:
+    """
+    Checks a generate_programming_problem call while its arguments stream in.
+
+    Used as the on_value callback of an IncrementalJSONParser, it raises
+    GenerationAborted on the first field that would make the problem
+    unusable, so the rest of the generation need not be paid for:
+      - an input or output type JavaTypeMapper doesn't know (it maps to Object),
+      - an Output Field offering alternatives ("int or str result"),
+      - a test case whose input doesn't fit input_structure,
+      - a tag outside the schema's enum.
+    Test cases that arrive before input_structure are checked once it completes.
+    """
+
+    def __init__(self, allowed_tags: Iterable[str]):
+        self.allowed_tags = frozenset(allowed_tags)
+        self._params: Optional[Tuple[ParamPlan, ...]] = None
+        self._unchecked_test_cases: List[Tuple[int, Any]] = []
+
+    def __call__(self, path: JSONPath, value: Any) -> None:
+        if len(path) == 3 and path[:2] == ("structure", "input_structure"):
+            self._check_field(value, "Input")
+        elif path == ("structure", "input_structure"):
+            self._params = tuple(self._check_field(entry, "Input") for entry in value)
+            for index, test_case in self._unchecked_test_cases:
+                self._check_test_case(index, test_case)
+            self._unchecked_test_cases = []
+        elif path == ("structure", "output_structure"):
+            self._check_field(value, "Output")
+        elif len(path) == 2 and path[0] == "test_cases":
+            if self._params is None:
+                self._unchecked_test_cases.append((path[1], value))
+            else:
+                self._check_test_case(path[1], value)
+        elif len(path) == 2 and path[0] == "tags":
+            if value not in self.allowed_tags:
+                raise GenerationAborted(f"Unknown tag {value!r}")
+
+    def _check_field(self, entry: Any, kind: str) -> ParamPlan:
+        if not isinstance(entry, dict):
+            raise GenerationAborted(f"{kind} field must be an object, got {entry!r}")
+        try:
+            field = field_of(entry, kind)
+            if kind == "Output" and _ALTERNATIVE.search(field):
+                raise GenerationAborted(f"Output Field must name one type: {field!r}")
+            param = param_plan(field)
+        except ProblemPlanException as e:
+            raise GenerationAborted(str(e))
+        except (AttributeError, TypeError):
+            raise GenerationAborted(f"Invalid {kind} Field: {entry!r}")
+        if "Object" in param.java_type:
+            raise GenerationAborted(f"Unsupported {kind.lower()} type {param.type!r}")
+        return param
+
+    def _check_test_case(self, index: int, test_case: Any) -> None:
+        if not isinstance(test_case, dict) or "input" not in test_case or "output" not in test_case:
+            raise GenerationAborted(f"Test case {index} needs an input and an output")
+        values = test_case["input"]
+        if self._params and not values:
+            raise GenerationAborted(f"Test case {index} has no input for {len(self._params)} parameter(s)")
+        if isinstance(values, list) and len(values) != len(self._params):
+            # A lone array parameter may be given as the bare array, which holds no lists itself
+            bare_array = len(self._params) == 1 and self._params[0].is_array
+            if not bare_array or any(isinstance(value, (list, dict)) for value in values):
+                raise GenerationAborted(
+                    f"Test case {index} has {len(values)} input(s) for {len(self._params)} parameter(s)"
+                )
+        try:
+            encode_input(self._params, values)
+        except ProblemPlanException as e:
+            raise GenerationAborted(f"Test case {index} doesn't match input_structure: {e}")
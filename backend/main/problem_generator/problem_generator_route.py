@@ -1,8 +1,12 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from enum import Enum
-from typing import List
+from typing import List, Optional
 from .problem_generator_service import ProblemGeneratorService
+from .problem_repository import DEFAULT_FIND_LIMIT, MAX_FIND_LIMIT
+from main.shared.dependencies import get_problem_generator_service
+import json
 import logging
 
 router = APIRouter()
@@ -19,12 +23,14 @@ class ProblemRequest(BaseModel):
     complexity: Complexity
 
 @router.post("/generate")
-async def generate_problem(request: ProblemRequest):
+async def generate_problem(
+    request: ProblemRequest,
+    service: ProblemGeneratorService = Depends(get_problem_generator_service)
+):
     try:
         logger.info("=== Problem Generation Request ===")
         logger.info(f"Received request - concept: {request.concept}, complexity: {request.complexity}")
         
-        service = ProblemGeneratorService()
         problem = await service.generate_problem(request.concept, request.complexity)
         
         logger.info(f"Successfully generated problem: {problem.get('problem_title', 'Unknown Title')}")
@@ -32,3 +38,53 @@ async def generate_problem(request: ProblemRequest):
     except Exception as e:
         logger.error(f"Error generating problem: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/generate/stream")
+async def stream_problem(
+    request: ProblemRequest,
+    service: ProblemGeneratorService = Depends(get_problem_generator_service)
+):
+    """
+    Generate a problem as Server-Sent Events: "title" and "statement" as soon
+    as they are written, then "structure", "boilerplate", one "test_case" per
+    test case and "tags". A "reset" event drops what was sent so far. The
+    stream ends with a "problem" event (the same body /generate returns) or
+    an "error" event.
+    """
+    logger.info("=== Streaming Problem Generation Request ===")
+    logger.info(f"Received request - concept: {request.concept}, complexity: {request.complexity}")
+
+    async def event_stream():
+        async for event, data in service.stream_problem(request.concept, request.complexity):
+            if event == "heartbeat":
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/problems")
+async def list_problems(
+    concept: Optional[str] = None,
+    difficulty: Optional[Complexity] = None,
+    tag: Optional[str] = None,
+    limit: int = Query(DEFAULT_FIND_LIMIT, ge=1, le=MAX_FIND_LIMIT),
+    before: Optional[float] = None,
+    service: ProblemGeneratorService = Depends(get_problem_generator_service)
+):
+    """Previously generated problems matching the filters, newest first; page with `before`."""
+    return await service.find_problems(concept, difficulty, tag, limit, before)
+
+@router.get("/problems/{problem_id}")
+async def get_problem(
+    problem_id: str,
+    service: ProblemGeneratorService = Depends(get_problem_generator_service)
+):
+    problem = await service.get_problem(problem_id)
+    if problem is None:
+        raise HTTPException(status_code=404, detail=f"Unknown problem id: {problem_id}")
+    return problem
@@ -1,5 +1,6 @@
 import os
 import json
+import asyncio
 from typing import List, Dict, Any, Optional
 from langchain_openai import AzureChatOpenAI
 from pydantic import BaseModel, Field
@@ -11,6 +12,14 @@ from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from .prompt_manager import PromptManager
+from main.shared.logging_setup import log_json, log_text
+from main.problem_submission.problem_registry import ProblemRegistry, get_problem_registry
+from .problem_pool import ProblemPool
+from .problem_repository import DEFAULT_FIND_LIMIT, ProblemRepository, get_problem_repository
+from .similarity_index import ProblemSimilarityIndex, get_similarity_index, similarity_text
+from .argument_validator import GenerationAborted, ProblemArgumentValidator
+from .problem_stream import EmitEvent, ProblemFieldEvents
+from main.shared.incremental_json import IncrementalJSONParser
 from langchain.memory import ConversationBufferWindowMemory
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
@@ -58,11 +67,143 @@ class Problem(BaseModel):
     structure: ProblemStructure = Field(description="Structure of the problem")
     java_boilerplate: str = Field(description="Java boilerplate code for the problem")
     python_boilerplate: str = Field(description="Python boilerplate code for the problem")
+    problem_id: Optional[str] = Field(default=None, description="Registry id to submit solutions against")
+
+
+# Function-calling schema the LLM fills in for every generated problem
+PROBLEM_FUNCTIONS = [{
+    "name": "generate_programming_problem",
+    "description": "Generate a programming problem with specific structure",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "concept": {"type": "string"},
+            "difficulty": {"type": "string"},
+            "problem_title": {"type": "string"},
+            "problem_statement": {"type": "string"},
+            "structure": {
+                "type": "object",
+                "properties": {
+                    "problem_name": {"type": "string"},
+                    "function_name": {"type": "string"},
+                    "input_structure": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "Input Field": {
+                                    "type": "string",
+                                    "description": "Type and name of the input parameter (e.g., 'List[int] array', 'string operation')"
+                                }
+                            },
+                            "required": ["Input Field"]
+                        }
+                    },
+                    "output_structure": {
+                        "type": "object",
+                        "properties": {
+                            "Output Field": {
+                                "type": "string",
+                                "description": "Type and name of the output (e.g., 'List[int] result'). Only 1 concrete output - No 'Output Field': 'int or str result'",
+                                  "pattern": "^(?!.*\\bor\\b).*$"
+                            }
+                        },
+                        "required": ["Output Field"]
+                    }
+                },
+                "required": ["problem_name", "function_name", "input_structure", "output_structure"]
+            },
+            "test_cases": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "input": {
+                            "type": "array",
+                            "description": "List of input values matching function parameters. Each value must be one of: int, float, str, bool, or arrays of these types",
+                            "items": {
+                                "oneOf": [
+                                    {"type": "integer"},
+                                    {"type": "number"},
+                                    {"type": "string"},
+                                    {"type": "boolean"},
+                                    {
+                                        "type": "array",
+                                        "items": {
+                                            "oneOf": [
+                                                {"type": "integer"},
+                                                {"type": "number"},
+                                                {"type": "string"},
+                                                {"type": "boolean"}
+                                            ]
+                                        }
+                                    }
+                                ]
+                            }
+                        },
+                        "output": {
+                            "description": "Expected output value of one of the allowed types: int, float, str, bool, or arrays of these types",
+                            "oneOf": [
+                                {"type": "integer"},
+                                {"type": "number"},
+                                {"type": "string"},
+                                {"type": "boolean"},
+                                {
+                                    "type": "array",
+                                    "items": {
+                                        "oneOf": [
+                                            {"type": "integer"},
+                                            {"type": "number"},
+                                            {"type": "string"},
+                                            {"type": "boolean"}
+                                        ]
+                                    }
+                                }
+                            ]
+                        }
+                    },
+                    "required": ["input", "output"]
+                }
+            },
+            "tags": {
+                "type": "array",
+                "description": "Programming concepts and subconcepts used in this problem. Should include the main category and specific operations used.",
+                "items": {
+                    "type": "string",
+                    "enum": [
+                        # Main categories
+                        "arrays", "strings", "numbers", "control_flow", "data_types",
+                        # Operations
+                        "array_iteration", "array_manipulation", "string_formatting",
+                        "string_manipulation", "arithmetic", "type_conversion",
+                        "conditional_logic", "loops", "input_validation",
+                        # Data structures
+                        "lists", "arrays", "strings",
+                        # Common patterns
+                        "searching", "counting", "transformation", "validation"
+                    ]
+                },
+                "example": ["arrays", "array_iteration", "counting"]
+            }
+        },
+        "required": ["concept", "difficulty", "problem_title", "problem_statement", 
+                   "structure", "test_cases", "tags"]
+    }
+}]
+
+# Tags the LLM may choose from; anything else aborts the generation
+PROBLEM_TAGS = frozenset(PROBLEM_FUNCTIONS[0]["parameters"]["properties"]["tags"]["items"]["enum"])
 
 
 # Main service for generating programming problems
 class ProblemGeneratorService:
-    def __init__(self):
+    def __init__(
+        self,
+        problem_registry: ProblemRegistry = None,
+        problem_pool: ProblemPool = None,
+        problem_repository: ProblemRepository = None,
+        similarity_index: ProblemSimilarityIndex = None,
+    ):
         """Initialize the problem generator with necessary components"""
         self.llm = AzureChatOpenAI(
             openai_api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
@@ -73,8 +214,134 @@ class ProblemGeneratorService:
         )
     
         self.prompt_manager = PromptManager()
+        # Generated problems are registered so /submit can refer to them by id
+        self.problem_registry = problem_registry or get_problem_registry()
+        # Pre-generated problems served instantly; set in the app lifespan (see problem_pool)
+        self.problem_pool = problem_pool
+        # Every generated problem is kept here; None when PROBLEM_REPOSITORY=none
+        self.problem_repository = problem_repository or get_problem_repository()
+        # Near-duplicate check against earlier problems of the same concept
+        self.similarity_index = similarity_index or get_similarity_index()
+        # Generations raced per live request; the first valid, non-duplicate one wins
+        self.speculation = int(os.getenv("PROBLEM_GENERATION_SPECULATION", "3"))
+        # Generations abandoned mid-stream as invalid are retried at once, this many times
+        self.abort_retries = max(0, int(os.getenv("PROBLEM_GENERATION_ABORT_RETRIES", "2")))
+        self.stream_heartbeat = float(os.getenv("PROBLEM_STREAM_HEARTBEAT_SECONDS", "15"))
+
+    def _register(self, problem: Dict) -> Dict:
+        """Register a generated problem and return it with its problem_id (None if it can't be planned)."""
+        try:
+            problem["problem_id"] = self.problem_registry.register(problem)
+        except Exception as e:
+            logger.warning(f"Could not register generated problem '{problem.get('problem_title')}': {str(e)}")
+            problem["problem_id"] = None
+        return problem
+
+    async def _store(self, problem: Dict) -> Dict:
+        """Register a freshly generated problem and persist it to the problem repository."""
+        problem = self._register(problem)
+        self.similarity_index.add(
+            problem["concept"],
+            problem["problem_id"] or ProblemRegistry.problem_id_for(problem),
+            similarity_text(problem),
+        )
+        if self.problem_repository is not None:
+            try:
+                await asyncio.to_thread(self.problem_repository.save, problem)
+            except Exception as e:
+                logger.warning(f"Could not persist generated problem '{problem.get('problem_title')}': {str(e)}")
+        return problem
+
+    async def get_problem(self, problem_id: str) -> Optional[Dict]:
+        """
+        Return a stored problem by id (None if unknown), registered again so
+        solutions can be submitted against it.
+        """
+        if self.problem_repository is None:
+            return None
+        problem = await asyncio.to_thread(self.problem_repository.get, problem_id)
+        return self._register(problem) if problem else None
+
+    async def find_problems(
+        self,
+        concept: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        tag: Optional[str] = None,
+        limit: int = DEFAULT_FIND_LIMIT,
+        before: Optional[float] = None,
+    ) -> List[Dict]:
+        """Stored problems matching the filters, newest first."""
+        if self.problem_repository is None:
+            return []
+        return await asyncio.to_thread(self.problem_repository.find, concept, difficulty, tag, limit, before)
 
     async def generate_problem(self, concept: str, complexity: str, language: Language = Language.JAVA) -> Dict:
+        """
+        Return a programming problem for concept and complexity, from the
+        problem pool when one is ready, otherwise freshly generated.
+        """
+        if self.problem_pool is not None:
+            problem = self.problem_pool.take(concept, complexity)
+            if problem is not None:
+                return self._register(problem)
+        return await self.generate_new_problem(concept, complexity, language)
+
+    async def stream_problem(self, concept: str, complexity: str, language: Language = Language.JAVA):
+        """
+        Yield a problem piece by piece as (event, data) tuples, so the title
+        and statement can be shown while the rest is still being generated.
+
+        Fields arrive as ProblemFieldEvents emits them; "reset" means the
+        fields so far were dropped and generation started over. A pooled
+        problem skips straight to the end. Ends with ("problem", problem), the
+        same dict generate_problem returns, or ("error", {"detail": ...});
+        ("heartbeat", None) is yielded while waiting.
+        """
+        if self.problem_pool is not None:
+            problem = self.problem_pool.take(concept, complexity)
+            if problem is not None:
+                yield "problem", self._register(problem)
+                return
+
+        queue: asyncio.Queue = asyncio.Queue()
+        generation = asyncio.create_task(self.generate_new_problem(
+            concept, complexity, language, speculation=1,
+            on_event=lambda event, data: queue.put_nowait((event, data)),
+        ))
+        generation.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=self.stream_heartbeat)
+                except asyncio.TimeoutError:
+                    yield "heartbeat", None
+                    continue
+                if item is None:
+                    break
+                yield item
+        finally:
+            # The client went away: stop paying for the generation
+            if not generation.done():
+                generation.cancel()
+                await asyncio.gather(generation, return_exceptions=True)
+
+        try:
+            problem = generation.result()
+        except Exception as e:
+            logger.error(f"Error streaming problem: {str(e)}")
+            yield "error", {"detail": str(e)}
+            return
+        yield "problem", problem
+
+    async def generate_new_problem(
+        self,
+        concept: str,
+        complexity: str,
+        language: Language = Language.JAVA,
+        reject_duplicates: bool = False,
+        speculation: int = None,
+        on_event: Optional[EmitEvent] = None,
+    ) -> Dict:
         """
         Generate a programming problem based on concept and complexity.
         
@@ -82,6 +349,13 @@ class ProblemGeneratorService:
             concept (str): Programming concept to focus on
             complexity (str): Desired difficulty level
             language (Language): Target programming language (default: Java)
+            reject_duplicates (bool): Raise instead of returning the last attempt
+                when every attempt is a near-duplicate of an earlier problem
+            speculation (int): Concurrent generations to race (default
+                PROBLEM_GENERATION_SPECULATION); 1 generates one at a time
+            on_event (EmitEvent): Receives each field as it streams in (see
+                ProblemFieldEvents), and "reset" when a partial problem is
+                dropped for a retry; streamed generations run one at a time
             
         Returns:
             Dict: Complete problem definition including structure and test cases
@@ -89,285 +363,275 @@ class ProblemGeneratorService:
         Raises:
             ValueError: If problem generation fails or invalid response received
         """
-        # Get the appropriate generator
-        generator = BoilerplateGeneratorFactory.get_generator(language)
-        
+        speculation = self.speculation if speculation is None else speculation
+        if speculation > 1 and on_event is None:
+            return await self._generate_speculatively(concept, complexity, speculation, reject_duplicates)
+
         max_attempts = 3
-        
+        candidate = None
         for attempt in range(max_attempts):
-            try:
-                # Add some randomness to the seed on each attempt
-                random.seed(os.urandom(8))
-                
-         
-                
-                # Get concept and complexity specific prompts
-                concept_prompt = self.prompt_manager.get_concept_prompt(concept)
-                complexity_prompt = self.prompt_manager.get_complexity_prompt(complexity) or ""
-                context_prompt = self.prompt_manager.get_context_prompt(concept, complexity) or ""
-                
-                # Log the selected problem type (safely)
-                if concept_prompt:
-                    logger.info(f"Attempt {attempt + 1}: Using concept prompt: {concept_prompt[:200]}...")
-                
-                # Combine prompts
-                combined_prompt = f"""
-                
-                {complexity_prompt}
-                {concept_prompt}            
-                {context_prompt}
-
-                """
-
-                messages = [
-                    {
-                        "role": "system",
-                        "content": combined_prompt.strip()
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Generate a {complexity} difficulty problem about {concept_prompt}"
-                    }
-                ]
-
-                functions = [{
-                    "name": "generate_programming_problem",
-                    "description": "Generate a programming problem with specific structure",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "concept": {"type": "string"},
-                            "difficulty": {"type": "string"},
-                            "problem_title": {"type": "string"},
-                            "problem_statement": {"type": "string"},
-                            "test_cases": {
-                                "type": "array",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "input": {
-                                            "type": "array",
-                                            "description": "List of input values matching function parameters. Each value must be one of: int, float, str, bool, or arrays of these types",
-                                            "items": {
-                                                "oneOf": [
-                                                    {"type": "integer"},
-                                                    {"type": "number"},
-                                                    {"type": "string"},
-                                                    {"type": "boolean"},
-                                                    {
-                                                        "type": "array",
-                                                        "items": {
-                                                            "oneOf": [
-                                                                {"type": "integer"},
-                                                                {"type": "number"},
-                                                                {"type": "string"},
-                                                                {"type": "boolean"}
-                                                            ]
-                                                        }
-                                                    }
-                                                ]
-                                            }
-                                        },
-                                        "output": {
-                                            "description": "Expected output value of one of the allowed types: int, float, str, bool, or arrays of these types",
-                                            "oneOf": [
-                                                {"type": "integer"},
-                                                {"type": "number"},
-                                                {"type": "string"},
-                                                {"type": "boolean"},
-                                                {
-                                                    "type": "array",
-                                                    "items": {
-                                                        "oneOf": [
-                                                            {"type": "integer"},
-                                                            {"type": "number"},
-                                                            {"type": "string"},
-                                                            {"type": "boolean"}
-                                                        ]
-                                                    }
-                                                }
-                                            ]
-                                        }
-                                    },
-                                    "required": ["input", "output"]
-                                }
-                            },
-                            "tags": {
-                                "type": "array",
-                                "description": "Programming concepts and subconcepts used in this problem. Should include the main category and specific operations used.",
-                                "items": {
-                                    "type": "string",
-                                    "enum": [
-                                        # Main categories
-                                        "arrays", "strings", "numbers", "control_flow", "data_types",
-                                        # Operations
-                                        "array_iteration", "array_manipulation", "string_formatting",
-                                        "string_manipulation", "arithmetic", "type_conversion",
-                                        "conditional_logic", "loops", "input_validation",
-                                        # Data structures
-                                        "lists", "arrays", "strings",
-                                        # Common patterns
-                                        "searching", "counting", "transformation", "validation"
-                                    ]
-                                },
-                                "example": ["arrays", "array_iteration", "counting"]
-                            },
-                            "structure": {
-                                "type": "object",
-                                "properties": {
-                                    "problem_name": {"type": "string"},
-                                    "function_name": {"type": "string"},
-                                    "input_structure": {
-                                        "type": "array",
-                                        "items": {
-                                            "type": "object",
-                                            "properties": {
-                                                "Input Field": {
-                                                    "type": "string",
-                                                    "description": "Type and name of the input parameter (e.g., 'List[int] array', 'string operation')"
-                                                }
-                                            },
-                                            "required": ["Input Field"]
-                                        }
-                                    },
-                                    "output_structure": {
-                                        "type": "object",
-                                        "properties": {
-                                            "Output Field": {
-                                                "type": "string",
-                                                "description": "Type and name of the output (e.g., 'List[int] result'). Only 1 concrete output - No 'Output Field': 'int or str result'",
-                                                  "pattern": "^(?!.*\\bor\\b).*$"
-                                            }
-                                        },
-                                        "required": ["Output Field"]
-                                    }
-                                },
-                                "required": ["problem_name", "function_name", "input_structure", "output_structure"]
-                            }
-                        },
-                        "required": ["concept", "difficulty", "problem_title", "problem_statement", 
-                                   "test_cases", "tags", "structure"]
-                    }
-                }]
-
-                # Add detailed logging of what's being sent to LLM
-                logger.info("=== LLM Request Details ===")
-                logger.info("Messages being sent to LLM:")
-                for msg in messages:
-                    logger.info(f"Role: {msg['role']}")
-                    logger.info(f"Content: {msg['content']}\n")
-
-
-           
-                response = await self.llm.ainvoke(
-                    messages,
-                    functions=functions,
-                    function_call={"name": "generate_programming_problem"}
-                )
-     
-                try:
-                    if hasattr(response, 'additional_kwargs') and 'function_call' in response.additional_kwargs:
-                        function_call = response.additional_kwargs['function_call']
-                        if function_call and 'arguments' in function_call:
-                            result = json.loads(function_call['arguments'])
-                            logger.info("=== Received LLM Response ===")
-                            logger.info(f"LLM Response: {result}")
-
-                            # Fix float values in test cases if needed
-                            input_types = [
-                                field['Input Field'].split()[0] 
-                                for field in result['structure']['input_structure']
-                            ]
-                            output_type = result['structure']['output_structure']['Output Field'].split()[0]
-                            
-
-                            # Add logging before fixing float values
-                            logger.info("Original test cases before fixing floats:")
-                            logger.info(json.dumps(result['test_cases'], indent=2))
-                            
-
-                            # Use the new fix_float_values method and ensure it's properly formatted
-                            fixed_test_cases = JavaBoilerplateGenerator.fix_float_values(
-                                result['test_cases'],
-                                input_types,
-                                output_type
-                            )
-                            
-
-                            # Add logging after fixing float values
-                            logger.info("Fixed test cases:")
-                            logger.info(json.dumps(fixed_test_cases, indent=2))
-                            
-
-                            # Update the test cases in the result
-                            result['test_cases'] = [
-                                TestCase(input=test_case['input'], output=test_case['output']).model_dump()
-                                for test_case in fixed_test_cases
-                            ]
-                            
-
-                    
-                            # Ensure the concept matches the input concept exactly
-                            result['concept'] = concept
-                            
-
-                        
-                           
-
-                            # Ensure structure has all required fields
-                            if 'structure' in result:
-                                if 'problem_name' not in result['structure']:
-                                    result['structure']['problem_name'] = result['problem_title']
-                                if 'input_structure' not in result['structure']:
-                                    result['structure']['input_structure'] = [
-                                        {"Input Field": "List[int] array"}
-                                    ]
-                                if 'output_structure' not in result['structure']:
-                                    result['structure']['output_structure'] = {
-                                        "Output Field": "int result"
-                                    }
-                                if 'function_name' not in result['structure']:
-                                    result['structure']['function_name'] = result['problem_title'].lower().replace(' ', '_')
-                            
+            candidate = await self._generate_candidate(concept, complexity, f"Attempt {attempt + 1}", on_event)
+            duplicate = self.similarity_index.find_similar(concept, similarity_text(candidate))
+            if duplicate is None:
+                return await self._store(candidate)
+            logger.info(
+                f"Generated problem was too similar to {duplicate[0]} "
+                f"({duplicate[1]:.2f}), attempt {attempt + 1}/{max_attempts}"
+            )
+            if on_event is not None and attempt + 1 < max_attempts:
+                on_event("reset", {"reason": "Too similar to an earlier problem"})
+
+        return await self._settle_for_duplicate(candidate, reject_duplicates)
+
+    async def _generate_speculatively(self, concept: str, complexity: str, count: int, reject_duplicates: bool) -> Dict:
+        """
+        Race `count` generations, each with its own concept variation from the
+        PromptManager. The first that passes validation and the duplicate check
+        wins and the others are cancelled, trading tokens for tail latency.
+        """
+        pending = {
+            asyncio.create_task(self._generate_candidate(concept, complexity, f"Speculative {i + 1}/{count}"))
+            for i in range(count)
+        }
+        tasks = set(pending)
+        winner = None
+        duplicate_candidate = None
+        last_error = None
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        candidate = task.result()
+                    except Exception as e:
+                        last_error = e
+                        continue
+                    duplicate = self.similarity_index.find_similar(concept, similarity_text(candidate))
+                    if duplicate is None:
+                        winner = candidate
+                        break
+                    logger.info(f"Speculative problem was too similar to {duplicate[0]} ({duplicate[1]:.2f})")
+                    duplicate_candidate = candidate
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+                logger.info(f"Cancelled {len(pending)} speculative generation(s)")
+            # Finished tasks left unread after the winner still need their exceptions retrieved
+            for task in tasks:
+                if task.done() and not task.cancelled():
+                    task.exception()
+
+        if winner is not None:
+            return await self._store(winner)
+        if duplicate_candidate is not None:
+            return await self._settle_for_duplicate(duplicate_candidate, reject_duplicates)
+        raise ValueError(f"All {count} speculative generations failed: {str(last_error)}")
+
+    async def _settle_for_duplicate(self, candidate: Dict, reject_duplicates: bool) -> Dict:
+        # If we couldn't generate a unique problem after max attempts
+        logger.warning("Could not generate sufficiently different problem")
+        if reject_duplicates:
+            raise ValueError("Could not generate a sufficiently different problem")
+        # Return the last generated problem anyway
+        return await self._store(candidate)
 
-                            # Generate boilerplate code for both languages
-                            java_generator = BoilerplateGeneratorFactory.get_generator(Language.JAVA)
-                            python_generator = BoilerplateGeneratorFactory.get_generator(Language.PYTHON)
+    def _build_messages(self, concept: str, complexity: str, label: str) -> List[Dict[str, str]]:
+        """System and user messages for one generation, with a freshly drawn concept variation."""
+        # Add some randomness to the seed on each attempt
+        random.seed(os.urandom(8))
 
-                            result['java_boilerplate'] = java_generator.generate_boilerplate(result['structure'])
-                            result['python_boilerplate'] = python_generator.generate_boilerplate(result['structure'])
+        # Get concept and complexity specific prompts
+        concept_prompt = self.prompt_manager.get_concept_prompt(concept)
+        complexity_prompt = self.prompt_manager.get_complexity_prompt(complexity) or ""
+        context_prompt = self.prompt_manager.get_context_prompt(concept, complexity) or ""
 
-                            final_response = Problem(**result).model_dump()
-                            logger.info("Final response after language conversion:")
-                            logger.info(json.dumps(final_response, indent=2))
-                            
+        # Log the selected problem type (safely)
+        if concept_prompt:
+            logger.info(f"{label}: Using concept prompt: {concept_prompt[:200]}...")
 
-                            return final_response
-                    
+        # Combine prompts
+        combined_prompt = f"""
 
-                    logger.error(f"Invalid response format: {response}")
-                    raise ValueError("No valid function call in response")
-                    
+        {complexity_prompt}
+        {concept_prompt}            
+        {context_prompt}
 
-                except json.JSONDecodeError as e:
-                    logger.error(f"JSON decode error: {e}", exc_info=True)
-                    logger.error(f"Response content: {response}")
-                    raise ValueError(f"Failed to parse LLM response: {e}")
-                    
+        """
 
-                except Exception as e:
-                    logger.error(f"Error generating problem: {str(e)}", exc_info=True)
-                    logger.error(f"Response: {response}")
-                    raise ValueError(f"Failed to generate problem: {str(e)}")
+        messages = [
+            {
+                "role": "system",
+                "content": combined_prompt.strip()
+            },
+            {
+                "role": "user",
+                "content": f"Generate a {complexity} difficulty problem about {concept_prompt}"
+            }
+        ]
+
+        # Add detailed logging of what's being sent to LLM
+        logger.info("=== LLM Request Details ===")
+        if logger.isEnabledFor(logging.DEBUG):
+            for msg in messages:
+                logger.debug("Role: %s\nContent: %s\n", msg['role'], log_text(msg['content']))
+        return messages
+
+    async def _generate_candidate(
+        self, concept: str, complexity: str, label: str, on_event: Optional[EmitEvent] = None
+    ) -> Dict:
+        """
+        Stream one LLM generation and turn its function call into a validated problem.
+        A generation found invalid mid-stream is abandoned and retried straight
+        away, up to abort_retries times.
 
-                logger.info(f"Generated problem was too similar, attempt {attempt + 1}/{max_attempts}")
+        Raises:
+            ValueError: If the response is missing, malformed or fails validation.
+        """
+        for retry in range(self.abort_retries + 1):
+            attempt_label = label if retry == 0 else f"{label} (retry {retry})"
+            messages = self._build_messages(concept, complexity, attempt_label)
+            try:
+                result = await self._stream_function_call(messages, attempt_label, on_event)
+            except GenerationAborted as e:
+                aborted = e
+                if on_event is not None and retry < self.abort_retries:
+                    on_event("reset", {"reason": str(e)})
+                continue
 
+            try:
+                logger.info("=== Received LLM Response ===")
+                logger.debug("LLM Response: %s", log_text(result))
+                return self._finalize_problem(result, concept)
             except Exception as e:
                 logger.error(f"Error generating problem: {str(e)}", exc_info=True)
-                logger.error(f"Response: {response}")
+                logger.error(f"Response: {result}")
                 raise ValueError(f"Failed to generate problem: {str(e)}")
 
-        # If we couldn't generate a unique problem after max attempts
-        logger.warning("Could not generate sufficiently different problem")
-        # Return the last generated problem anyway
-        return Problem(**result).model_dump()
+        raise ValueError(f"Failed to generate problem: {str(aborted)}")
+
+    async def _stream_function_call(
+        self, messages: List[Dict[str, str]], label: str, on_event: Optional[EmitEvent] = None
+    ) -> Dict:
+        """
+        Stream the generate_programming_problem call, parsing and validating its
+        arguments as they arrive, and return them parsed. Valid fields are
+        passed on to on_event as they complete.
+
+        Raises:
+            GenerationAborted: As soon as the arguments are malformed or invalid;
+                the LLM stream is closed so no further tokens are generated.
+            ValueError: If the LLM call fails or returns no complete function call.
+        """
+        validator = ProblemArgumentValidator(PROBLEM_TAGS)
+        field_events = ProblemFieldEvents(on_event) if on_event is not None else None
+
+        def on_value(path, value):
+            validator(path, value)
+            if field_events is not None:
+                field_events(path, value)
+
+        parser = IncrementalJSONParser(on_value)
+        received = 0
+        try:
+            stream = self.llm.astream(
+                messages,
+                functions=PROBLEM_FUNCTIONS,
+                function_call={"name": "generate_programming_problem"}
+            )
+            try:
+                async for chunk in stream:
+                    function_call = chunk.additional_kwargs.get('function_call') or {}
+                    arguments = function_call.get('arguments')
+                    if arguments:
+                        received += len(arguments)
+                        parser.feed(arguments)
+            finally:
+                await stream.aclose()
+        except GenerationAborted as e:
+            logger.warning(f"{label}: aborted generation after {received} characters: {str(e)}")
+            raise
+        except json.JSONDecodeError as e:
+            logger.warning(f"{label}: aborted malformed function call after {received} characters: {e}")
+            raise GenerationAborted(f"Malformed function call arguments: {e}")
+        except Exception as e:
+            logger.error(f"{label}: LLM call failed: {str(e)}", exc_info=True)
+            raise ValueError(f"Failed to generate problem: {str(e)}")
+
+        if not received:
+            logger.error(f"{label}: Invalid response format: no function call")
+            raise ValueError("No valid function call in response")
+        try:
+            return parser.close()
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON decode error: {e}", exc_info=True)
+            raise ValueError(f"Failed to parse LLM response: {e}")
+
+    def _finalize_problem(self, result: Dict, concept: str) -> Dict:
+        """Fix up a parsed function-call result and validate it into a Problem dict with boilerplate."""
+        # Fix float values in test cases if needed
+        input_types = [
+            field['Input Field'].split()[0] 
+            for field in result['structure']['input_structure']
+        ]
+        output_type = result['structure']['output_structure']['Output Field'].split()[0]
+
+
+        # Add logging before fixing float values
+        logger.debug("Original test cases before fixing floats:\n%s", log_json(result['test_cases']))
+
+
+        # Use the new fix_float_values method and ensure it's properly formatted
+        fixed_test_cases = JavaBoilerplateGenerator.fix_float_values(
+            result['test_cases'],
+            input_types,
+            output_type
+        )
+
+
+        # Add logging after fixing float values
+        logger.debug("Fixed test cases:\n%s", log_json(fixed_test_cases))
+
+
+        # Update the test cases in the result
+        result['test_cases'] = [
+            TestCase(input=test_case['input'], output=test_case['output']).model_dump()
+            for test_case in fixed_test_cases
+        ]
+
+
+
+        # Ensure the concept matches the input concept exactly
+        result['concept'] = concept
+
+
+
+
+
+        # Ensure structure has all required fields
+        if 'structure' in result:
+            if 'problem_name' not in result['structure']:
+                result['structure']['problem_name'] = result['problem_title']
+            if 'input_structure' not in result['structure']:
+                result['structure']['input_structure'] = [
+                    {"Input Field": "List[int] array"}
+                ]
+            if 'output_structure' not in result['structure']:
+                result['structure']['output_structure'] = {
+                    "Output Field": "int result"
+                }
+            if 'function_name' not in result['structure']:
+                result['structure']['function_name'] = result['problem_title'].lower().replace(' ', '_')
+
+
+        # Generate boilerplate code for both languages
+        java_generator = BoilerplateGeneratorFactory.get_generator(Language.JAVA)
+        python_generator = BoilerplateGeneratorFactory.get_generator(Language.PYTHON)
+
+        result['java_boilerplate'] = java_generator.generate_boilerplate(result['structure'])
+        result['python_boilerplate'] = python_generator.generate_boilerplate(result['structure'])
+
+        final_response = Problem(**result).model_dump()
+        logger.debug("Final response after language conversion:\n%s", log_json(final_response))
+        return final_response
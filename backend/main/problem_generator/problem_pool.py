@@ -0,0 +1,282 @@
+import os
+import json
+import math
+import time
+import asyncio
+import sqlite3
+import logging
+import threading
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from .prompt_manager import available_concepts, normalize_name
+
+logger = logging.getLogger(__name__)
+
+COMPLEXITIES = ("EASY", "MEDIUM", "HARD")
+
+DEFAULT_POOL_DB = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'problem_pool.db')
+
+# (concept directory under prompts/concepts, complexity)
+PoolKey = Tuple[str, str]
+
+class ProblemPool:
+    """
+    Ready-to-serve generated problems per (concept, complexity).
+
+    take() pops a problem instantly and schedules an asynchronous refill of
+    that key, so students rarely wait on the LLM. Each key is kept at a
+    target depth that adapts to demand: min_depth plus the number of takes
+    expected while one problem is being generated (the recent take rate
+    times the average generation time), capped at max_depth. A problem is
+    only pooled if it was registered (its test cases fit its structure).
+
+    Refills run on the event loop, at most refill_concurrency LLM calls at a
+    time; a key whose generation fails backs off exponentially. With a
+    SQLite path the pool survives restarts: take() and refills only change
+    the in-memory queues and hand the row delete/insert to a writer thread,
+    so serving a pooled problem never waits on the disk.
+    """
+
+    def __init__(
+        self,
+        generate: Callable[[str, str], Awaitable[dict]],
+        keys: Iterable[PoolKey],
+        min_depth: int = 1,
+        max_depth: int = 5,
+        demand_window_seconds: float = 900.0,
+        refill_concurrency: int = 1,
+        initial_generation_seconds: float = 20.0,
+        retry_base_delay: float = 30.0,
+        retry_max_delay: float = 900.0,
+        db_path: Optional[str] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._generate = generate
+        self.min_depth = min_depth
+        self.max_depth = max_depth
+        self.demand_window_seconds = demand_window_seconds
+        self.refill_concurrency = refill_concurrency
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self._clock = clock
+        self._problems: Dict[PoolKey, Deque[Tuple[Optional[int], dict]]] = {key: deque() for key in keys}
+        self._demand: Dict[PoolKey, Deque[float]] = {key: deque() for key in self._problems}
+        self._generation_seconds = initial_generation_seconds
+        self._refills: Dict[PoolKey, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        # SQLite changes not written yet, in order: ("insert", (row id, key, problem, created_at)) or ("delete", row id)
+        self._pending_writes: List[tuple] = []
+        self._next_row_id = 1
+        self._closed = False
+        self._writer: Optional[threading.Thread] = None
+        self._conn = None
+        if db_path:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS problem_pool ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, concept TEXT NOT NULL, "
+                "complexity TEXT NOT NULL, problem TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+            self._restore()
+            logger.info(f"Problem pool backed by SQLite at {db_path}")
+
+    @staticmethod
+    def key_for(concept: str, complexity) -> PoolKey:
+        """Pool key for a request; complexity may be the route's Complexity enum."""
+        return normalize_name(concept), str(getattr(complexity, "value", complexity)).upper()
+
+    def keys(self) -> List[PoolKey]:
+        return list(self._problems)
+
+    def depth(self, key: PoolKey) -> int:
+        return len(self._problems.get(key, ()))
+
+    def target_depth(self, key: PoolKey) -> int:
+        """How many problems to keep ready for key, given its recent demand."""
+        rate = self._recent_demand(key) / self.demand_window_seconds
+        expected_takes = rate * self._generation_seconds
+        return min(self.max_depth, self.min_depth + math.ceil(expected_takes))
+
+    def start(self) -> None:
+        """Schedule a refill for every key. Call from the running event loop."""
+        for key in self._problems:
+            self._schedule_refill(key)
+
+    def take(self, concept: str, complexity) -> Optional[dict]:
+        """
+        Pop a ready problem for (concept, complexity), or None if there is none
+        (or the concept has no prompt directory). Either way the demand is
+        recorded and a refill is scheduled.
+        """
+        key = self.key_for(concept, complexity)
+        if key not in self._problems:
+            return None
+        self._demand[key].append(self._clock())
+        with self._wakeup:
+            entry = self._problems[key].popleft() if self._problems[key] else None
+            if entry is not None and entry[0] is not None:
+                self._queue_write("delete", entry[0])
+        self._schedule_refill(key)
+        if entry is None:
+            logger.info(f"Problem pool empty for {key}")
+            return None
+        problem = dict(entry[1])
+        problem["concept"] = concept
+        logger.info(f"Served pooled problem for {key}; {self.depth(key)} left")
+        return problem
+
+    def _recent_demand(self, key: PoolKey) -> int:
+        demand = self._demand.get(key)
+        if not demand:
+            return 0
+        horizon = self._clock() - self.demand_window_seconds
+        while demand and demand[0] < horizon:
+            demand.popleft()
+        return len(demand)
+
+    def _schedule_refill(self, key: PoolKey) -> None:
+        task = self._refills.get(key)
+        if task is not None and not task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.refill_concurrency)
+        self._refills[key] = loop.create_task(self._refill(key))
+
+    async def _refill(self, key: PoolKey) -> None:
+        failures = 0
+        while self.depth(key) < self.target_depth(key):
+            async with self._semaphore:
+                if self.depth(key) >= self.target_depth(key):
+                    break
+                started = self._clock()
+                try:
+                    problem = await self._generate(*key)
+                    if not problem or not problem.get("problem_id"):
+                        raise ValueError("generated problem could not be registered")
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    failures += 1
+                    delay = min(self.retry_max_delay, self.retry_base_delay * 2 ** (failures - 1))
+                    logger.warning(f"Problem pool refill for {key} failed ({e}); retrying in {delay:.0f}s")
+                else:
+                    failures = 0
+                    elapsed = self._clock() - started
+                    self._generation_seconds = 0.8 * self._generation_seconds + 0.2 * elapsed
+                    self._add(key, problem)
+                    continue
+            await asyncio.sleep(delay)
+
+    def _add(self, key: PoolKey, problem: dict) -> None:
+        with self._wakeup:
+            row_id = None
+            if self._conn is not None and not self._closed:
+                row_id = self._next_row_id
+                self._next_row_id += 1
+                self._queue_write("insert", (row_id, key, problem, time.time()))
+            self._problems[key].append((row_id, problem))
+        logger.info(f"Pooled problem '{problem.get('problem_title')}' for {key} ({self.depth(key)} ready)")
+
+    def _restore(self) -> None:
+        """Load persisted problems for the configured keys, oldest first."""
+        rows = self._conn.execute(
+            "SELECT id, concept, complexity, problem FROM problem_pool ORDER BY id"
+        ).fetchall()
+        restored = 0
+        for row_id, concept, complexity, problem in rows:
+            self._next_row_id = max(self._next_row_id, row_id + 1)
+            key = (concept, complexity)
+            if key in self._problems:
+                self._problems[key].append((row_id, json.loads(problem)))
+                restored += 1
+        logger.info(f"Restored {restored} pooled problem(s)")
+
+    def _queue_write(self, operation: str, value) -> None:
+        """Hand one row change to the writer thread. Caller holds the lock."""
+        if self._conn is None or self._closed:
+            return
+        self._pending_writes.append((operation, value))
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._run_writer, name="problem-pool-writer", daemon=True)
+            self._writer.start()
+        self._wakeup.notify()
+
+    def _run_writer(self) -> None:
+        while True:
+            with self._wakeup:
+                while not self._pending_writes and not self._closed:
+                    self._wakeup.wait()
+                if not self._pending_writes:
+                    return
+                batch, self._pending_writes = self._pending_writes, []
+            self._write(batch)
+
+    def _write(self, batch: List[tuple]) -> None:
+        try:
+            for operation, value in batch:
+                if operation == "insert":
+                    row_id, key, problem, created_at = value
+                    self._conn.execute(
+                        "INSERT INTO problem_pool (id, concept, complexity, problem, created_at) VALUES (?, ?, ?, ?, ?)",
+                        (row_id, key[0], key[1], json.dumps(problem), created_at),
+                    )
+                else:
+                    self._conn.execute("DELETE FROM problem_pool WHERE id = ?", (value,))
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to write {len(batch)} problem pool change(s) to SQLite: {e}")
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Cancel pending refills, write queued pool changes and close the SQLite connection, if any."""
+        tasks = [task for task in self._refills.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refills.clear()
+        with self._wakeup:
+            self._closed = True
+            self._wakeup.notify()
+        if self._writer is not None:
+            await asyncio.to_thread(self._writer.join, timeout)
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+_problem_pool: Optional[ProblemPool] = None
+
+def get_problem_pool(generate: Callable[[str, str], Awaitable[dict]]) -> Optional[ProblemPool]:
+    """
+    Return the process-wide problem pool, creating it on first use with
+    `generate(concept, complexity)` as its problem source. Returns None when
+    PROBLEM_POOL_ENABLED is false.
+    """
+    global _problem_pool
+    if os.getenv("PROBLEM_POOL_ENABLED", "true").lower() != "true":
+        return None
+    if _problem_pool is None:
+        _problem_pool = ProblemPool(
+            generate,
+            keys=[(concept, complexity) for concept in available_concepts() for complexity in COMPLEXITIES],
+            min_depth=int(os.getenv("PROBLEM_POOL_MIN_DEPTH", "1")),
+            max_depth=int(os.getenv("PROBLEM_POOL_MAX_DEPTH", "5")),
+            demand_window_seconds=float(os.getenv("PROBLEM_POOL_DEMAND_WINDOW_SECONDS", "900")),
+            refill_concurrency=int(os.getenv("PROBLEM_POOL_REFILL_CONCURRENCY", "1")),
+            db_path=os.getenv("PROBLEM_POOL_DB", DEFAULT_POOL_DB) or None,
+        )
+    return _problem_pool
+
+async def close_problem_pool() -> None:
+    """Stop the process-wide problem pool, if one was created."""
+    global _problem_pool
+    if _problem_pool is not None:
+        await _problem_pool.close()
+        _problem_pool = None
@@ -0,0 +1,235 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from main.problem_submission.problem_registry import ProblemRegistry
+from .prompt_manager import normalize_name
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FIND_LIMIT = 20
+MAX_FIND_LIMIT = 100
+
+def problem_id_of(problem: dict) -> str:
+    """The problem's registry id, or the id the registry would give it."""
+    return problem.get("problem_id") or ProblemRegistry.problem_id_for(problem)
+
+def concept_key(concept: Optional[str]) -> Optional[str]:
+    """Concepts are matched by prompt directory name, so "Array Search" == "array_search"."""
+    return normalize_name(concept) if concept else None
+
+def difficulty_key(difficulty: Optional[str]) -> Optional[str]:
+    return str(getattr(difficulty, "value", difficulty)).upper() if difficulty else None
+
+class ProblemRepository(ABC):
+    """
+    Durable store of generated problems, queryable by id or by concept,
+    difficulty and tag (newest first). Implementations are synchronous;
+    async callers should run them in a thread.
+    """
+
+    @abstractmethod
+    def save(self, problem: dict) -> str:
+        """Store a problem (idempotent per id) and return its id."""
+        pass
+
+    @abstractmethod
+    def get(self, problem_id: str) -> Optional[dict]:
+        """Return a stored problem, or None if the id is unknown."""
+        pass
+
+    @abstractmethod
+    def find(
+        self,
+        concept: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        tag: Optional[str] = None,
+        limit: int = DEFAULT_FIND_LIMIT,
+        before: Optional[float] = None,
+    ) -> List[dict]:
+        """
+        Return stored problems matching every given filter, newest first.
+        `before` (a created_at timestamp) pages past earlier results.
+        """
+        pass
+
+    def close(self) -> None:
+        """Release the underlying connection, if any."""
+        pass
+
+class SQLiteProblemRepository(ProblemRepository):
+    """Problem repository in a local SQLite file, indexed on concept, difficulty, tags and created_at."""
+
+    def __init__(self, db_path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS stored_problems ("
+            "problem_id TEXT PRIMARY KEY, concept TEXT, difficulty TEXT, "
+            "problem TEXT NOT NULL, created_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS stored_problem_tags ("
+            "problem_id TEXT NOT NULL, tag TEXT NOT NULL, PRIMARY KEY (problem_id, tag));"
+            "CREATE INDEX IF NOT EXISTS idx_stored_problems_concept "
+            "ON stored_problems (concept, difficulty, created_at);"
+            "CREATE INDEX IF NOT EXISTS idx_stored_problems_difficulty "
+            "ON stored_problems (difficulty, created_at);"
+            "CREATE INDEX IF NOT EXISTS idx_stored_problems_created_at ON stored_problems (created_at);"
+            "CREATE INDEX IF NOT EXISTS idx_stored_problem_tags_tag ON stored_problem_tags (tag);"
+        )
+        self._conn.commit()
+        logger.info(f"Problem repository backed by SQLite at {db_path}")
+
+    def save(self, problem: dict) -> str:
+        problem_id = problem_id_of(problem)
+        stored = dict(problem, problem_id=problem_id)
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO stored_problems "
+                "(problem_id, concept, difficulty, problem, created_at) VALUES (?, ?, ?, ?, ?)",
+                (
+                    problem_id,
+                    concept_key(problem.get("concept")),
+                    difficulty_key(problem.get("difficulty")),
+                    json.dumps(stored),
+                    time.time(),
+                ),
+            )
+            if cursor.rowcount:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO stored_problem_tags (problem_id, tag) VALUES (?, ?)",
+                    [(problem_id, tag) for tag in problem.get("tags") or []],
+                )
+            self._conn.commit()
+        return problem_id
+
+    def get(self, problem_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT problem, created_at FROM stored_problems WHERE problem_id = ?", (problem_id,)
+            ).fetchone()
+        return dict(json.loads(row[0]), created_at=row[1]) if row else None
+
+    def find(self, concept=None, difficulty=None, tag=None, limit=DEFAULT_FIND_LIMIT, before=None) -> List[dict]:
+        clauses, params = [], []
+        if concept:
+            clauses.append("p.concept = ?")
+            params.append(concept_key(concept))
+        if difficulty:
+            clauses.append("p.difficulty = ?")
+            params.append(difficulty_key(difficulty))
+        if tag:
+            clauses.append("p.problem_id IN (SELECT problem_id FROM stored_problem_tags WHERE tag = ?)")
+            params.append(tag)
+        if before is not None:
+            clauses.append("p.created_at < ?")
+            params.append(before)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(min(limit, MAX_FIND_LIMIT))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT p.problem, p.created_at FROM stored_problems p {where} "
+                "ORDER BY p.created_at DESC, p.rowid DESC LIMIT ?",
+                params,
+            ).fetchall()
+        return [dict(json.loads(problem), created_at=created_at) for problem, created_at in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+class MongoProblemRepository(ProblemRepository):
+    """
+    Problem repository in a MongoDB collection (pymongo), keyed by problem id,
+    with indexes on concept, difficulty, tags and created_at.
+    """
+
+    def __init__(self, uri: str, database: str = "goat_coder", collection: str = "problems"):
+        try:
+            from pymongo import ASCENDING, DESCENDING, MongoClient
+        except ImportError as e:
+            raise RuntimeError("PROBLEM_REPOSITORY=mongo needs pymongo installed") from e
+        self._descending = DESCENDING
+        self._client = MongoClient(uri, serverSelectionTimeoutMS=5000)
+        self._collection = self._client[database][collection]
+        self._collection.create_index([("concept_key", ASCENDING), ("difficulty_key", ASCENDING), ("created_at", DESCENDING)])
+        self._collection.create_index([("difficulty_key", ASCENDING), ("created_at", DESCENDING)])
+        self._collection.create_index([("tags", ASCENDING), ("created_at", DESCENDING)])
+        self._collection.create_index([("created_at", DESCENDING)])
+        logger.info(f"Problem repository backed by MongoDB collection {database}.{collection}")
+
+    def save(self, problem: dict) -> str:
+        problem_id = problem_id_of(problem)
+        document = dict(
+            problem,
+            problem_id=problem_id,
+            concept_key=concept_key(problem.get("concept")),
+            difficulty_key=difficulty_key(problem.get("difficulty")),
+            created_at=time.time(),
+        )
+        # Keep the first copy of a problem, like the SQLite repository
+        self._collection.update_one({"_id": problem_id}, {"$setOnInsert": document}, upsert=True)
+        return problem_id
+
+    def get(self, problem_id: str) -> Optional[dict]:
+        document = self._collection.find_one({"_id": problem_id})
+        return self._to_problem(document) if document else None
+
+    def find(self, concept=None, difficulty=None, tag=None, limit=DEFAULT_FIND_LIMIT, before=None) -> List[dict]:
+        query = {}
+        if concept:
+            query["concept_key"] = concept_key(concept)
+        if difficulty:
+            query["difficulty_key"] = difficulty_key(difficulty)
+        if tag:
+            query["tags"] = tag
+        if before is not None:
+            query["created_at"] = {"$lt": before}
+        cursor = self._collection.find(query).sort("created_at", self._descending).limit(min(limit, MAX_FIND_LIMIT))
+        return [self._to_problem(document) for document in cursor]
+
+    @staticmethod
+    def _to_problem(document: dict) -> dict:
+        return {
+            key: value for key, value in document.items()
+            if key not in ("_id", "concept_key", "difficulty_key")
+        }
+
+    def close(self) -> None:
+        self._client.close()
+
+_problem_repository: Optional[ProblemRepository] = None
+
+def get_problem_repository() -> Optional[ProblemRepository]:
+    """
+    Return the process-wide problem repository, creating it on first use.
+    PROBLEM_REPOSITORY selects "sqlite" (default), "mongo" or "none" (returns None).
+    """
+    global _problem_repository
+    if _problem_repository is None:
+        kind = os.getenv("PROBLEM_REPOSITORY", "sqlite").lower()
+        if kind == "none":
+            return None
+        if kind == "mongo":
+            _problem_repository = MongoProblemRepository(
+                uri=os.getenv("MONGODB_URI", "mongodb://localhost:27017"),
+                database=os.getenv("MONGODB_DATABASE", "goat_coder"),
+                collection=os.getenv("MONGODB_PROBLEMS_COLLECTION", "problems"),
+            )
+        else:
+            _problem_repository = SQLiteProblemRepository(os.getenv("PROBLEM_REPOSITORY_DB", "problems.db"))
+    return _problem_repository
+
+def close_problem_repository() -> None:
+    """Close the process-wide problem repository, if one was created."""
+    global _problem_repository
+    if _problem_repository is not None:
+        _problem_repository.close()
+        _problem_repository = None
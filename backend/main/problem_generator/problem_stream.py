@@ -0,0 +1,48 @@
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from ..boilerplate_generator.generator_factory import BoilerplateGeneratorFactory, Language
+from main.shared.incremental_json import JSONPath
+
+logger = logging.getLogger(__name__)
+
+# Receives (event, data) for each piece of a problem as it is generated
+EmitEvent = Callable[[str, Dict[str, Any]], None]
+
+def boilerplate_for(structure: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """Java and Python boilerplate for a streamed structure, or None if it can't be rendered yet."""
+    try:
+        return {
+            "java_boilerplate": BoilerplateGeneratorFactory.get_generator(Language.JAVA).generate_boilerplate(structure),
+            "python_boilerplate": BoilerplateGeneratorFactory.get_generator(Language.PYTHON).generate_boilerplate(structure),
+        }
+    except Exception as e:
+        logger.debug(f"Boilerplate not ready for streamed structure: {str(e)}")
+        return None
+
+class ProblemFieldEvents:
+    """
+    on_value callback for the function-call argument parser that emits the
+    problem's fields as soon as each is complete, in the order the LLM writes
+    them: "title", "statement", "structure" then "boilerplate", one
+    "test_case" per test case and "tags". Values are as generated; the final
+    problem (with fixed-up test cases and its problem_id) follows separately.
+    """
+
+    def __init__(self, emit: EmitEvent):
+        self.emit = emit
+
+    def __call__(self, path: JSONPath, value: Any) -> None:
+        if path == ("problem_title",):
+            self.emit("title", {"problem_title": value})
+        elif path == ("problem_statement",):
+            self.emit("statement", {"problem_statement": value})
+        elif path == ("structure",):
+            self.emit("structure", {"structure": value})
+            boilerplate = boilerplate_for(value)
+            if boilerplate is not None:
+                self.emit("boilerplate", boilerplate)
+        elif len(path) == 2 and path[0] == "test_cases":
+            self.emit("test_case", {"index": path[1], "test_case": value})
+        elif path == ("tags",):
+            self.emit("tags", {"tags": value})
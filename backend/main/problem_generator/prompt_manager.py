@@ -2,15 +2,27 @@ import os
 import json
 import random
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import logging
 
 logger = logging.getLogger(__name__)
 
+CONCEPTS_PATH = Path(__file__).parent / "prompts" / "concepts"
+
+def normalize_name(name: str) -> str:
+    """Convert a concept/complexity name to its prompt file name ("Array Search" -> "array_search")."""
+    return name.lower().replace(" for ", "_").replace(" ", "_").replace("/", "_")
+
+def available_concepts() -> List[str]:
+    """Concept directories under prompts/concepts that have a config.json."""
+    if not CONCEPTS_PATH.is_dir():
+        return []
+    return sorted(path.name for path in CONCEPTS_PATH.iterdir() if (path / "config.json").is_file())
+
 class PromptManager:
     def __init__(self):
         self.base_path = Path(__file__).parent / "prompts"
-        self.concepts_path = self.base_path / "concepts"
+        self.concepts_path = CONCEPTS_PATH
         self.complexity_path = self.base_path / "complexity"
         self.contexts_path = self.base_path / "contexts"
         
@@ -28,7 +40,7 @@ class PromptManager:
     def _normalize_name(self, name: str) -> str:
         """Convert concept/complexity name to filename format"""
         logger.info(f"Normalizing name: {name}")
-        normalized = name.lower().replace(" for ", "_").replace(" ", "_").replace("/", "_")
+        normalized = normalize_name(name)
         logger.info(f"Normalized to: {normalized}")
         return normalized
 
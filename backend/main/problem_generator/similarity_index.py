@@ -0,0 +1,255 @@
+import os
+import re
+import json
+import zlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+import numpy as np
+
+from .prompt_manager import normalize_name
+
+logger = logging.getLogger(__name__)
+
+# Mersenne prime 2^31 - 1: a * x + b stays below 2^63 for 31-bit a, b and x
+_PRIME = (1 << 31) - 1
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'problem_similarity.json')
+
+def similarity_text(problem: dict) -> str:
+    """The part of a problem compared for near-duplicates: its title and statement."""
+    return f"{problem.get('problem_title') or ''}\n{problem.get('problem_statement') or ''}"
+
+class MinHasher:
+    """MinHash signatures over word shingles, num_perm universal hashes seeded deterministically."""
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 3, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _PRIME, size=(num_perm, 1)).astype(np.int64)
+        self._b = rng.randint(0, _PRIME, size=(num_perm, 1)).astype(np.int64)
+
+    def shingles(self, text: str) -> Set[str]:
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        if len(tokens) < self.shingle_size:
+            return set(tokens)
+        return {" ".join(tokens[i:i + self.shingle_size]) for i in range(len(tokens) - self.shingle_size + 1)}
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of text, or None if it has no words."""
+        shingles = self.shingles(text)
+        if not shingles:
+            return None
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) & _PRIME for shingle in shingles),
+            dtype=np.int64,
+            count=len(shingles),
+        )
+        return ((self._a * hashes + self._b) % _PRIME).min(axis=1)
+
+class ProblemSimilarityIndex:
+    """
+    Per-concept MinHash/LSH index of generated problems for near-duplicate checks.
+
+    Each problem's title and statement are shingled into word 3-grams and
+    MinHashed; signatures are split into `bands` LSH bands, so a lookup only
+    compares against problems sharing a band bucket. A candidate whose
+    estimated Jaccard similarity reaches `threshold` is a near-duplicate.
+    Problems are added one at a time; each concept keeps its newest
+    max_per_concept signatures. With a snapshot path the signatures are
+    written to disk (atomically, every snapshot_every additions from a
+    background thread, and on close) and reloaded on start.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 64,
+        bands: int = 16,
+        threshold: float = 0.7,
+        max_per_concept: int = 5000,
+        snapshot_path: Optional[str] = None,
+        snapshot_every: int = 10,
+        seed: int = 1,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.hasher = MinHasher(num_perm=num_perm, seed=seed)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.max_per_concept = max_per_concept
+        self.snapshot_path = snapshot_path
+        self.snapshot_every = snapshot_every
+        self._signatures: Dict[str, "OrderedDict[str, np.ndarray]"] = {}
+        self._buckets: Dict[str, Dict[Tuple[int, bytes], Set[str]]] = {}
+        self._unsaved = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._pending_snapshot: Optional[Dict[str, "OrderedDict[str, np.ndarray]"]] = None
+        self._closed = False
+        self._writer: Optional[threading.Thread] = None
+        if snapshot_path and os.path.exists(snapshot_path):
+            self._load()
+
+    def find_similar(self, concept: str, text: str) -> Optional[Tuple[str, float]]:
+        """Return (problem_id, similarity) of the closest near-duplicate in concept, or None."""
+        signature = self.hasher.signature(text)
+        if signature is None:
+            return None
+        key = normalize_name(concept)
+        best = None
+        with self._lock:
+            signatures = self._signatures.get(key)
+            if not signatures:
+                return None
+            candidates = set()
+            for band_key in self._band_keys(signature):
+                candidates |= self._buckets[key].get(band_key, set())
+            for problem_id in candidates:
+                similarity = float(np.mean(signatures[problem_id] == signature))
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (problem_id, similarity)
+        return best
+
+    def add(self, concept: str, problem_id: str, text: str) -> None:
+        """Index a problem under concept (replacing an earlier entry with the same id)."""
+        signature = self.hasher.signature(text)
+        if signature is None:
+            return
+        with self._wakeup:
+            self._insert(normalize_name(concept), problem_id, signature)
+            self._unsaved += 1
+            if self.snapshot_path and self._unsaved >= self.snapshot_every and not self._closed:
+                # Copy now, serialize and write on the writer thread
+                self._pending_snapshot = self._copy_signatures()
+                self._unsaved = 0
+                if self._writer is None or not self._writer.is_alive():
+                    self._writer = threading.Thread(target=self._run_writer, name="similarity-snapshot-writer", daemon=True)
+                    self._writer.start()
+                self._wakeup.notify()
+
+    def size(self, concept: str) -> int:
+        return len(self._signatures.get(normalize_name(concept), ()))
+
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def _insert(self, key: str, problem_id: str, signature: np.ndarray) -> None:
+        """Add a signature and evict the concept's oldest beyond max_per_concept. Caller holds the lock."""
+        signatures = self._signatures.setdefault(key, OrderedDict())
+        buckets = self._buckets.setdefault(key, {})
+        if problem_id in signatures:
+            self._remove(key, problem_id)
+        signatures[problem_id] = signature
+        for band_key in self._band_keys(signature):
+            buckets.setdefault(band_key, set()).add(problem_id)
+        while len(signatures) > self.max_per_concept:
+            self._remove(key, next(iter(signatures)))
+
+    def _remove(self, key: str, problem_id: str) -> None:
+        signature = self._signatures[key].pop(problem_id)
+        buckets = self._buckets[key]
+        for band_key in self._band_keys(signature):
+            bucket = buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(problem_id)
+                if not bucket:
+                    del buckets[band_key]
+
+    def _copy_signatures(self) -> Dict[str, "OrderedDict[str, np.ndarray]"]:
+        """Shallow copy of every concept's signatures. Caller holds the lock; signature arrays are never mutated."""
+        return {key: OrderedDict(signatures) for key, signatures in self._signatures.items()}
+
+    def _run_writer(self) -> None:
+        while True:
+            with self._wakeup:
+                while self._pending_snapshot is None and not self._closed:
+                    self._wakeup.wait()
+                if self._closed:
+                    # close() writes the final snapshot itself
+                    return
+                signatures, self._pending_snapshot = self._pending_snapshot, None
+            try:
+                self._write_snapshot(signatures)
+            except OSError as e:
+                logger.error(f"Failed to write similarity snapshot {self.snapshot_path}: {e}")
+
+    def snapshot(self) -> None:
+        """Write all signatures to snapshot_path now, on the calling thread."""
+        if not self.snapshot_path:
+            return
+        with self._lock:
+            signatures = self._copy_signatures()
+            self._pending_snapshot = None
+            self._unsaved = 0
+        self._write_snapshot(signatures)
+
+    def _write_snapshot(self, signatures: Dict[str, "OrderedDict[str, np.ndarray]"]) -> None:
+        """Write signatures via a temp file, so a crash never leaves the snapshot half-written."""
+        data = {
+            "num_perm": self.hasher.num_perm,
+            "seed": self.hasher.seed,
+            "concepts": {
+                key: {problem_id: signature.tolist() for problem_id, signature in concept_signatures.items()}
+                for key, concept_signatures in signatures.items()
+            },
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(self.snapshot_path)), exist_ok=True)
+        temp_path = f"{self.snapshot_path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(temp_path, self.snapshot_path)
+
+    def _load(self) -> None:
+        try:
+            with open(self.snapshot_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable similarity snapshot {self.snapshot_path}: {e}")
+            return
+        if data.get("num_perm") != self.hasher.num_perm or data.get("seed") != self.hasher.seed:
+            logger.warning("Ignoring similarity snapshot built with different MinHash parameters")
+            return
+        count = 0
+        for key, signatures in data.get("concepts", {}).items():
+            for problem_id, signature in signatures.items():
+                self._insert(key, problem_id, np.array(signature, dtype=np.int64))
+                count += 1
+        logger.info(f"Loaded {count} problem signature(s) from {self.snapshot_path}")
+
+    def close(self) -> None:
+        """Stop the snapshot writer and write a final snapshot if anything changed since the last one."""
+        with self._wakeup:
+            self._closed = True
+            self._wakeup.notify()
+            unsaved = self._unsaved or self._pending_snapshot is not None
+        if self._writer is not None:
+            self._writer.join()
+        if unsaved:
+            self.snapshot()
+
+_similarity_index: Optional[ProblemSimilarityIndex] = None
+
+def get_similarity_index() -> ProblemSimilarityIndex:
+    """Return the process-wide similarity index, creating it on first use."""
+    global _similarity_index
+    if _similarity_index is None:
+        _similarity_index = ProblemSimilarityIndex(
+            threshold=float(os.getenv("PROBLEM_SIMILARITY_THRESHOLD", "0.7")),
+            max_per_concept=int(os.getenv("PROBLEM_SIMILARITY_MAX_PER_CONCEPT", "5000")),
+            snapshot_path=os.getenv("PROBLEM_SIMILARITY_SNAPSHOT", DEFAULT_SNAPSHOT_PATH) or None,
+        )
+    return _similarity_index
+
+def close_similarity_index() -> None:
+    """Snapshot the process-wide similarity index, if one was created."""
+    global _similarity_index
+    if _similarity_index is not None:
+        _similarity_index.close()
+        _similarity_index = None
@@ -0,0 +1,80 @@
+import time
+import logging
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+# Suggested wait for calls turned away while a half-open trial is deciding the state
+TRIAL_RETRY_AFTER = 1.0
+
+class CircuitBreaker:
+    """
+    Fails calls fast while a dependency is down.
+
+    After failure_threshold consecutive failures the breaker opens and
+    rejects calls for reset_timeout seconds. It then half-opens and lets a
+    single trial call through: success closes it again, failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    def retry_after(self) -> float:
+        """
+        Seconds a rejected caller should wait: until an open breaker lets a
+        trial call through, or a short backoff while a half-open trial runs.
+        """
+        if self.state == HALF_OPEN:
+            return min(TRIAL_RETRY_AFTER, self.reset_timeout)
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - self._clock())
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; claims the trial slot when half-open."""
+        if self.state == OPEN:
+            if self.retry_after() > 0:
+                return False
+            self.state = HALF_OPEN
+            logger.info(f"Circuit {self.name} half-open, sending a trial call")
+        if self.state == HALF_OPEN:
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        if self.state != CLOSED:
+            logger.info(f"Circuit {self.name} closed")
+        self.state = CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                logger.warning(f"Circuit {self.name} open after {self.failures} failures")
+            self.state = OPEN
+            self._opened_at = self._clock()
+
+    def release(self) -> None:
+        """Give back a half-open trial slot whose call ended without a verdict (e.g. cancelled)."""
+        self._trial_in_flight = False
@@ -0,0 +1,415 @@
+import os
+import sys
+import time
+import uuid
+import base64
+import shutil
+import signal
+import asyncio
+import hashlib
+import logging
+import tempfile
+import subprocess
+import multiprocessing
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Tuple
+
+from ..submission_generator import harness_protocol
+from .verdict_store import VerdictStore
+from .verdict_broadcaster import VerdictBroadcaster
+from .languages import JAVA_LANGUAGE_IDS, PYTHON_LANGUAGE_IDS
+from .sandbox import (
+    ExecutionLimits, SandboxPolicy, confine, private_opener, read_output, sandbox_env, wait_with_timeout,
+)
+from .python_fork_runner import run_forked
+
+logger = logging.getLogger(__name__)
+
+class ExecutionBackendException(Exception):
+    """Custom exception for errors while running submissions on an execution backend."""
+    pass
+
+class ExecutionBackend(ABC):
+    """
+    Runs Judge0-shaped submissions and reports verdicts in the shape
+    ProblemSubmissionService.get_submission returns.
+
+    Submissions are dicts with language_id and base64-encoded source_code,
+    stdin and expected_output, exactly as they are posted to Judge0.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    async def submit(self, submissions: List[dict]) -> List[dict]:
+        """Start running submissions; returns one {"token": ...} per submission, in order."""
+
+    @abstractmethod
+    async def fetch(self, tokens: List[str]) -> Dict[str, object]:
+        """Return token -> verdict (or the Exception raised while looking it up)."""
+
+    @abstractmethod
+    async def run(self, submission: dict) -> dict:
+        """Run one submission to completion; returns {"token": ..., **verdict}."""
+
+    async def aclose(self) -> None:
+        """Release the backend's resources."""
+
+@dataclass(frozen=True)
+class LocalLanguage:
+    """How to build and run one Judge0 language id locally."""
+    name: str
+    source_file: str
+    run_command: Tuple[str, ...]
+    compile_command: Optional[Tuple[str, ...]] = None
+    # The JVM reserves far more address space than it uses, so Java caps memory with -Xmx instead
+    limit_address_space: bool = True
+    # Fork the warm worker interpreter per run instead of starting a new process (Python only)
+    fork_runner: bool = False
+
+_JAVA = LocalLanguage(
+    name="Java",
+    source_file="Main.java",
+    compile_command=("javac", "-encoding", "UTF-8", "-d", "{build_dir}", "{source}"),
+    # No hsperfdata files: the sandbox user may not write to /tmp
+    run_command=(
+        "java", "-Xmx{memory_mb}m", "-Xss64m", "-XX:+UseSerialGC", "-XX:-UsePerfData", "-cp", "{build_dir}", "Main"
+    ),
+    limit_address_space=False,
+)
+_PYTHON = LocalLanguage(
+    name="Python",
+    source_file="main.py",
+    run_command=(sys.executable, "-I", "-S", "{source}"),
+    fork_runner=True,
+)
+
+LOCAL_LANGUAGES: Dict[int, LocalLanguage] = {
+    **{language_id: _JAVA for language_id in JAVA_LANGUAGE_IDS},
+    **{language_id: _PYTHON for language_id in PYTHON_LANGUAGE_IDS},
+}
+
+# Judge0 status ids for the verdicts a local run can produce
+_STATUSES = {
+    "processing": {"id": 2, "description": "Processing"},
+    "accepted": {"id": 3, "description": "Accepted"},
+    "wrong_answer": {"id": 4, "description": "Wrong Answer"},
+    "time_limit": {"id": 5, "description": "Time Limit Exceeded"},
+    "compilation_error": {"id": 6, "description": "Compilation Error"},
+    "sigsegv": {"id": 7, "description": "Runtime Error (SIGSEGV)"},
+    "sigxfsz": {"id": 8, "description": "Runtime Error (SIGXFSZ)"},
+    "sigfpe": {"id": 9, "description": "Runtime Error (SIGFPE)"},
+    "sigabrt": {"id": 10, "description": "Runtime Error (SIGABRT)"},
+    "nzec": {"id": 11, "description": "Runtime Error (NZEC)"},
+    "other": {"id": 12, "description": "Runtime Error (Other)"},
+    "internal_error": {"id": 13, "description": "Internal Error"},
+}
+_SIGNAL_STATUSES = {
+    signal.SIGSEGV: "sigsegv",
+    signal.SIGXFSZ: "sigxfsz",
+    signal.SIGFPE: "sigfpe",
+    signal.SIGABRT: "sigabrt",
+    signal.SIGXCPU: "time_limit",
+}
+
+def _run_limited(command: List[str], work_dir: str, stdin: str, limits: ExecutionLimits, limit_address_space: bool,
+                 sandbox: SandboxPolicy) -> dict:
+    """
+    Run a command with rlimits, sandbox isolation and a wall-clock timeout.
+    stdin/stdout/stderr go through files in work_dir so RLIMIT_FSIZE caps the
+    output size; the process only gets them as descriptors.
+    """
+    stdin_path = os.path.join(work_dir, "stdin.txt")
+    stdout_path = os.path.join(work_dir, "stdout.txt")
+    stderr_path = os.path.join(work_dir, "stderr.txt")
+    with open(stdin_path, "w", encoding="utf-8", opener=private_opener) as f:
+        f.write(stdin or "")
+    if sandbox.drops_privileges:
+        # The sandbox user may reach files in work_dir by name but not list or change it
+        os.chmod(work_dir, 0o711)
+
+    started = time.monotonic()
+    with open(stdin_path, "rb") as stdin_file, open(stdout_path, "wb", opener=private_opener) as stdout_file, \
+            open(stderr_path, "wb", opener=private_opener) as stderr_file:
+        process = subprocess.Popen(
+            command,
+            cwd=work_dir,
+            stdin=stdin_file,
+            stdout=stdout_file,
+            stderr=stderr_file,
+            env=sandbox_env(work_dir),
+            preexec_fn=confine(limits, sandbox, limit_address_space),
+            start_new_session=True,
+        )
+        timed_out, wait_status, usage = wait_with_timeout(process.pid, limits.wall_seconds)
+    elapsed = time.monotonic() - started
+
+    process.returncode = os.waitstatus_to_exitcode(wait_status)
+    stdout = read_output(stdout_path, limits.max_output_bytes)
+    stderr = read_output(stderr_path, limits.max_output_bytes)
+    return {
+        "returncode": process.returncode,
+        "stdout": stdout,
+        "stderr": stderr,
+        "timed_out": timed_out,
+        "cpu_time": usage.ru_utime + usage.ru_stime,
+        "wall_time": elapsed,
+        "memory": usage.ru_maxrss,
+    }
+
+def _compile(language: LocalLanguage, source_code: str, build_root: str, limits: ExecutionLimits,
+             sandbox: SandboxPolicy) -> Tuple[str, Optional[str]]:
+    """
+    Compile source code once per distinct source. Builds are cached under
+    build_root by source hash, so every test case and shard of a submission
+    (and every resubmit) reuses the same classes. The compiler runs isolated
+    but as the server's user, so sandboxed runs can read builds but not alter them.
+
+    Returns:
+        (build_dir, compile_output): compile_output is None when compilation succeeded.
+    """
+    digest = hashlib.sha256(f"{language.name}\0{source_code}".encode("utf-8")).hexdigest()
+    build_dir = os.path.join(build_root, digest)
+    error_path = os.path.join(build_dir, "compile_output.txt")
+    if os.path.isdir(build_dir):
+        if os.path.exists(error_path):
+            with open(error_path, encoding="utf-8") as f:
+                return build_dir, f.read()
+        return build_dir, None
+
+    # Build in a private directory and publish it atomically; another worker may race us
+    staging_dir = tempfile.mkdtemp(prefix="build-", dir=build_root)
+    source_path = os.path.join(staging_dir, language.source_file)
+    with open(source_path, "w", encoding="utf-8") as f:
+        f.write(source_code)
+    command = [part.format(build_dir=staging_dir, source=source_path) for part in language.compile_command]
+    compile_limits = ExecutionLimits(
+        cpu_seconds=limits.compile_seconds,
+        wall_seconds=limits.compile_seconds,
+        max_output_bytes=limits.max_output_bytes,
+    )
+    result = _run_limited(command, staging_dir, "", compile_limits, False, replace(sandbox, uid=None, gid=None))
+    compile_output = None
+    if result["timed_out"] or result["returncode"] != 0:
+        compile_output = (result["stderr"] or result["stdout"]) or "Compilation timed out"
+        with open(os.path.join(staging_dir, "compile_output.txt"), "w", encoding="utf-8") as f:
+            f.write(compile_output)
+    os.chmod(staging_dir, 0o755)
+    try:
+        os.rename(staging_dir, build_dir)
+    except OSError:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+    return build_dir, compile_output
+
+def _verdict(status_key: str, run: Optional[dict] = None, expected_output: Optional[str] = None,
+             compile_output: Optional[str] = None) -> dict:
+    run = run or {}
+    return {
+        "status": dict(_STATUSES[status_key]),
+        "compile_output": compile_output,
+        "stdout": run.get("stdout"),
+        "stderr": run.get("stderr"),
+        "time": f"{run['cpu_time']:.3f}" if "cpu_time" in run else None,
+        "memory": run.get("memory"),
+        "exit_code": run.get("returncode"),
+        "expected_output": expected_output,
+    }
+
+def _run_command(language: LocalLanguage, build_dir: str, source_path: str, limits: ExecutionLimits) -> List[str]:
+    return [
+        part.format(build_dir=build_dir, source=source_path, memory_mb=limits.memory_mb)
+        for part in language.run_command
+    ]
+
+def run_submission(language_id: int, source_code: str, stdin: str, expected_output: Optional[str],
+                   limits: ExecutionLimits, build_root: str, use_fork_runner: bool = True,
+                   sandbox: Optional[SandboxPolicy] = None) -> dict:
+    """
+    Compile (if needed) and run one submission in a fresh temp dir, then judge
+    its output the way Judge0 does. Runs inside a pool worker; languages with a
+    fork runner fork the worker itself instead of starting a new process.
+    """
+    sandbox = sandbox or SandboxPolicy()
+    language = LOCAL_LANGUAGES.get(language_id)
+    if language is None:
+        raise ExecutionBackendException(f"Language {language_id} is not supported by the local backend")
+
+    os.makedirs(build_root, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix="run-") as work_dir:
+        if language.fork_runner and use_fork_runner:
+            run = run_forked(source_code, stdin, work_dir, limits, sandbox)
+        elif language.compile_command:
+            build_dir, compile_output = _compile(language, source_code, build_root, limits, sandbox)
+            if compile_output is not None:
+                return _verdict("compilation_error", expected_output=expected_output, compile_output=compile_output)
+            run = _run_limited(
+                _run_command(language, build_dir, os.path.join(build_dir, language.source_file), limits),
+                work_dir, stdin, limits, language.limit_address_space, sandbox
+            )
+        else:
+            source_path = os.path.join(work_dir, language.source_file)
+            with open(source_path, "w", encoding="utf-8") as f:
+                f.write(source_code)
+            os.chmod(source_path, 0o644)
+            run = _run_limited(
+                _run_command(language, work_dir, source_path, limits),
+                work_dir, stdin, limits, language.limit_address_space, sandbox
+            )
+
+    returncode = run["returncode"]
+    if run["timed_out"] or run["cpu_time"] > limits.cpu_seconds:
+        return _verdict("time_limit", run, expected_output)
+    if returncode < 0:
+        return _verdict(_SIGNAL_STATUSES.get(-returncode, "other"), run, expected_output)
+    if returncode > 0:
+        return _verdict("nzec", run, expected_output)
+    if expected_output is not None and not harness_protocol.outputs_match(run["stdout"], expected_output):
+        return _verdict("wrong_answer", run, expected_output)
+    return _verdict("accepted", run, expected_output)
+
+def _ping() -> int:
+    return os.getpid()
+
+class LocalExecutionBackend(ExecutionBackend):
+    """
+    Runs submissions on this machine instead of Judge0.
+
+    A pool of pre-started worker processes (one per CPU by default) compiles
+    and runs each submission under CPU, memory and output rlimits with a
+    wall-clock timeout, isolated per the SandboxPolicy: no inherited
+    environment, no network and, when running as root, an unprivileged user. Verdicts go into the verdict store and out through the
+    broadcaster as soon as a run finishes, so the status and streaming
+    endpoints work the same as with Judge0 callbacks.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        verdict_store: VerdictStore,
+        verdict_broadcaster: Optional[VerdictBroadcaster] = None,
+        pool_size: Optional[int] = None,
+        limits: Optional[ExecutionLimits] = None,
+        build_root: Optional[str] = None,
+        use_fork_runner: bool = True,
+        sandbox: Optional[SandboxPolicy] = None,
+    ):
+        self.verdict_store = verdict_store
+        self.verdict_broadcaster = verdict_broadcaster
+        self.pool_size = pool_size or os.cpu_count() or 1
+        self.limits = limits or ExecutionLimits()
+        self.build_root = build_root or os.path.join(tempfile.gettempdir(), "goat_coder_builds")
+        self.use_fork_runner = use_fork_runner
+        self.sandbox = sandbox or SandboxPolicy()
+        os.makedirs(self.build_root, exist_ok=True)
+        start_methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in start_methods else None)
+        self._executor = ProcessPoolExecutor(max_workers=self.pool_size, mp_context=context)
+        self._pending: Dict[str, asyncio.Future] = {}
+        # Start every worker now instead of on the first submissions
+        for _ in range(self.pool_size):
+            self._executor.submit(_ping)
+        logger.info(f"Local execution backend started with {self.pool_size} workers, builds in {self.build_root}")
+
+    @staticmethod
+    def _decode(value: Optional[str]) -> Optional[str]:
+        return base64.b64decode(value).decode("utf-8") if value else value
+
+    def _start(self, submission: dict) -> Tuple[str, asyncio.Future]:
+        token = uuid.uuid4().hex
+        future = asyncio.get_running_loop().run_in_executor(
+            self._executor,
+            run_submission,
+            submission["language_id"],
+            self._decode(submission["source_code"]),
+            self._decode(submission.get("stdin")) or "",
+            self._decode(submission.get("expected_output")),
+            self.limits,
+            self.build_root,
+            self.use_fork_runner,
+            self.sandbox,
+        )
+        self._pending[token] = future
+        future.add_done_callback(lambda done: self._finish(token, done))
+        return token, future
+
+    def _finish(self, token: str, future: asyncio.Future) -> None:
+        self._pending.pop(token, None)
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Local run {token} failed: {error}")
+            verdict = _verdict("internal_error")
+            verdict["stderr"] = str(error)
+        else:
+            verdict = future.result()
+        self.verdict_store.put(token, verdict)
+        if self.verdict_broadcaster is not None:
+            self.verdict_broadcaster.publish(token, verdict)
+        logger.info(f"Local run {token}: {verdict['status']['description']}")
+
+    async def submit(self, submissions: List[dict]) -> List[dict]:
+        return [{"token": self._start(submission)[0]} for submission in submissions]
+
+    async def fetch(self, tokens: List[str]) -> Dict[str, object]:
+        results: Dict[str, object] = dict(self.verdict_store.get_many(tokens))
+        for token in tokens:
+            if token in results:
+                continue
+            if token in self._pending:
+                results[token] = _verdict("processing")
+            else:
+                results[token] = Exception(f"Submission {token} not found")
+        return results
+
+    async def run(self, submission: dict) -> dict:
+        token, future = self._start(submission)
+        try:
+            await future
+        except Exception:
+            pass
+        # _finish has stored the verdict (or an internal error) by now
+        verdict = self.verdict_store.get(token) or _verdict("internal_error")
+        return {"token": token, **verdict}
+
+    async def aclose(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+_local_execution_backend: Optional[LocalExecutionBackend] = None
+
+def get_local_execution_backend(
+    verdict_store: VerdictStore,
+    verdict_broadcaster: Optional[VerdictBroadcaster] = None,
+) -> LocalExecutionBackend:
+    """Return the process-wide local execution backend, creating it on first use."""
+    global _local_execution_backend
+    if _local_execution_backend is None:
+        _local_execution_backend = LocalExecutionBackend(
+            verdict_store,
+            verdict_broadcaster,
+            pool_size=int(os.getenv("LOCAL_EXECUTION_WORKERS", "0")) or None,
+            limits=ExecutionLimits(
+                cpu_seconds=float(os.getenv("LOCAL_EXECUTION_CPU_SECONDS", "5")),
+                wall_seconds=float(os.getenv("LOCAL_EXECUTION_WALL_SECONDS", "10")),
+                memory_mb=int(os.getenv("LOCAL_EXECUTION_MEMORY_MB", "256")),
+                max_output_bytes=int(os.getenv("LOCAL_EXECUTION_MAX_OUTPUT_BYTES", str(1024 * 1024))),
+            ),
+            build_root=os.getenv("LOCAL_EXECUTION_BUILD_DIR") or None,
+            use_fork_runner=os.getenv("LOCAL_EXECUTION_PYTHON_FORK", "true").lower() == "true",
+            sandbox=SandboxPolicy(
+                uid=int(os.getenv("LOCAL_EXECUTION_SANDBOX_UID", "65534")),
+                gid=int(os.getenv("LOCAL_EXECUTION_SANDBOX_GID", "65534")),
+                isolate_network=os.getenv("LOCAL_EXECUTION_ISOLATE_NETWORK", "true").lower() == "true",
+            ),
+        )
+    return _local_execution_backend
+
+async def close_local_execution_backend() -> None:
+    """Shut down the process-wide local execution backend, if one was created."""
+    global _local_execution_backend
+    if _local_execution_backend is not None:
+        await _local_execution_backend.aclose()
+        _local_execution_backend = None
@@ -0,0 +1,270 @@
+import os
+import time
+import random
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+import httpx
+
+from main.shared.deadline import bounded_timeout, remaining_time
+from .circuit_breaker import CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+class Judge0ClientException(Exception):
+    """Custom exception for errors while talking to the Judge0 API."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+class Judge0UnavailableException(Judge0ClientException):
+    """Judge0 was not asked at all: its circuit is open or the request's deadline has passed."""
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class CircuitOpenException(Judge0UnavailableException):
+    """Raised without calling Judge0 while its circuit breaker is open."""
+
+class DeadlineExceededException(Judge0UnavailableException):
+    """Raised when the incoming request's deadline leaves no time for a Judge0 call."""
+
+class LatencyTracker:
+    """Sliding window of recent call latencies, used to time hedged requests."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self._samples: deque = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def record(self, latency: float) -> None:
+        self._samples.append(latency)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """The q-th quantile (0-1) of the window, or None until enough samples are in."""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+class Judge0Client:
+    """
+    Non-blocking Judge0 HTTP client.
+
+    Wraps a single httpx.AsyncClient so every Judge0 call shares one keep-alive
+    connection pool. A semaphore bounds how many requests are in flight at once
+    and every call gets a timeout, so a slow Judge0 cannot stall the event loop.
+
+    Timeouts are shrunk to the incoming request's deadline (main.shared.deadline)
+    and a circuit breaker fails calls fast while the endpoint keeps failing.
+    GETs are idempotent, so they are retried with jittered exponential backoff
+    and, once the window has enough samples, hedged: if the first attempt is
+    still running at the observed p95 latency a second one is sent and the
+    first answer wins.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: Dict[str, str],
+        timeout: float = 10.0,
+        connect_timeout: float = 5.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        max_concurrency: int = 10,
+        breaker: Optional[CircuitBreaker] = None,
+        get_retries: int = 2,
+        retry_base_delay: float = 0.2,
+        retry_max_delay: float = 2.0,
+        hedge_gets: bool = True,
+        hedge_quantile: float = 0.95,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker(self.base_url)
+        self.get_retries = get_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.hedge_gets = hedge_gets
+        self.hedge_quantile = hedge_quantile
+        self.get_latency = LatencyTracker()
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=headers,
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        payload: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Send a request to Judge0 and return the decoded JSON body.
+
+        Raises:
+            CircuitOpenException: While the circuit breaker is open.
+            DeadlineExceededException: When the request's deadline has passed.
+            Judge0ClientException: On timeouts, transport errors or non-2xx responses.
+        """
+        send = lambda: self._send(method, path, params, payload, timeout)
+        if method.upper() != "GET":
+            return await send()
+        return await self._with_retries(lambda: self._hedged(send), f"{method} {path}")
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        payload: Optional[Dict[str, Any]],
+        timeout: Optional[float],
+    ) -> Any:
+        request_timeout = bounded_timeout(timeout if timeout is not None else self.timeout)
+        if request_timeout <= 0:
+            raise DeadlineExceededException(f"Request deadline passed before Judge0 {method} {path}")
+        if not self.breaker.allow():
+            raise CircuitOpenException(
+                f"Judge0 at {self.base_url} is failing; not calling it for {self.breaker.retry_after():.0f}s",
+                retry_after=self.breaker.retry_after(),
+            )
+
+        recorded = False
+        try:
+            async with self._semaphore:
+                started = time.monotonic()
+                try:
+                    response = await self._client.request(
+                        method,
+                        path,
+                        params=params,
+                        json=payload,
+                        timeout=request_timeout,
+                    )
+                except httpx.TimeoutException as e:
+                    self.breaker.record_failure()
+                    recorded = True
+                    logger.error(f"Judge0 {method} {path} timed out after {request_timeout:.1f}s")
+                    raise Judge0ClientException(f"Judge0 request timed out: {str(e)}")
+                except httpx.HTTPError as e:
+                    self.breaker.record_failure()
+                    recorded = True
+                    logger.error(f"Judge0 {method} {path} failed: {str(e)}")
+                    raise Judge0ClientException(f"Judge0 request failed: {str(e)}")
+
+            # Any answer short of a server error means Judge0 itself is up
+            if response.status_code >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            recorded = True
+        finally:
+            if not recorded:
+                self.breaker.release()
+
+        logger.info(f"Judge0 {method} {path} -> {response.status_code}")
+        if response.is_error:
+            logger.error(f"Request failed with status {response.status_code}: {response.text}")
+            raise Judge0ClientException(
+                f"Judge0 API request failed: {response.text}",
+                status_code=response.status_code,
+            )
+        if method.upper() == "GET":
+            self.get_latency.record(time.monotonic() - started)
+        return response.json()
+
+    async def _hedged(self, send: Callable[[], Awaitable[Any]]) -> Any:
+        """Run send(); if it outlives the observed tail latency, race a second attempt."""
+        hedge_after = self.get_latency.percentile(self.hedge_quantile) if self.hedge_gets else None
+        if hedge_after is None:
+            return await send()
+
+        first = asyncio.ensure_future(send())
+        done, _ = await asyncio.wait({first}, timeout=hedge_after)
+        if done:
+            return first.result()
+
+        logger.info(f"Judge0 GET slower than p{int(self.hedge_quantile * 100)} ({hedge_after:.2f}s); hedging")
+        pending = {first, asyncio.ensure_future(send())}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    if attempt.exception() is None:
+                        return attempt.result()
+                    error = attempt.exception()
+            raise error
+        finally:
+            for attempt in pending:
+                attempt.cancel()
+
+    async def _with_retries(self, call: Callable[[], Awaitable[Any]], description: str) -> Any:
+        """Retry transient failures (timeouts, transport errors, 5xx) with full-jitter backoff."""
+        attempt = 0
+        while True:
+            try:
+                return await call()
+            except Judge0UnavailableException:
+                raise
+            except Judge0ClientException as e:
+                transient = e.status_code is None or e.status_code >= 500
+                if not transient or attempt >= self.get_retries:
+                    raise
+                backoff = random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * 2 ** attempt))
+                remaining = remaining_time()
+                if remaining is not None and backoff >= remaining:
+                    raise
+                attempt += 1
+                logger.warning(f"Retrying Judge0 {description} in {backoff:.2f}s (attempt {attempt}): {e}")
+                await asyncio.sleep(backoff)
+
+    async def get(self, path: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Any:
+        return await self.request("GET", path, params=params, timeout=timeout)
+
+    async def post(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        return await self.request("POST", path, params=params, payload=payload, timeout=timeout)
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        await self._client.aclose()
+
+def create_judge0_client(base_url: str, headers: Dict[str, str]) -> Judge0Client:
+    """
+    Create a Judge0 client for one endpoint, tuned from the environment.
+    Must be called from within the running event loop.
+    """
+    return Judge0Client(
+        base_url=base_url,
+        headers=headers,
+        timeout=float(os.getenv("JUDGE0_TIMEOUT_SECONDS", "10")),
+        connect_timeout=float(os.getenv("JUDGE0_CONNECT_TIMEOUT_SECONDS", "5")),
+        max_connections=int(os.getenv("JUDGE0_MAX_CONNECTIONS", "20")),
+        max_keepalive_connections=int(os.getenv("JUDGE0_MAX_KEEPALIVE_CONNECTIONS", "10")),
+        max_concurrency=int(os.getenv("JUDGE0_MAX_CONCURRENCY", "10")),
+        breaker=CircuitBreaker(
+            base_url,
+            failure_threshold=int(os.getenv("JUDGE0_BREAKER_FAILURES", "5")),
+            reset_timeout=float(os.getenv("JUDGE0_BREAKER_RESET_SECONDS", "30")),
+        ),
+        get_retries=int(os.getenv("JUDGE0_GET_RETRIES", "2")),
+        retry_base_delay=float(os.getenv("JUDGE0_RETRY_BASE_DELAY_SECONDS", "0.2")),
+        retry_max_delay=float(os.getenv("JUDGE0_RETRY_MAX_DELAY_SECONDS", "2")),
+        hedge_gets=os.getenv("JUDGE0_HEDGE_GETS", "true").lower() == "true",
+    )
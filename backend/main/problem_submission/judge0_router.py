@@ -0,0 +1,304 @@
+import os
+import re
+import time
+import logging
+from collections import OrderedDict
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from .judge0_client import Judge0Client, Judge0ClientException, DeadlineExceededException, create_judge0_client
+
+logger = logging.getLogger(__name__)
+
+_SINGLE_SUBMISSION_PATH = re.compile(r"^/submissions/([^/]+)$")
+
+# Backend the submission scheduler reserved capacity on; new submissions try it first
+preferred_backend: ContextVar[Optional[str]] = ContextVar("preferred_backend", default=None)
+
+class Judge0Backend:
+    """One Judge0 endpoint with its health and daily quota bookkeeping."""
+
+    def __init__(
+        self,
+        name: str,
+        client: Judge0Client,
+        daily_quota: int = 0,
+        requests_per_second: float = 0.0,
+        burst: int = 20,
+        ewma_alpha: float = 0.2,
+        cooldown_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.client = client
+        self.daily_quota = daily_quota
+        # Plan rate limit enforced by the submission scheduler (0 = unlimited)
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.ewma_alpha = ewma_alpha
+        self.cooldown_seconds = cooldown_seconds
+        self._clock = clock
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.used_today = 0
+        self._quota_day = self._today()
+        self._cooldown_until = 0.0
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    def remaining_quota(self) -> Optional[int]:
+        """Calls left today, or None when the backend has no daily quota."""
+        today = self._today()
+        if today != self._quota_day:
+            self._quota_day, self.used_today = today, 0
+        if not self.daily_quota:
+            return None
+        return max(0, self.daily_quota - self.used_today)
+
+    def is_available(self, cost: int = 1) -> bool:
+        remaining = self.remaining_quota()
+        if remaining is not None and remaining < cost:
+            return False
+        return self._clock() >= self._cooldown_until
+
+    def score(self) -> float:
+        """Lower is healthier: observed latency, penalised by the recent error rate."""
+        latency = self.latency if self.latency is not None else 0.0
+        return latency * (1.0 + 10.0 * self.error_rate) + self.error_rate
+
+    def record_success(self, latency: float, cost: int = 1) -> None:
+        self.latency = latency if self.latency is None else (
+            (1 - self.ewma_alpha) * self.latency + self.ewma_alpha * latency
+        )
+        self.error_rate *= 1 - self.ewma_alpha
+        self.used_today += cost
+
+    def record_failure(self, cooldown: bool = True) -> None:
+        self.error_rate = (1 - self.ewma_alpha) * self.error_rate + self.ewma_alpha
+        if cooldown:
+            self._cooldown_until = self._clock() + self.cooldown_seconds
+
+    def exhaust_quota(self) -> None:
+        """The backend reported its quota is used up (HTTP 429); skip it for the rest of the day."""
+        if self.daily_quota:
+            self.used_today = self.daily_quota
+        else:
+            self._cooldown_until = self._clock() + self.cooldown_seconds
+
+class Judge0Router:
+    """
+    Spreads Judge0 traffic over several endpoints (e.g. RapidAPI and Sulu).
+
+    Exposes the same request/get/post interface as Judge0Client. New
+    submissions go to the healthiest backend that still has quota, failing
+    over to the next one on timeouts, transport errors, 5xx, 429 and an open
+    circuit breaker. Every returned token is remembered with the backend that
+    owns it, so status lookups (single or batch) go to the right endpoint.
+    """
+
+    def __init__(self, backends: List[Judge0Backend], max_tracked_tokens: int = 100000):
+        if not backends:
+            raise ValueError("Judge0Router needs at least one backend")
+        self.backends = backends
+        self.max_tracked_tokens = max_tracked_tokens
+        self._owners: "OrderedDict[str, Judge0Backend]" = OrderedDict()
+
+    @property
+    def primary(self) -> Judge0Backend:
+        return self.backends[0]
+
+    def ranked_backends(self, cost: int = 1) -> List[Judge0Backend]:
+        """Available backends, healthiest first; falls back to all of them if none is available."""
+        available = [backend for backend in self.backends if backend.is_available(cost)]
+        candidates = available or list(self.backends)
+        preferred = preferred_backend.get()
+        return sorted(candidates, key=lambda backend: (backend.name != preferred, backend.score()))
+
+    def owner_of(self, token: str) -> Judge0Backend:
+        """The backend a token was created on; the primary for tokens this process has not seen."""
+        return self._owners.get(token, self.primary)
+
+    def _remember(self, result: Any, backend: Judge0Backend) -> None:
+        entries = result if isinstance(result, list) else [result]
+        for entry in entries:
+            token = entry.get("token") if isinstance(entry, dict) else None
+            if token:
+                self._owners[token] = backend
+                self._owners.move_to_end(token)
+        while len(self._owners) > self.max_tracked_tokens:
+            self._owners.popitem(last=False)
+
+    @staticmethod
+    def _should_fail_over(error: Judge0ClientException) -> bool:
+        # Out of time for this request: another backend would not be faster
+        if isinstance(error, DeadlineExceededException):
+            return False
+        return error.status_code is None or error.status_code >= 500 or error.status_code == 429
+
+    async def _call(self, backend: Judge0Backend, method: str, path: str, cost: int, **kwargs) -> Any:
+        started = time.monotonic()
+        try:
+            result = await backend.client.request(method, path, **kwargs)
+        except Judge0ClientException as e:
+            if e.status_code == 429:
+                backend.exhaust_quota()
+            elif self._should_fail_over(e):
+                backend.record_failure()
+            raise
+        backend.record_success(time.monotonic() - started, cost)
+        return result
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        payload: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Send a Judge0 request to the right backend.
+
+        Raises:
+            Judge0ClientException: When every backend tried failed, or on a
+                client error (4xx other than 429) that another backend would repeat.
+        """
+        if method.upper() == "GET":
+            return await self._routed_get(path, params, timeout)
+
+        cost = len(payload.get("submissions", [])) if payload and "submissions" in payload else 1
+        last_error: Optional[Judge0ClientException] = None
+        for backend in self.ranked_backends(cost):
+            try:
+                result = await self._call(
+                    backend, method, path, cost, params=params, payload=payload, timeout=timeout
+                )
+            except Judge0ClientException as e:
+                if not self._should_fail_over(e):
+                    raise
+                logger.warning(f"Judge0 backend {backend.name} failed {method} {path}: {e}; failing over")
+                last_error = e
+                continue
+            self._remember(result, backend)
+            logger.info(f"Judge0 {method} {path} served by {backend.name}")
+            return result
+        raise last_error
+
+    async def _routed_get(self, path: str, params: Optional[Dict[str, Any]], timeout: Optional[float]) -> Any:
+        params = dict(params or {})
+        single = _SINGLE_SUBMISSION_PATH.match(path)
+        if single and single.group(1) != "batch":
+            return await self._get_single(single.group(1), path, params, timeout)
+
+        tokens = [token for token in str(params.get("tokens", "")).split(",") if token]
+        if not tokens:
+            return await self._call(self.primary, "GET", path, 1, params=params, timeout=timeout)
+
+        # Batch lookups are split per owning backend and merged back in token order
+        groups: "OrderedDict[Judge0Backend, List[str]]" = OrderedDict()
+        for token in tokens:
+            groups.setdefault(self.owner_of(token), []).append(token)
+        found: Dict[str, Any] = {}
+        errors: List[Judge0ClientException] = []
+        for backend, group in groups.items():
+            try:
+                result = await self._call(
+                    backend, "GET", path, 1, params={**params, "tokens": ",".join(group)}, timeout=timeout
+                )
+            except Judge0ClientException as e:
+                if len(groups) == 1:
+                    raise
+                logger.error(f"Judge0 backend {backend.name} failed batch lookup of {len(group)} tokens: {e}")
+                errors.append(e)
+                continue
+            for submission in result.get("submissions", []):
+                if submission and submission.get("token"):
+                    found[submission["token"]] = submission
+        if errors and not found:
+            raise errors[0]
+        return {"submissions": [found.get(token) for token in tokens]}
+
+    async def _get_single(self, token: str, path: str, params: Dict[str, Any], timeout: Optional[float]) -> Any:
+        if token in self._owners:
+            return await self._call(self._owners[token], "GET", path, 1, params=params, timeout=timeout)
+        # Unknown owner (e.g. created before a restart): ask each backend until one knows the token
+        last_error: Optional[Judge0ClientException] = None
+        for backend in self.backends:
+            try:
+                result = await self._call(backend, "GET", path, 1, params=params, timeout=timeout)
+            except Judge0ClientException as e:
+                if e.status_code != 404 and not self._should_fail_over(e):
+                    raise
+                last_error = e
+                continue
+            self._remember(result, backend)
+            return result
+        raise last_error
+
+    async def get(self, path: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Any:
+        return await self.request("GET", path, params=params, timeout=timeout)
+
+    async def post(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        return await self.request("POST", path, params=params, payload=payload, timeout=timeout)
+
+    async def aclose(self) -> None:
+        """Close every backend's connection pool."""
+        for backend in self.backends:
+            await backend.client.aclose()
+
+_judge0_router: Optional[Judge0Router] = None
+
+def get_judge0_router() -> Judge0Router:
+    """
+    Return the process-wide Judge0 router, creating it on first use.
+    RapidAPI (JUDGE0_BASE_URL) is always configured; Sulu (SULU_BASE_URL)
+    joins the pool when set. Must be called from within the running event loop.
+    """
+    global _judge0_router
+    if _judge0_router is None:
+        base_url = os.getenv("JUDGE0_BASE_URL")
+        if not base_url:
+            raise ValueError("JUDGE0_BASE_URL environment variable is not set")
+        backends = [
+            Judge0Backend(
+                "rapidapi",
+                create_judge0_client(base_url, {
+                    "x-rapidapi-key": os.getenv("JUDGE0_RAPIDAPI_KEY", ""),
+                    "x-rapidapi-host": os.getenv("JUDGE0_RAPIDAPI_HOST", ""),
+                }),
+                daily_quota=int(os.getenv("JUDGE0_RAPIDAPI_DAILY_QUOTA", "0")),
+                requests_per_second=float(os.getenv("JUDGE0_RAPIDAPI_RPS", "10")),
+                burst=int(os.getenv("JUDGE0_RAPIDAPI_BURST", "20")),
+            )
+        ]
+        sulu_base_url = os.getenv("SULU_BASE_URL")
+        if sulu_base_url:
+            backends.append(Judge0Backend(
+                "sulu",
+                create_judge0_client(sulu_base_url, {
+                    "Authorization": f"Bearer {os.getenv('SULU_API_KEY', '')}",
+                }),
+                daily_quota=int(os.getenv("SULU_DAILY_QUOTA", "0")),
+                requests_per_second=float(os.getenv("SULU_RPS", "10")),
+                burst=int(os.getenv("SULU_BURST", "20")),
+            ))
+        _judge0_router = Judge0Router(backends)
+        logger.info(f"Created Judge0 router over {', '.join(backend.name for backend in backends)}")
+    return _judge0_router
+
+async def close_judge0_router() -> None:
+    """Close the process-wide Judge0 router, if one was created."""
+    global _judge0_router
+    if _judge0_router is not None:
+        await _judge0_router.aclose()
+        _judge0_router = None
+        logger.info("Closed Judge0 router")
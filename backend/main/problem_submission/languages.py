@@ -0,0 +1,10 @@
+# Judge0 language ids the app accepts, shared by the submission service and the local backend
+JAVA_LANGUAGE_IDS = frozenset({
+    62,  # Java (OpenJDK 13.0.1)
+    91,  # Java (JDK 17.0.6), what the frontend sends for Java
+})
+PYTHON_LANGUAGE_IDS = frozenset({
+    28,  # Python 3.10 (PyPy 7.3.12), what the frontend sends for Python
+    71,  # Python (3.8.1)
+    92,  # Python (3.11.2)
+})
@@ -0,0 +1,192 @@
+import os
+import json
+import base64
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+from ..submission_generator.judge0_test_case_generator import Judge0TestCaseGenerator
+from .shard_planner import ShardPlanner
+
+logger = logging.getLogger(__name__)
+
+class ProblemNotFoundException(Exception):
+    """Raised when a submission names a problem id the registry does not know."""
+    pass
+
+def _encode(text: str) -> str:
+    return base64.b64encode(text.encode()).decode()
+
+@dataclass(frozen=True)
+class ShardRun:
+    """The language-independent half of one Judge0 submission: its cases and encoded I/O."""
+    cases: Tuple[int, ...]
+    stdin: str
+    expected_output: str
+
+    @property
+    def harness(self) -> bool:
+        return len(self.cases) > 1
+
+@dataclass(frozen=True)
+class SubmissionPlan:
+    """
+    Everything about a problem's submissions that does not depend on the
+    student's code: formatted test cases, their grouping into Judge0 runs and
+    each run's base64 stdin/expected output. Only the source changes per submit.
+    """
+    structure: dict
+    test_cases: list
+    formatted_test_cases: list
+    runs: Tuple[ShardRun, ...]
+
+    @property
+    def shards(self) -> list:
+        return [list(run.cases) for run in self.runs]
+
+def build_submission_plan(
+    structure: dict,
+    test_cases: list,
+    shard_planner: ShardPlanner,
+    test_case_generator: Judge0TestCaseGenerator,
+    shard_mode: str = None,
+) -> SubmissionPlan:
+    """Format, shard and encode a problem's test cases for Judge0."""
+    formatted = test_case_generator.generate_test_cases(test_cases, structure)
+    runs = []
+    for shard in shard_planner.plan(formatted, mode=shard_mode):
+        cases = [formatted[i] for i in shard]
+        if len(shard) == 1:
+            stdin, expected = cases[0]["input"], cases[0]["expected_output"]
+        else:
+            stdin = test_case_generator.generate_harness_input(cases)
+            expected = test_case_generator.generate_harness_expected_output(cases)
+        runs.append(ShardRun(tuple(shard), _encode(stdin), _encode(expected)))
+    return SubmissionPlan(structure, test_cases, formatted, tuple(runs))
+
+class ProblemRegistry:
+    """
+    Generated problems keyed by a stable id, each with its precompiled SubmissionPlan.
+
+    The id is a hash of the problem's structure, test cases and statement, so
+    registering the same problem twice yields the same id. Problems and plans
+    live in a bounded in-memory LRU map. Persistence is left to the problem
+    repository, which keeps every generated problem under the same id: with a
+    `load` function (e.g. ProblemRepository.get), problems missing from memory
+    after a restart or eviction are loaded from it and their plans rebuilt.
+    register() only touches memory; lookups that have to load run the load
+    and the plan build in a worker thread, off the event loop.
+    """
+
+    def __init__(
+        self,
+        shard_planner: ShardPlanner = None,
+        test_case_generator: Judge0TestCaseGenerator = None,
+        load: Optional[Callable[[str], Optional[dict]]] = None,
+        max_entries: int = 1000,
+    ):
+        self.shard_planner = shard_planner or ShardPlanner.from_env()
+        self.test_case_generator = test_case_generator or Judge0TestCaseGenerator()
+        self.max_entries = max_entries
+        self._load = load
+        self._entries: "OrderedDict[str, Tuple[dict, SubmissionPlan]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def problem_id_for(problem: dict) -> str:
+        content = json.dumps(
+            {
+                "structure": problem.get("structure"),
+                "test_cases": problem.get("test_cases"),
+                "problem_statement": problem.get("problem_statement"),
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+    def register(self, problem: dict) -> str:
+        """
+        Store a generated problem, compile its submission plan and return its id.
+
+        Raises:
+            Judge0TestCaseGeneratorException: If the test cases do not fit the structure.
+        """
+        problem_id = self.problem_id_for(problem)
+        plan = self._build_plan(problem)
+        with self._lock:
+            self._remember(problem_id, problem, plan)
+        logger.info(f"Registered problem {problem_id} with {len(plan.runs)} Judge0 run(s)")
+        return problem_id
+
+    async def get(self, problem_id: str) -> Optional[dict]:
+        """Return a registered problem, or None if the id is unknown."""
+        entry = await self._lookup(problem_id)
+        return entry[0] if entry else None
+
+    async def get_plan(self, problem_id: str) -> SubmissionPlan:
+        """
+        Return the precompiled submission plan for a problem.
+
+        Raises:
+            ProblemNotFoundException: If the id is unknown.
+        """
+        entry = await self._lookup(problem_id)
+        if entry is None:
+            raise ProblemNotFoundException(f"Unknown problem id: {problem_id}")
+        return entry[1]
+
+    async def _lookup(self, problem_id: str) -> Optional[Tuple[dict, SubmissionPlan]]:
+        with self._lock:
+            entry = self._entries.get(problem_id)
+            if entry is not None:
+                self._entries.move_to_end(problem_id)
+                return entry
+        if self._load is None:
+            return None
+        return await asyncio.to_thread(self._load_entry, problem_id)
+
+    def _load_entry(self, problem_id: str) -> Optional[Tuple[dict, SubmissionPlan]]:
+        """Load a problem the map no longer holds and rebuild its plan. Runs in a worker thread."""
+        problem = self._load(problem_id)
+        if problem is None:
+            return None
+        plan = self._build_plan(problem)
+        with self._lock:
+            self._remember(problem_id, problem, plan)
+        return problem, plan
+
+    def _build_plan(self, problem: dict) -> SubmissionPlan:
+        return build_submission_plan(
+            problem["structure"], problem["test_cases"], self.shard_planner, self.test_case_generator
+        )
+
+    def _remember(self, problem_id: str, problem: dict, plan: SubmissionPlan) -> None:
+        """Insert into the in-memory LRU map, evicting the oldest entries. Caller holds the lock."""
+        self._entries[problem_id] = (problem, plan)
+        self._entries.move_to_end(problem_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+_problem_registry: Optional[ProblemRegistry] = None
+
+def get_problem_registry() -> ProblemRegistry:
+    """
+    Return the process-wide problem registry, creating it on first use.
+    Problems it no longer holds are loaded from the process-wide problem
+    repository, unless PROBLEM_REPOSITORY=none.
+    """
+    global _problem_registry
+    if _problem_registry is None:
+        # The repository module imports this one for problem ids
+        from main.problem_generator.problem_repository import get_problem_repository
+        repository = get_problem_repository()
+        _problem_registry = ProblemRegistry(
+            load=repository.get if repository is not None else None,
+            max_entries=int(os.getenv("PROBLEM_REGISTRY_MAX_ENTRIES", "1000")),
+        )
+    return _problem_registry
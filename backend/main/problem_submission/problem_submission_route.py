@@ -1,8 +1,17 @@
-from fastapi import APIRouter, HTTPException, Request, Body
+from fastapi import APIRouter, Depends, HTTPException, Request, Body, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List, Any
 from .problem_submission_service import ProblemSubmissionService
+from main.shared.dependencies import get_problem_submission_service
+from .submission_scheduler import SchedulerSaturatedException
+from .problem_registry import ProblemNotFoundException
+from .judge0_client import CircuitOpenException, Judge0UnavailableException
+from main.shared.logging_setup import log_text
+from slowapi.util import get_remote_address
 from ..submission_generator.java_submission_generator import JavaSubmissionGenerator
+import os
+import json
 import logging
 
 router = APIRouter()
@@ -41,16 +50,30 @@ class SubmissionsStatusRequest(BaseModel):
             }
         }
 
+def judge0_unavailable(e: Judge0UnavailableException) -> HTTPException:
+    """503 while Judge0's circuit is open, 504 when the request ran out of time."""
+    if isinstance(e, CircuitOpenException):
+        return HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(int(e.retry_after + 0.999))}
+        )
+    return HTTPException(status_code=504, detail=str(e))
+
 @router.post("/submit")
 async def submit_problem(
+    request: Request,
     language_id: int = Body(...),
     source_code: str = Body(...),
     problem_id: str = Body(...),
-    structure: str = Body(...),
-    test_cases: list = Body(...)
+    structure: Optional[str] = Body(None),
+    test_cases: Optional[list] = Body(None),
+    service: ProblemSubmissionService = Depends(get_problem_submission_service)
 ):
     """
-    Submit code for evaluation
+    Submit code for evaluation.
+    Problems from /problem-generator/generate only need problem_id; structure
+    and test_cases are still accepted for problems the server does not know.
     """
     try:
         logger.info("=== Problem Submission Route ===")
@@ -58,17 +81,36 @@ async def submit_problem(
         logger.info(f"Language ID: {language_id}")
         logger.info(f"Source code length: {len(source_code)}")
         logger.info(f"Problem ID: {problem_id}")
-        logger.info(f"Structure (raw): {structure}")
-        logger.info(f"Test cases count: {len(test_cases)}")
+        logger.debug("Structure (raw): %s", log_text(structure))
+        logger.info(f"Test cases count: {len(test_cases) if test_cases is not None else 'from registry'}")
         
-        service = ProblemSubmissionService()
-        result = await service.submit_code(language_id, source_code, problem_id, structure, test_cases)
+        result = await service.submit_code(
+            language_id, source_code, problem_id, structure, test_cases,
+            user_id=get_remote_address(request)
+        )
         
         # Fix the logging format
-        logger.info("2. Service result: %s", result)  # Changed from logger.info("2. Service result:", result)
+        logger.info("2. Service result: %s", log_text(result))
         
         return result
         
+    except ProblemNotFoundException as e:
+        logger.warning(f"Submission for unknown problem: {str(e)}")
+        raise HTTPException(status_code=404, detail=str(e))
+    except SchedulerSaturatedException as e:
+        logger.warning(f"Submission rejected, judge saturated: {str(e)}")
+        raise HTTPException(
+            status_code=429,
+            detail={
+                "message": str(e),
+                "queue_position": e.queue_position,
+                "eta_seconds": e.eta_seconds
+            },
+            headers={"Retry-After": str(int(e.eta_seconds + 0.999))}
+        )
+    except Judge0UnavailableException as e:
+        logger.error(f"Judge0 unavailable in submit_problem: {str(e)}")
+        raise judge0_unavailable(e)
     except Exception as e:
         logger.error(f"Error in submit_problem: {str(e)}")
         raise HTTPException(
@@ -76,43 +118,62 @@ async def submit_problem(
             detail=str(e)
         )
 
-@router.post("/submission-callback")
-async def submission_callback(request: Request):
+# Judge0 issues a PUT to the callback URL; POST is kept for manual testing
+@router.api_route("/submission-callback", methods=["PUT", "POST"])
+async def submission_callback(
+    request: Request,
+    service: ProblemSubmissionService = Depends(get_problem_submission_service)
+):
+    """
+    Ingest a finished submission pushed by Judge0 into the verdict store.
+    """
+    callback_secret = os.getenv("JUDGE0_CALLBACK_SECRET")
+    if callback_secret and request.query_params.get("secret") != callback_secret:
+        logger.warning("Rejected Judge0 callback with invalid secret")
+        raise HTTPException(status_code=403, detail="Invalid callback secret")
+
     try:
-        # Get the raw JSON data from the request
         callback_data = await request.json()
         
-        # Log the received data
-        logger.info("Received Judge0 callback data:")
-        logger.info(callback_data)
+        verdict = service.ingest_callback(callback_data)
         
-        return {"status": "success", "message": "Callback received", "data": callback_data}
+        return {"status": "success", "message": "Callback received", "token": verdict["token"]}
+    except ValueError as e:
+        logger.error(f"Invalid callback payload: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error processing callback: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/submission/{submission_id}")
-async def get_submission(submission_id: str):
+async def get_submission(
+    submission_id: str,
+    service: ProblemSubmissionService = Depends(get_problem_submission_service)
+):
     try:
         logger.info(f"Getting submission details for ID: {submission_id}")
         
-        service = ProblemSubmissionService()
         result = await service.get_submission(submission_id)
         return result
+    except Judge0UnavailableException as e:
+        logger.error(f"Judge0 unavailable in get_submission: {str(e)}")
+        raise judge0_unavailable(e)
     except Exception as e:
         logger.error(f"Error in get_submission: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/submissions-status")
-async def get_submissions_status(request: SubmissionsStatusRequest):
+async def get_submissions_status(
+    request: SubmissionsStatusRequest,
+    service: ProblemSubmissionService = Depends(get_problem_submission_service)
+):
     """
     Get status for multiple submissions
     """
     try:
         logger.info(f"=== Getting Status for {len(request.tokens)} Submissions ===")
-        logger.info(f"Tokens: {request.tokens}")
+        logger.debug("Tokens: %s", log_text(request.tokens))
         
-        service = ProblemSubmissionService()
         result = await service.get_submissions_status(request.tokens)
         
         logger.info("Batch status result:")
@@ -128,3 +189,30 @@ async def get_submissions_status(request: SubmissionsStatusRequest):
             status_code=500,
             detail=f"Failed to get submissions status: {str(e)}"
         )
+
+@router.get("/submissions-stream")
+async def stream_submissions_status(
+    tokens: str = Query(..., description="Comma-separated submission tokens"),
+    service: ProblemSubmissionService = Depends(get_problem_submission_service)
+):
+    """
+    Stream per-test-case verdicts as Server-Sent Events.
+    Emits one "result" event per test case as it finishes and a final "done" event.
+    """
+    token_list = [token for token in tokens.split(",") if token]
+    if not token_list:
+        raise HTTPException(status_code=400, detail="No submission tokens provided")
+    logger.info(f"=== Streaming Status for {len(token_list)} Submissions ===")
+
+    async def event_stream():
+        async for event, data in service.stream_submissions_status(token_list):
+            if event == "heartbeat":
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,17 +1,56 @@
 import os
-import requests
+import asyncio
 import base64
 import json
 import logging
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from ..submission_generator.java_submission_generator import JavaSubmissionGenerator
+from ..submission_generator.python_submission_generator import PythonSubmissionGenerator
 from ..submission_generator.judge0_test_case_generator import Judge0TestCaseGenerator
+from ..submission_generator import harness_protocol
+from .judge0_client import Judge0Client, Judge0ClientException, Judge0UnavailableException
+from .judge0_router import Judge0Router, get_judge0_router, preferred_backend
+from .submission_scheduler import SchedulerSaturatedException, SubmissionScheduler, get_submission_scheduler
+from .verdict_store import VerdictStore, get_verdict_store
+from .verdict_broadcaster import VerdictBroadcaster, get_verdict_broadcaster
+from .shard_planner import ShardPlanner
+from .submission_cache import SubmissionCache, get_submission_cache
+from .execution_backend import ExecutionBackend, get_local_execution_backend
+from .problem_registry import ProblemRegistry, SubmissionPlan, build_submission_plan, get_problem_registry
+# Languages graded with the Python generator; everything else is Java
+from .languages import PYTHON_LANGUAGE_IDS
+from main.shared.debug_capture import DebugCapture, get_debug_capture
+from main.shared.logging_setup import log_json, log_text
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Only the fields the frontend uses; avoids downloading the echoed source code
+STATUS_FIELDS = "token,status,compile_output,stdout,stderr,expected_output,time,memory,exit_code"
+BASE64_FIELDS = ("stdout", "stderr", "compile_output", "message", "expected_output")
+
+# Per-test-case tokens of a harness run look like "<judge0 token>:<case index>"
+CASE_TOKEN_SEPARATOR = ":"
+ACCEPTED_STATUS = {"id": 3, "description": "Accepted"}
+WRONG_ANSWER_STATUS = {"id": 4, "description": "Wrong Answer"}
+RUNTIME_ERROR_STATUS = {"id": 12, "description": "Runtime Error (Other)"}
+COMPILATION_ERROR_STATUS_ID = 6
+# Judge0 Internal Error / Exec Format Error: infrastructure failures worth re-running
+RETRYABLE_STATUS_IDS = (13, 14)
+
 class ProblemSubmissionService:
-    def __init__(self):
+    def __init__(
+        self,
+        judge0_client: Judge0Client = None,
+        verdict_store: VerdictStore = None,
+        verdict_broadcaster: VerdictBroadcaster = None,
+        submission_cache: SubmissionCache = None,
+        execution_backend: ExecutionBackend = None,
+        scheduler: SubmissionScheduler = None,
+        debug_capture: DebugCapture = None,
+        problem_registry: ProblemRegistry = None
+    ):
         self.judge0_base_url = os.getenv("JUDGE0_BASE_URL")
         if not self.judge0_base_url:
             raise ValueError("JUDGE0_BASE_URL environment variable is not set")
@@ -38,9 +77,41 @@ class ProblemSubmissionService:
             "Content-Type": "application/json"
         }
 
-        # self.sulu_headers = {
-        #     "Authorization": f"Bearer {sulu_api_key}"
-        # }
+        # Shared, app-lifetime router over every configured Judge0 endpoint (RapidAPI, Sulu)
+        self.judge0_client = judge0_client or get_judge0_router()
+        # Max number of concurrent Judge0 lookups per status request
+        self.status_concurrency = int(os.getenv("JUDGE0_STATUS_CONCURRENCY", "5"))
+        # Judge0 caps batch requests at 20 submissions by default
+        self.batch_size = int(os.getenv("JUDGE0_BATCH_SIZE", "20"))
+        # Terminal verdicts reported by the Judge0 callback (or seen while polling)
+        self.verdict_store = verdict_store or get_verdict_store()
+        # Pushes verdicts to streaming watchers and runs the shared poller
+        self.verdict_broadcaster = verdict_broadcaster or get_verdict_broadcaster(self.verdict_store)
+        self.stream_timeout = float(os.getenv("SUBMISSION_STREAM_TIMEOUT_SECONDS", "120"))
+        self.stream_heartbeat = float(os.getenv("SUBMISSION_STREAM_HEARTBEAT_SECONDS", "15"))
+        # Groups test cases into Judge0 runs (one per test, one for all, or planned)
+        self.shard_planner = ShardPlanner.from_env()
+        # Run the first shard on its own and stop on a compile error before fanning out
+        self.preflight = os.getenv("JUDGE0_PREFLIGHT", "true").lower() == "true"
+        self.preflight_timeout = float(os.getenv("JUDGE0_PREFLIGHT_TIMEOUT_SECONDS", "30"))
+        # Tokens of earlier identical submissions, so resubmits reuse their verdicts
+        self.submission_cache = submission_cache or get_submission_cache()
+        # Runs submissions instead of Judge0 when set (EXECUTION_BACKEND=local)
+        if execution_backend is None and os.getenv("EXECUTION_BACKEND", "judge0").lower() == "local":
+            execution_backend = get_local_execution_backend(self.verdict_store, self.verdict_broadcaster)
+        self.execution_backend = execution_backend
+        # Paces outbound submissions to each Judge0 plan's rate limits
+        if scheduler is None and isinstance(self.judge0_client, Judge0Router):
+            scheduler = get_submission_scheduler(self.judge0_client)
+        self.scheduler = scheduler
+        # Stateless generators, built once and shared by every submission
+        self.java_generator = JavaSubmissionGenerator()
+        self.python_generator = PythonSubmissionGenerator()
+        self.test_case_generator = Judge0TestCaseGenerator()
+        # Sampled, off-loop capture of generated sources and payloads
+        self.debug_capture = debug_capture or get_debug_capture()
+        # Generated problems with precompiled submission plans, so /submit can send just an id
+        self.problem_registry = problem_registry or get_problem_registry()
 
         logger.info("ProblemSubmissionService initialized with:")
         logger.info(f"Judge0 Base URL: {self.judge0_base_url}")
@@ -50,185 +121,422 @@ class ProblemSubmissionService:
         """Convert string to base64"""
         return base64.b64encode(text.encode()).decode()
 
-    async def submit_code(self, language_id: int, source_code: str, problem_id: str, structure: str, test_cases: list):
+    async def submit_code(
+        self,
+        language_id: int,
+        source_code: str,
+        problem_id: str,
+        structure: str = None,
+        test_cases: list = None,
+        shard_mode: str = None,
+        user_id: str = None
+    ):
+        """
+        Submit the code for every test case, reusing an earlier identical submission.
+
+        A problem registered by the problem generator is submitted by id alone,
+        using its precompiled SubmissionPlan. Clients that still send the
+        structure and test cases get a plan built for this submission.
+
+        The submission cache is keyed by language, normalized source, structure
+        and test cases. A repeat returns the earlier tokens, whose verdicts the
+        status endpoints answer from the verdict store, and concurrent identical
+        submits share one Judge0 batch. Cached runs that hit a Judge0
+        infrastructure error are submitted again.
+
+        user_id identifies the submitter for the scheduler's per-user fairness.
+
+        Raises:
+            ProblemNotFoundException: If only a problem id is given and it is not registered.
+            SchedulerSaturatedException: If Judge0 capacity is exhausted and the
+                submission cannot be queued.
+        """
+        plan = await self._resolve_plan(problem_id, structure, test_cases, shard_mode)
+        key = SubmissionCache.key_for(language_id, source_code, plan.structure, plan.test_cases)
+        cached = self.submission_cache.get(key)
+        if cached is not None and not self._cached_tokens_usable(cached):
+            logger.info(f"Cached submission {key[:12]} hit a Judge0 error, submitting again")
+            self.submission_cache.invalidate(key)
+
+        return await self.submission_cache.get_or_submit(
+            key,
+            lambda: self._submit_code(language_id, source_code, problem_id, plan, user_id)
+        )
+
+    async def _resolve_plan(self, problem_id: str, structure, test_cases: list, shard_mode: str = None) -> SubmissionPlan:
+        """The registry's precompiled plan for problem_id, or one built from the request."""
+        if structure is None:
+            plan = await self.problem_registry.get_plan(problem_id)
+            if shard_mode is None:
+                return plan
+            structure, test_cases = plan.structure, plan.test_cases
+        try:
+            parsed_structure = json.loads(structure) if isinstance(structure, str) else structure
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse structure JSON: {e}")
+            raise Exception(f"Invalid structure format: {e}")
+        return build_submission_plan(
+            parsed_structure, test_cases or [], self.shard_planner, self.test_case_generator, shard_mode
+        )
+
+    def _cached_tokens_usable(self, entries: list) -> bool:
+        """Check that no stored verdict of a cached submission is a retryable Judge0 failure."""
+        real_tokens = [self._split_case_token(entry["token"])[0] for entry in entries if entry.get("token")]
+        if len(real_tokens) != len(entries):
+            return False
+        stored = self.verdict_store.get_many(real_tokens)
+        return not any(
+            verdict.get("status", {}).get("id") in RETRYABLE_STATUS_IDS
+            for verdict in stored.values()
+        )
+
+    async def _submit_code(
+        self,
+        language_id: int,
+        source_code: str,
+        problem_id: str,
+        plan: SubmissionPlan,
+        user_id: str = None
+    ):
+        """
+        Submit the code for every test case.
+
+        Each run of the plan (a shard of test cases, see ShardPlanner) is one
+        Judge0 submission; all runs are submitted concurrently. A single-case
+        run executes the regular program and returns its Judge0 token as is. A
+        larger run executes the multi-test harness and returns per-test-case
+        tokens ("<token>:<index>") that the status endpoints split back into
+        individual results. One token is returned per test case, in test case
+        order.
+
+        With preflight enabled and more than one run, the first run goes on
+        its own first. If it fails to compile, the remaining runs are never
+        submitted and every test case shares the preflight's compile error.
+        """
         try:
             # Log received request body
             logger.info("=== Received Submit Code Request ===")
             logger.info(f"Language ID: {language_id}")
             logger.info(f"Problem ID: {problem_id}")
-            logger.info(f"Source Code:\n{source_code}")
-            logger.info(f"Structure:\n{structure}")
-            logger.info(f"Test Cases:\n{json.dumps(test_cases, indent=2)}")
+            logger.info(f"Source code length: {len(source_code)}, test cases: {len(plan.test_cases)}")
+            logger.debug("Source Code:\n%s", log_text(source_code))
+            logger.debug("Structure:\n%s", log_json(plan.structure))
             logger.info("=====================================")
 
-            parsed_structure = json.loads(structure) if isinstance(structure, str) else structure
-            
-            # Initialize generators
-            java_generator = JavaSubmissionGenerator()
-            judge0_generator = Judge0TestCaseGenerator()
+            # Pick the generator for the language
+            if language_id in PYTHON_LANGUAGE_IDS:
+                submission_generator = self.python_generator
+            else:
+                submission_generator = self.java_generator
+            logger.info(f"Submitting {len(plan.test_cases)} test cases as {len(plan.runs)} Judge0 run(s)")
 
-            # Generate complete Java submission
-            complete_source = java_generator.generate_submission(source_code, parsed_structure)
-            
-            # Create debug directory if it doesn't exist
-            debug_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'debug')
-            os.makedirs(debug_dir, exist_ok=True)
-
-            # Initialize submission details for debug
-            submission_details = {
-                "language_id": language_id,
-                "problem_id": problem_id,
-                "structure": parsed_structure,
-                "test_cases": []
+            # Generate complete submissions, only in the variants the runs need
+            single_source = None
+            harness_source = None
+            if any(not run.harness for run in plan.runs):
+                single_source = submission_generator.generate_submission(source_code, plan.structure)
+            if any(run.harness for run in plan.runs):
+                harness_source = submission_generator.generate_submission(source_code, plan.structure, harness=True)
+            encoded_sources = {
+                False: single_source and self.encode_base64(single_source),
+                True: harness_source and self.encode_base64(harness_source)
             }
 
-            # Format test cases using Judge0TestCaseGenerator
-            formatted_test_cases = judge0_generator.generate_test_cases(test_cases, parsed_structure)
+            # Prepare submissions list for batch submission, one per run
+            callback_url = os.getenv("JUDGE0_CALLBACK_URL")
+            submissions = [
+                {
+                    "language_id": language_id,
+                    "source_code": encoded_sources[run.harness],
+                    "stdin": run.stdin,
+                    "expected_output": run.expected_output,
+                    "callback_url": callback_url
+                }
+                for run in plan.runs
+            ]
 
-            # Prepare submissions list for batch submission
-            submissions = []
+            if self.debug_capture.should_sample():
+                self._capture_submission(
+                    language_id, problem_id, plan.structure, plan.formatted_test_cases,
+                    plan.shards, single_source, harness_source
+                )
 
-            # Add each test case to submissions
-            for test_case in formatted_test_cases:
-                submissions.append({
-                    "language_id": language_id,
-                    "source_code": self.encode_base64(complete_source),
-                    "stdin": self.encode_base64(test_case["input"]),
-                    "expected_output": self.encode_base64(test_case["expected_output"]),
-                    "callback_url": os.getenv("JUDGE0_CALLBACK_URL")
-                })
-                
-                # Add to submission details for debug
-                submission_details["test_cases"].append(test_case)
-
-            # Save submission details to file in debug directory
-            try:
-                debug_file_path = os.path.join(debug_dir, 'last_submission.json')
-                with open(debug_file_path, 'w') as f:
-                    json.dump(submission_details, f, indent=2)
-                logger.info(f"Successfully saved submission details to {debug_file_path}")
-            except Exception as e:
-                logger.error(f"Failed to save last_submission.json: {str(e)}")
-            
-            # Submit batch request RapidAPI
-            url = f"{self.judge0_base_url}/submissions/batch"
-            # #Submit batch request Sulu
-            # url= f"{self.sulu_base_url}/submissions/batch"
-            payload = {"submissions": submissions}
-            
-            response = await self._make_request(url, payload)
-            return response
-        except json.JSONDecodeError as e:
-            logger.error(f"5. Failed to parse structure JSON: {e}")
-            raise Exception(f"Invalid structure format: {e}")
+            # Submit batch requests RapidAPI
+            if self.preflight and len(submissions) > 1:
+                async with self._scheduled(user_id, 1):
+                    preflight = await self._run_preflight(submissions[0])
+                if preflight.get("status", {}).get("id") == COMPILATION_ERROR_STATUS_ID:
+                    logger.info(
+                        f"Preflight {preflight['token']} failed to compile, "
+                        f"skipping the remaining {len(submissions) - 1} Judge0 run(s)"
+                    )
+                    return self._compile_error_tokens(len(plan.formatted_test_cases), preflight)
+                async with self._scheduled(user_id, len(submissions) - 1):
+                    response = [{"token": preflight["token"]}] + await self._submit_batches(submissions[1:])
+            else:
+                async with self._scheduled(user_id, len(submissions)):
+                    response = await self._submit_batches(submissions)
+            return self._case_tokens(plan.shards, response)
+        except (SchedulerSaturatedException, Judge0UnavailableException):
+            raise
         except Exception as e:
             logger.error(f"5. Failed to generate Java submission: {str(e)}")
             raise Exception(f"Failed to generate Java submission: {str(e)}")
 
+    def _capture_submission(
+        self,
+        language_id: int,
+        problem_id: str,
+        structure: dict,
+        formatted_test_cases: list,
+        shards: list,
+        single_source: str,
+        harness_source: str
+    ) -> None:
+        """Hand the generated sources and submission details to the debug capture."""
+        extension = "py" if language_id in PYTHON_LANGUAGE_IDS else "java"
+        sources = {}
+        if single_source is not None:
+            sources["single"] = self.debug_capture.capture(extension, single_source, extension)
+        if harness_source is not None:
+            sources["harness"] = self.debug_capture.capture(extension, harness_source, extension)
+        submission_details = {
+            "language_id": language_id,
+            "problem_id": problem_id,
+            "structure": structure,
+            "test_cases": formatted_test_cases,
+            "shards": shards,
+            "sources": sources
+        }
+        name = self.debug_capture.capture("submission", json.dumps(submission_details, indent=2), "json")
+        logger.info(f"Captured submission details as {name}")
+
+    @asynccontextmanager
+    async def _scheduled(self, user_id: str, cost: int):
+        """
+        Hold the Judge0 submissions posted inside the block until the scheduler
+        has capacity for `cost` of them, and steer them to the backend it reserved.
+        """
+        if self.scheduler is None or self.execution_backend is not None:
+            yield
+            return
+        backend = await self.scheduler.acquire(user_id, cost)
+        reset_token = preferred_backend.set(backend)
+        try:
+            yield
+        finally:
+            preferred_backend.reset(reset_token)
+
+    async def _submit_batches(self, submissions: list) -> list:
+        """
+        POST submissions to Judge0 in batches of at most self.batch_size,
+        concurrently. Returns one response entry per submission, in order.
+        """
+        if self.execution_backend is not None:
+            return await self.execution_backend.submit(submissions)
+        path = "/submissions/batch"
+        chunks = [
+            submissions[i:i + self.batch_size]
+            for i in range(0, len(submissions), self.batch_size)
+        ]
+        responses = await asyncio.gather(
+            *(self._make_request(path, {"submissions": chunk}) for chunk in chunks)
+        )
+        return [entry for response in responses for entry in response]
+
+    async def _run_preflight(self, submission: dict) -> dict:
+        """
+        Run one submission synchronously (wait=true) so compile errors surface
+        before the remaining shards are submitted. A terminal verdict goes into
+        the verdict store, so status lookups for this run never reach Judge0.
+
+        Returns:
+            dict: {"token": ..., **verdict}. The verdict has no status id if
+            Judge0 answered before the run finished.
+        """
+        if self.execution_backend is not None:
+            return await self.execution_backend.run(submission)
+        try:
+            result = await self.judge0_client.post(
+                "/submissions",
+                submission,
+                params={"base64_encoded": "true", "wait": "true", "fields": STATUS_FIELDS},
+                timeout=self.preflight_timeout
+            )
+        except Judge0UnavailableException:
+            raise
+        except Judge0ClientException as e:
+            logger.error(f"Preflight request error: {str(e)}")
+            raise Exception(f"Failed to make Judge0 API request: {str(e)}")
+
+        token = result.get("token")
+        if not token:
+            raise Exception(f"Judge0 preflight returned no token: {result}")
+        verdict = self._decode_submission(result)
+        self.verdict_store.put(token, verdict)
+        logger.info(f"Preflight {token}: {verdict.get('status', {}).get('description', 'Pending')}")
+        return {"token": token, **verdict}
+
+    def _compile_error_tokens(self, case_count: int, preflight: dict) -> list:
+        """
+        Point every test case at the failed preflight run. The shared token
+        resolves to the compile error from the verdict store; the verdict is
+        also included so clients can show it without polling.
+        """
+        return [
+            {
+                "token": preflight["token"],
+                "status": preflight["status"],
+                "compile_output": preflight.get("compile_output")
+            }
+            for _ in range(case_count)
+        ]
+
+    def _case_tokens(self, shards: list, response: list) -> list:
+        """
+        Map the Judge0 response for each shard back to one entry per test case.
+        Entries without a token (Judge0 rejected the submission) are passed through.
+        """
+        case_entries = {}
+        for shard, entry in zip(shards, response):
+            token = entry.get("token") if isinstance(entry, dict) else None
+            for position, case_index in enumerate(shard):
+                if token is None:
+                    case_entries[case_index] = entry
+                elif len(shard) == 1:
+                    case_entries[case_index] = {"token": token}
+                else:
+                    case_entries[case_index] = {"token": self._case_token(token, position)}
+        return [case_entries[i] for i in sorted(case_entries)]
+
     async def get_submission(self, submission_id: str):
         """
-        Get submission details from Judge0 and decode the response.
+        Get submission details, answering from the verdict store when the
+        submission has already reported, otherwise from Judge0.
         """
+        real_token, case_index = self._split_case_token(submission_id)
+        stored = self.verdict_store.get(real_token)
+        if stored is not None:
+            logger.info(f"Submission {submission_id} answered from verdict store")
+            return self._case_verdict(stored, case_index)
+
+        if self.execution_backend is not None:
+            result = (await self.get_submissions_batch([real_token]))[real_token]
+            if isinstance(result, Exception):
+                raise Exception(f"Failed to get submission: {str(result)}")
+            return self._case_verdict(result, case_index)
+
         logger.info(f"=== Polling Submission {submission_id} ===")
-        url = f"{self.judge0_base_url}/submissions/{submission_id}"
+        url = f"{self.judge0_base_url}/submissions/{real_token}"
         
         querystring = {
             "base64_encoded": "true",
-            "fields": "*"
-        }
-        
-        # Remove Content-Type header for GET request
-        headers = {
-            "x-rapidapi-key": self.headers["x-rapidapi-key"],
-            "x-rapidapi-host": self.headers["x-rapidapi-host"]
+            "fields": STATUS_FIELDS
         }
         
         logger.info(f"Getting submission details from Judge0:")
         logger.info(f"URL: {url}")
         
         try:
-            response = requests.get(
-                url,
-                headers=headers,
+            response_json = await self.judge0_client.get(
+                f"/submissions/{real_token}",
                 params=querystring
             )
-            
-            logger.info(f"Response status: {response.status_code}")
-            response_json = response.json()
-            
-            # Decode base64 fields
-            if response_json.get("source_code"):
-                response_json["source_code"] = base64.b64decode(response_json["source_code"]).decode('utf-8')
-            if response_json.get("stdin"):
-                response_json["stdin"] = base64.b64decode(response_json["stdin"]).decode('utf-8')
-            if response_json.get("stdout"):
-                response_json["stdout"] = base64.b64decode(response_json["stdout"]).decode('utf-8')
-            if response_json.get("stderr"):
-                response_json["stderr"] = base64.b64decode(response_json["stderr"]).decode('utf-8')
-            if response_json.get("compile_output"):
-                response_json["compile_output"] = base64.b64decode(response_json["compile_output"]).decode('utf-8')
-            if response_json.get("message"):
-                response_json["message"] = base64.b64decode(response_json["message"]).decode('utf-8')
-            if response_json.get("expected_output"):
-                response_json["expected_output"] = base64.b64decode(response_json["expected_output"]).decode('utf-8')
-
-            # Log decoded response
-            logger.info("Decoded Judge0 response:")
-            logger.info(f"Status: {response_json.get('status', {}).get('description', 'Unknown')}")
-            logger.info(f"Compile Output: {response_json.get('compile_output', 'None')}")
-            logger.info(f"Stdout: {response_json.get('stdout', 'None')}")
-            logger.info(f"Stderr: {response_json.get('stderr', 'None')}")
-            logger.info(f"Exit Code: {response_json.get('exit_code', 'None')}")
-            logger.info(f"Time: {response_json.get('time', 'None')}")
-            logger.info(f"Memory: {response_json.get('memory', 'None')}")
-
-            # Format response for frontend
-            formatted_response = {
-                "status": response_json.get("status", {}),
-                "compile_output": response_json.get("compile_output"),
-                "stdout": response_json.get("stdout"),
-                "stderr": response_json.get("stderr"),
-                "time": response_json.get("time"),
-                "memory": response_json.get("memory"),
-                "exit_code": response_json.get("exit_code"),
-                "expected_output": response_json.get("expected_output")
-            }
-
-            return formatted_response
+            result = self._decode_submission(response_json)
+            self.verdict_store.put(real_token, result)
+            return self._case_verdict(result, case_index)
 
-        except requests.exceptions.RequestException as e:
+        except Judge0UnavailableException:
+            raise
+        except Judge0ClientException as e:
             logger.error(f"Request failed: {str(e)}")
-            logger.error(f"Response content: {e.response.text if hasattr(e, 'response') else 'No response content'}")
             raise Exception(f"Failed to get submission: {str(e)}")
         except Exception as e:
             logger.error(f"Error processing submission response: {str(e)}")
             raise Exception(f"Failed to process submission response: {str(e)}")
 
-    async def get_submissions_status(self, tokens: list[str]):
-        """Get status for multiple submissions"""
+    async def get_submissions_batch(self, tokens: list[str], max_concurrency: int = None) -> dict:
+        """
+        Get many submissions through Judge0's batch GET endpoint.
+
+        Tokens are split into chunks of at most self.batch_size and the chunks are
+        fetched concurrently (bounded by max_concurrency). Returns a dict mapping
+        each token to its decoded submission, or to the Exception raised while
+        fetching it, so one failing chunk does not affect the others.
+        """
+        if self.execution_backend is not None:
+            return await self.execution_backend.fetch(list(dict.fromkeys(tokens)))
+        if max_concurrency is None:
+            max_concurrency = self.status_concurrency
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        unique_tokens = list(dict.fromkeys(tokens))
+        chunks = [
+            unique_tokens[i:i + self.batch_size]
+            for i in range(0, len(unique_tokens), self.batch_size)
+        ]
+
+        async def fetch_chunk(chunk: list[str]) -> dict:
+            async with semaphore:
+                try:
+                    response_json = await self.judge0_client.get(
+                        "/submissions/batch",
+                        params={
+                            "tokens": ",".join(chunk),
+                            "base64_encoded": "true",
+                            "fields": STATUS_FIELDS
+                        }
+                    )
+                except Exception as e:
+                    logger.error(f"Error getting batch status for {len(chunk)} submissions: {e}")
+                    return {token: e for token in chunk}
+
+            chunk_results = {}
+            for submission in response_json.get("submissions", []):
+                if submission and submission.get("token") in chunk:
+                    try:
+                        chunk_results[submission["token"]] = self._decode_submission(submission)
+                    except Exception as e:
+                        chunk_results[submission["token"]] = e
+            for token in chunk:
+                if token not in chunk_results:
+                    chunk_results[token] = Exception(f"Submission {token} not found")
+            return chunk_results
+
+        logger.info(f"Fetching {len(unique_tokens)} submissions in {len(chunks)} batch request(s)")
+        results = {}
+        for chunk_results in await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks)):
+            results.update(chunk_results)
+        return results
+
+    async def get_submissions_status(self, tokens: list[str], max_concurrency: int = None):
+        """
+        Get status for multiple submissions.
+        Tokens that already have a stored verdict are answered locally; only the
+        rest go to Judge0 through batched lookups. A failure for one token is
+        reported in its own result without affecting the others.
+        """
+        real_tokens = list(dict.fromkeys(self._split_case_token(token)[0] for token in tokens))
+        submissions = dict(self.verdict_store.get_many(real_tokens))
+        pending_tokens = [token for token in real_tokens if token not in submissions]
+        if pending_tokens:
+            fetched = await self.get_submissions_batch(pending_tokens, max_concurrency)
+            for token, result in fetched.items():
+                if not isinstance(result, Exception):
+                    self.verdict_store.put(token, result)
+            submissions.update(fetched)
+        logger.info(
+            f"Status for {len(tokens)} test cases: {len(real_tokens) - len(pending_tokens)}/"
+            f"{len(real_tokens)} submissions from verdict store"
+        )
+
         results = []
-        
         for i, token in enumerate(tokens):
-            try:
-                result = await self.get_submission(token)
-                results.append({
-                    "test_case_index": i,
-                    "token": token,
-                    "status": result["status"],
-                    "compile_output": result.get("compile_output"),
-                    "stdout": result.get("stdout"),
-                    "stderr": result.get("stderr"),
-                    "expected_output": result.get("expected_output"),
-                    "passed": result["status"]["id"] == 3  # 3 is Accepted
-                })
-            except Exception as e:
-                logger.error(f"Error getting status for submission {token}: {e}")
-                results.append({
-                    "test_case_index": i,
-                    "token": token,
-                    "error": str(e),
-                    "passed": False
-                })
+            real_token, case_index = self._split_case_token(token)
+            result = submissions.get(real_token)
+            if not isinstance(result, Exception) and result is not None:
+                result = self._case_verdict(result, case_index)
+            results.append(self._format_status_result(i, token, result))
         
         # Calculate overall status
         all_completed = all(r.get("status", {}).get("id") not in [1, 2] for r in results)
@@ -240,37 +548,214 @@ class ProblemSubmissionService:
             "results": results
         }
 
-    async def _make_request(self, url: str, payload: dict) -> dict:
+    async def stream_submissions_status(self, tokens: list[str]):
+        """
+        Yield per-test-case results as each submission finishes.
+
+        Verdicts come from the verdict store, the Judge0 callback or the shared
+        background poller, whichever is first. Yields (event, data) tuples:
+        ("result", result) once per test case, ("heartbeat", None) while waiting,
+        and a final ("done", summary) with the same completed/passed flags as
+        get_submissions_status.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.stream_timeout
+        # Judge0 token -> [(test case index, requested token, harness case index)]
+        token_cases = {}
+        for i, token in enumerate(tokens):
+            real_token, case_index = self._split_case_token(token)
+            token_cases.setdefault(real_token, []).append((i, token, case_index))
+        real_tokens = list(token_cases)
+        results = {}
+
+        def collect(real_token: str, verdict: dict) -> list:
+            new_results = []
+            for i, token, case_index in token_cases.get(real_token, []):
+                if i not in results:
+                    results[i] = self._format_status_result(i, token, self._case_verdict(verdict, case_index))
+                    new_results.append(results[i])
+            return new_results
+
+        # Subscribe before reading the store so no callback slips in between
+        queue = self.verdict_broadcaster.subscribe(real_tokens)
+        try:
+            for token, verdict in self.verdict_store.get_many(real_tokens).items():
+                for result in collect(token, verdict):
+                    yield "result", result
+
+            if len(results) < len(tokens):
+                self.verdict_broadcaster.ensure_poller(self.get_submissions_batch)
+
+            while len(results) < len(tokens):
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    logger.warning(f"Submission stream timed out with {len(tokens) - len(results)} pending")
+                    break
+                try:
+                    token, verdict = await asyncio.wait_for(
+                        queue.get(), timeout=min(remaining, self.stream_heartbeat)
+                    )
+                except asyncio.TimeoutError:
+                    yield "heartbeat", None
+                    continue
+                if VerdictStore.is_terminal(verdict):
+                    for result in collect(token, verdict):
+                        yield "result", result
+        finally:
+            self.verdict_broadcaster.unsubscribe(queue)
+
+        ordered = [results[i] for i in sorted(results)]
+        yield "done", {
+            "completed": len(results) == len(tokens),
+            "passed": len(results) == len(tokens) and all(r.get("passed", False) for r in ordered),
+            "results": ordered
+        }
+
+    def ingest_callback(self, callback_data: dict) -> dict:
+        """
+        Decode a submission pushed by the Judge0 callback and record its verdict.
+
+        Returns:
+            dict: The decoded verdict, including its token.
+
+        Raises:
+            ValueError: If the payload has no token.
+        """
+        token = callback_data.get("token")
+        if not token:
+            raise ValueError("Callback payload does not contain a submission token")
+        verdict = self._decode_submission(dict(callback_data))
+        stored = self.verdict_store.put(token, verdict)
+        if stored:
+            self.verdict_broadcaster.publish(token, verdict)
+        logger.info(
+            f"Callback for submission {token}: "
+            f"{verdict['status'].get('description', 'Unknown')} (stored: {stored})"
+        )
+        return {"token": token, **verdict}
+
+    def _case_token(self, token: str, case_index: int) -> str:
+        """Build the per-test-case token for one case of a harness run."""
+        return f"{token}{CASE_TOKEN_SEPARATOR}{case_index}"
+
+    def _split_case_token(self, token: str) -> tuple:
+        """
+        Split a token into (Judge0 token, harness case index).
+        The case index is None for regular one-submission-per-test tokens.
+        """
+        real_token, separator, case_index = token.rpartition(CASE_TOKEN_SEPARATOR)
+        if separator and case_index.isdigit():
+            return real_token, int(case_index)
+        return token, None
+
+    def _case_verdict(self, verdict: dict, case_index: int = None) -> dict:
+        """
+        Extract one test case's verdict from a harness run.
+        Regular submissions (case_index None) are returned unchanged.
+        """
+        if case_index is None:
+            return verdict
+
+        status_id = verdict.get("status", {}).get("id")
+        # Queued, processing and compile errors apply to every case alike
+        if status_id in (1, 2, 6):
+            return verdict
+
+        expected = harness_protocol.split_output(verdict.get("expected_output")).get(case_index, {})
+        expected_output = expected.get("stdout")
+        case = harness_protocol.split_output(verdict.get("stdout")).get(case_index)
+
+        case_result = {
+            **verdict,
+            "stdout": case["stdout"] if case else None,
+            "expected_output": expected_output
+        }
+        if case is None:
+            # The run ended before this case finished (time limit, crash, System.exit)
+            if status_id in (3, 4):
+                case_result["status"] = RUNTIME_ERROR_STATUS
+                case_result["stderr"] = verdict.get("stderr") or "Test case did not complete"
+        elif case["error"]:
+            case_result["status"] = RUNTIME_ERROR_STATUS
+            case_result["stderr"] = case["error"]
+        elif harness_protocol.outputs_match(case["stdout"], expected_output):
+            case_result["status"] = ACCEPTED_STATUS
+        else:
+            case_result["status"] = WRONG_ANSWER_STATUS
+        return case_result
+
+    def _format_status_result(self, index: int, token: str, result) -> dict:
         """
-        Make a request to Judge0 API
+        Shape a decoded submission (or the error raised fetching it) into a
+        per-test-case status result.
+        """
+        if isinstance(result, Exception) or result is None:
+            logger.error(f"Error getting status for submission {token}: {result}")
+            return {
+                "test_case_index": index,
+                "token": token,
+                "error": str(result),
+                "passed": False
+            }
+        return {
+            "test_case_index": index,
+            "token": token,
+            "status": result["status"],
+            "compile_output": result.get("compile_output"),
+            "stdout": result.get("stdout"),
+            "stderr": result.get("stderr"),
+            "expected_output": result.get("expected_output"),
+            "passed": result["status"]["id"] == 3  # 3 is Accepted
+        }
+
+    def _decode_submission(self, response_json: dict) -> dict:
+        """
+        Decode the base64 fields of a Judge0 submission and format it for the frontend.
+        """
+        for field in BASE64_FIELDS:
+            if response_json.get(field):
+                response_json[field] = base64.b64decode(response_json[field]).decode('utf-8')
+
+        logger.debug(
+            f"Decoded Judge0 response {response_json.get('token', '')}: "
+            f"status={response_json.get('status', {}).get('description', 'Unknown')}, "
+            f"exit_code={response_json.get('exit_code')}, time={response_json.get('time')}, "
+            f"memory={response_json.get('memory')}"
+        )
+
+        # Format response for frontend
+        return {
+            "status": response_json.get("status", {}),
+            "compile_output": response_json.get("compile_output"),
+            "stdout": response_json.get("stdout"),
+            "stderr": response_json.get("stderr"),
+            "time": response_json.get("time"),
+            "memory": response_json.get("memory"),
+            "exit_code": response_json.get("exit_code"),
+            "expected_output": response_json.get("expected_output")
+        }
+
+    async def _make_request(self, path: str, payload: dict) -> dict:
+        """
+        Make a request to Judge0 API through the shared async client
         """
         try:
-            logger.info(f"Making request to: {url}")
-            logger.info(f"Payload: {json.dumps(payload, indent=2)}")
+            logger.info(f"Making request to: {self.judge0_base_url}{path}")
+            logger.debug("Payload: %s", log_json(payload))
             
-            response = requests.post(
-                url,
-                headers=self.headers,
-                json=payload,
+            result = await self.judge0_client.post(
+                path,
+                payload,
                 params={"base64_encoded": "true", "fields": "*"}
             )
-            
-            logger.info(f"Response status: {response.status_code}")
-            
-            if not response.ok:
-                error_text = response.text
-                logger.error(f"Request failed with status {response.status_code}: {error_text}")
-                raise Exception(f"Judge0 API request failed: {error_text}")
-            
-            result = response.json()
-            logger.info(f"Response: {json.dumps(result, indent=2)}")
+            logger.debug("Response: %s", log_json(result))
             
             return result
         
-        except requests.exceptions.RequestException as e:
+        except Judge0UnavailableException:
+            raise
+        except Judge0ClientException as e:
             logger.error(f"Request error: {str(e)}")
-            if hasattr(e, 'response'):
-                logger.error(f"Response content: {e.response.text}")
             raise Exception(f"Failed to make Judge0 API request: {str(e)}")
         except Exception as e:
             logger.error(f"Unexpected error: {str(e)}")
@@ -0,0 +1,124 @@
+"""
+Process-level limits and isolation shared by the local execution backend's runners.
+"""
+
+import os
+import ctypes
+import signal
+import resource
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+# unshare(2) flags from <sched.h>
+CLONE_NEWUSER = 0x10000000
+CLONE_NEWNET = 0x40000000
+
+@dataclass(frozen=True)
+class ExecutionLimits:
+    cpu_seconds: float = 5.0
+    wall_seconds: float = 10.0
+    memory_mb: int = 256
+    max_output_bytes: int = 1024 * 1024
+    compile_seconds: float = 30.0
+
+def limit_resources(limits: ExecutionLimits, limit_address_space: bool = True) -> Callable[[], None]:
+    """Build a function that applies CPU, output and (optionally) memory rlimits to the calling process."""
+    cpu = max(1, int(limits.cpu_seconds + 0.999))
+    memory_bytes = limits.memory_mb * 1024 * 1024
+
+    def apply():
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+        resource.setrlimit(resource.RLIMIT_FSIZE, (limits.max_output_bytes, limits.max_output_bytes))
+        resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+        if limit_address_space:
+            resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+    return apply
+
+@dataclass(frozen=True)
+class SandboxPolicy:
+    """
+    Isolation for student processes on top of the rlimits. They always get
+    a fixed environment (see sandbox_env). With isolate_network they run in a
+    new network namespace with no interfaces up. When the server runs as
+    root they drop to uid/gid; uid None keeps the server's uid, which
+    compilers use so student code can't touch the build cache.
+    """
+    uid: Optional[int] = 65534
+    gid: Optional[int] = 65534
+    isolate_network: bool = True
+
+    @property
+    def drops_privileges(self) -> bool:
+        return self.uid is not None and os.geteuid() == 0
+
+def sandbox_env(work_dir: str) -> Dict[str, str]:
+    """
+    The whole environment a student process sees. Nothing is inherited from
+    the server, whose environment holds API keys.
+    """
+    return {"PATH": os.environ.get("PATH", os.defpath), "LANG": "C.UTF-8", "HOME": work_dir}
+
+def _unshare(flags: int) -> None:
+    libc = ctypes.CDLL(None, use_errno=True)
+    if not hasattr(libc, "unshare"):
+        raise OSError("Network isolation needs Linux namespaces (unshare)")
+    if libc.unshare(flags) != 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, f"unshare failed: {os.strerror(errno)}")
+
+def isolate(policy: SandboxPolicy) -> Callable[[], None]:
+    """
+    Build a function that cuts the calling process off from the network and
+    drops its privileges. It raises if that isn't possible, so a run never
+    goes ahead unisolated.
+    """
+    def apply():
+        if policy.isolate_network:
+            # Without root a user namespace is what allows an unprivileged network namespace
+            _unshare(CLONE_NEWNET if os.geteuid() == 0 else CLONE_NEWUSER | CLONE_NEWNET)
+        if policy.drops_privileges:
+            os.setgroups([])
+            os.setgid(policy.gid)
+            os.setuid(policy.uid)
+    return apply
+
+def confine(limits: ExecutionLimits, policy: SandboxPolicy, limit_address_space: bool = True) -> Callable[[], None]:
+    """preexec_fn applying the rlimits, then the isolation."""
+    apply_limits = limit_resources(limits, limit_address_space)
+    apply_isolation = isolate(policy)
+
+    def apply():
+        apply_limits()
+        apply_isolation()
+    return apply
+
+def private_opener(path: str, flags: int) -> int:
+    """open() opener for run files only the server may read (students get them as descriptors)."""
+    return os.open(path, flags, 0o600)
+
+def wait_with_timeout(pid: int, wall_seconds: float) -> Tuple[bool, int, "resource.struct_rusage"]:
+    """
+    Wait for a child that leads its own process group, killing the group once
+    wall_seconds have passed. wait4 reports the child's own CPU time and peak memory.
+
+    Returns:
+        (timed_out, wait_status, rusage)
+    """
+    outcome = {}
+    waiter = threading.Thread(target=lambda: outcome.update(result=os.wait4(pid, 0)), daemon=True)
+    waiter.start()
+    waiter.join(wall_seconds)
+    timed_out = waiter.is_alive()
+    if timed_out:
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        waiter.join()
+    _, wait_status, usage = outcome["result"]
+    return timed_out, wait_status, usage
+
+def read_output(path: str, max_bytes: int) -> str:
+    with open(path, "rb") as f:
+        return f.read(max_bytes).decode("utf-8", errors="replace")
@@ -0,0 +1,130 @@
+import os
+import math
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class ShardPlanner:
+    """
+    Decides how formatted test cases are grouped into Judge0 runs.
+
+    Each shard is one Judge0 submission: a shard with a single case runs the
+    regular one-test program, a larger shard runs the multi-test harness.
+
+    Modes:
+        per_test: one shard per test case (maximum isolation).
+        single: every case in one shard (one JVM for the whole problem).
+        auto: estimate each case's cost from its input size, give expensive
+            cases their own shard and pack the cheap ones into as few shards
+            as fit within the time limit.
+    """
+
+    MODES = ("per_test", "single", "auto")
+
+    def __init__(
+        self,
+        mode: str = "auto",
+        time_limit: float = 5.0,
+        max_shards: int = 20,
+        startup_seconds: float = 0.5,
+        case_seconds: float = 0.02,
+        seconds_per_input_byte: float = 2e-6,
+        time_limit_headroom: float = 0.5,
+        isolation_ratio: float = 0.5,
+    ):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown shard mode: {mode}")
+        self.mode = mode
+        self.time_limit = time_limit
+        self.max_shards = max(1, max_shards)
+        self.startup_seconds = startup_seconds
+        self.case_seconds = case_seconds
+        self.seconds_per_input_byte = seconds_per_input_byte
+        self.time_limit_headroom = time_limit_headroom
+        self.isolation_ratio = isolation_ratio
+
+    @classmethod
+    def from_env(cls) -> "ShardPlanner":
+        return cls(
+            mode=os.getenv("JUDGE0_SHARD_MODE", "auto").lower(),
+            time_limit=float(os.getenv("JUDGE0_CPU_TIME_LIMIT", "5")),
+            max_shards=int(os.getenv("JUDGE0_MAX_SHARDS", "20")),
+        )
+
+    def estimate_cost(self, formatted_case: Dict[str, str]) -> float:
+        """Estimated run time of one case in seconds, excluding JVM start-up."""
+        input_bytes = len(formatted_case.get("input", "").encode("utf-8"))
+        return self.case_seconds + input_bytes * self.seconds_per_input_byte
+
+    def plan(
+        self,
+        formatted_cases: List[Dict[str, str]],
+        time_limit: Optional[float] = None,
+        mode: Optional[str] = None,
+    ) -> List[List[int]]:
+        """
+        Group test case indices into shards.
+
+        Args:
+            formatted_cases: Test cases as returned by Judge0TestCaseGenerator.generate_test_cases.
+            time_limit: CPU time limit per run in seconds (defaults to the planner's).
+            mode: Overrides the planner's mode for this call.
+
+        Returns:
+            List[List[int]]: Shards in submission order. Every case index appears
+            in exactly one shard, in ascending order within the shard.
+        """
+        mode = mode or self.mode
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown shard mode: {mode}")
+        case_count = len(formatted_cases)
+        if case_count == 0:
+            return []
+        if mode == "per_test":
+            return [[i] for i in range(case_count)]
+        if mode == "single" or case_count == 1:
+            return [list(range(case_count))]
+
+        time_limit = time_limit or self.time_limit
+        # Time a shard may spend running cases once the JVM is up
+        budget = max(time_limit * self.time_limit_headroom - self.startup_seconds, self.case_seconds)
+        costs = [self.estimate_cost(case) for case in formatted_cases]
+
+        # Expensive cases run alone so they cannot push others over the limit
+        expensive = sorted(
+            (i for i in range(case_count) if costs[i] > budget * self.isolation_ratio),
+            key=lambda i: costs[i],
+            reverse=True,
+        )
+        isolated = sorted(expensive[:self.max_shards - 1])
+        isolated_set = set(isolated)
+        cheap = [i for i in range(case_count) if i not in isolated_set]
+
+        shards = [[i] for i in isolated]
+        if cheap:
+            cheap_total = sum(costs[i] for i in cheap)
+            shard_count = max(1, math.ceil(cheap_total / budget))
+            shard_count = min(shard_count, len(cheap), self.max_shards - len(shards))
+            shards.extend(self._balance(cheap, costs, shard_count))
+
+        shards.sort(key=lambda shard: shard[0])
+        logger.info(
+            f"Planned {len(shards)} shard(s) for {case_count} test cases "
+            f"({len(isolated)} isolated, time limit {time_limit}s)"
+        )
+        return shards
+
+    def _balance(self, indices: List[int], costs: List[float], shard_count: int) -> List[List[int]]:
+        """Split indices into up to shard_count contiguous shards of roughly equal cost."""
+        if shard_count <= 1:
+            return [list(indices)]
+        target = sum(costs[i] for i in indices) / shard_count
+        shards: List[List[int]] = [[] for _ in range(shard_count)]
+        consumed = 0.0
+        for i in indices:
+            # Place each case by the midpoint of its cost span
+            position = min(shard_count - 1, int((consumed + costs[i] / 2) / target))
+            shards[position].append(i)
+            consumed += costs[i]
+        return [shard for shard in shards if shard]
@@ -0,0 +1,136 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class SubmissionCache:
+    """
+    Content-addressed cache of submitted code.
+
+    Maps a hash of (language, normalized source, structure, test cases) to the
+    per-test-case tokens Judge0 returned for it. Because terminal verdicts are
+    kept in the verdict store by token, a repeated submit of unchanged code
+    gets its results back without another Judge0 run. Entries are bounded by
+    count (LRU) and age (TTL), and identical submits that arrive while the
+    first one is still being sent share its single Judge0 batch.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        ttl_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, List[dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def normalize_source(source_code: str) -> str:
+        """Ignore line endings, trailing whitespace and surrounding blank lines."""
+        lines = source_code.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+        return "\n".join(line.rstrip() for line in lines).strip()
+
+    @classmethod
+    def key_for(cls, language_id: int, source_code: str, structure, test_cases: list) -> str:
+        """Hash everything that determines a submission's verdicts."""
+        if isinstance(structure, str):
+            try:
+                structure = json.loads(structure)
+            except json.JSONDecodeError:
+                pass
+        content = json.dumps(
+            {
+                "language_id": language_id,
+                "source_code": cls.normalize_source(source_code or ""),
+                "structure": structure,
+                "test_cases": test_cases,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[List[dict]]:
+        """Return the cached tokens for a key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created_at, tokens = entry
+            if self._clock() - created_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return [dict(token) for token in tokens]
+
+    def put(self, key: str, tokens: List[dict]) -> None:
+        """Cache the tokens of a submission, evicting the least recently used entries."""
+        with self._lock:
+            self._entries[key] = (self._clock(), [dict(token) for token in tokens])
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        """Forget a key, e.g. when its verdicts turned out to be unusable."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    async def get_or_submit(self, key: str, submit: Callable[[], Awaitable[List[dict]]]) -> List[dict]:
+        """
+        Return cached tokens for key, or run submit() once and cache its result.
+        Concurrent calls for a key that is being submitted wait for that
+        submission instead of starting their own. Failures are not cached.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            logger.info(f"Submission cache hit for {key[:12]}")
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            logger.info(f"Joining in-flight submission {key[:12]}")
+            tokens = await asyncio.shield(inflight)
+            return [dict(token) for token in tokens]
+
+        future = asyncio.get_running_loop().create_future()
+        # Mark the outcome as retrieved even if nobody else was waiting for it
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            tokens = await submit()
+        except asyncio.CancelledError:
+            future.set_exception(Exception("Identical submission was cancelled"))
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            self.put(key, tokens)
+            future.set_result(tokens)
+            return [dict(token) for token in tokens]
+        finally:
+            self._inflight.pop(key, None)
+
+_submission_cache: Optional[SubmissionCache] = None
+
+def get_submission_cache() -> SubmissionCache:
+    """Return the process-wide submission cache, creating it on first use."""
+    global _submission_cache
+    if _submission_cache is None:
+        _submission_cache = SubmissionCache(
+            max_entries=int(os.getenv("SUBMISSION_CACHE_MAX_ENTRIES", "1000")),
+            ttl_seconds=float(os.getenv("SUBMISSION_CACHE_TTL_SECONDS", "3600")),
+        )
+    return _submission_cache
@@ -0,0 +1,234 @@
+import os
+import time
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Deque, Dict, Optional
+
+from .judge0_router import Judge0Router
+
+logger = logging.getLogger(__name__)
+
+class SchedulerSaturatedException(Exception):
+    """Raised when a submission cannot be queued; carries what the client needs to retry."""
+
+    def __init__(self, message: str, queue_position: int, eta_seconds: float):
+        super().__init__(message)
+        self.queue_position = queue_position
+        self.eta_seconds = eta_seconds
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self.tokens = capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, cost: float) -> float:
+        """Seconds until `cost` tokens are available (0 if they are now)."""
+        self._refill()
+        missing = min(cost, self.capacity) - self.tokens
+        return 0.0 if missing <= 0 else missing / self.rate
+
+    def consume(self, cost: float) -> bool:
+        """Take `cost` tokens (capped at the bucket size) if available."""
+        if self.delay(cost) > 0:
+            return False
+        self.tokens -= min(cost, self.capacity)
+        return True
+
+class _Waiter:
+    def __init__(self, user_id: str, cost: int, future: asyncio.Future):
+        self.user_id = user_id
+        self.cost = cost
+        self.future = future
+
+class SubmissionScheduler:
+    """
+    Paces outbound Judge0 submissions to each backend's plan limits.
+
+    Every backend of the router gets a token bucket sized from its requests
+    per second and burst; a submission costs one token per Judge0 submission
+    it posts and is assigned the backend whose bucket paid for it. When no
+    bucket has room, callers wait in a bounded queue that is served
+    round-robin across users, so one student resubmitting cannot starve the
+    class. Callers that cannot be queued (queue full, too many of their own
+    submissions waiting, or an expected wait past the limit) get a
+    SchedulerSaturatedException with their would-be queue position and ETA.
+    """
+
+    def __init__(
+        self,
+        router: Judge0Router,
+        buckets: Dict[str, TokenBucket],
+        max_queue: int = 100,
+        max_queue_per_user: int = 3,
+        max_wait_seconds: float = 30.0,
+    ):
+        self.router = router
+        self.buckets = buckets
+        self.max_queue = max_queue
+        self.max_queue_per_user = max_queue_per_user
+        self.max_wait_seconds = max_wait_seconds
+        self._queues: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    @classmethod
+    def for_router(cls, router: Judge0Router, **kwargs) -> "SubmissionScheduler":
+        """Build one bucket per router backend from its requests_per_second and burst."""
+        buckets = {
+            backend.name: TokenBucket(backend.requests_per_second, backend.burst)
+            for backend in router.backends
+            if backend.requests_per_second
+        }
+        return cls(router, buckets, **kwargs)
+
+    @property
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _total_rate(self) -> float:
+        return sum(bucket.rate for bucket in self.buckets.values()) or 1.0
+
+    def _try_assign(self, cost: int) -> Optional[str]:
+        """Pick the healthiest backend with quota whose bucket can pay for cost right now."""
+        for backend in self.router.ranked_backends(cost):
+            if not backend.is_available(cost):
+                continue
+            bucket = self.buckets.get(backend.name)
+            if bucket is None or bucket.consume(cost):
+                return backend.name
+        return None
+
+    def _next_delay(self, cost: int) -> float:
+        delays = [
+            self.buckets[backend.name].delay(cost) if backend.name in self.buckets else 0.0
+            for backend in self.router.backends
+            if backend.is_available(cost)
+        ]
+        if delays:
+            return min(delays)
+        # Every backend is out of daily quota: nothing frees up before midnight UTC
+        now = datetime.now(timezone.utc)
+        midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        return (midnight - now).total_seconds()
+
+    def _reject(self, reason: str, cost: int) -> SchedulerSaturatedException:
+        queued_cost = sum(w.cost for queue in self._queues.values() for w in queue)
+        eta = max(self._next_delay(cost), (queued_cost + cost) / self._total_rate())
+        logger.warning(f"Submission queue saturated ({reason}); {self.queued} waiting, ETA {eta:.1f}s")
+        return SchedulerSaturatedException(
+            f"Judge is busy: {reason}. Please retry in about {int(eta + 0.999)} seconds.",
+            queue_position=self.queued + 1,
+            eta_seconds=round(eta, 1),
+        )
+
+    async def acquire(self, user_id: str, cost: int = 1) -> str:
+        """
+        Wait for capacity to post `cost` Judge0 submissions for a user.
+
+        Returns:
+            The name of the backend that should serve them.
+
+        Raises:
+            SchedulerSaturatedException: If the submission cannot be queued.
+        """
+        user_id = user_id or "anonymous"
+        if not self._queues:
+            backend = self._try_assign(cost)
+            if backend is not None:
+                return backend
+
+        if self.queued >= self.max_queue:
+            raise self._reject("submission queue is full", cost)
+        if len(self._queues.get(user_id, ())) >= self.max_queue_per_user:
+            raise self._reject("too many of your submissions are already waiting", cost)
+        queued_cost = sum(w.cost for queue in self._queues.values() for w in queue)
+        expected_wait = max(self._next_delay(cost), (queued_cost + cost) / self._total_rate())
+        if expected_wait > self.max_wait_seconds:
+            raise self._reject("expected wait is too long", cost)
+
+        waiter = _Waiter(user_id, cost, asyncio.get_running_loop().create_future())
+        self._queues.setdefault(user_id, deque()).append(waiter)
+        logger.info(f"Queued submission for {user_id} at position {self.queued} (ETA {expected_wait:.1f}s)")
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        try:
+            return await waiter.future
+        finally:
+            self._remove(waiter)
+
+    def _remove(self, waiter: _Waiter) -> None:
+        queue = self._queues.get(waiter.user_id)
+        if queue is None:
+            return
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            pass
+        if not queue:
+            del self._queues[waiter.user_id]
+
+    async def _dispatch(self) -> None:
+        """Serve queued waiters round-robin across users as buckets refill."""
+        while self._queues:
+            user_id, queue = next(iter(self._queues.items()))
+            waiter = queue[0]
+            if waiter.future.done():
+                self._remove(waiter)
+                continue
+            backend = self._try_assign(waiter.cost)
+            if backend is None:
+                await asyncio.sleep(max(0.01, min(self._next_delay(waiter.cost), 1.0)))
+                continue
+            waiter.future.set_result(backend)
+            self._remove(waiter)
+            # Move this user to the back of the line
+            if user_id in self._queues:
+                self._queues.move_to_end(user_id)
+
+    async def aclose(self) -> None:
+        """Stop dispatching and fail anything still waiting."""
+        if self._dispatcher is not None and not self._dispatcher.done():
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+        for queue in list(self._queues.values()):
+            for waiter in queue:
+                if not waiter.future.done():
+                    waiter.future.set_exception(
+                        SchedulerSaturatedException("Server is shutting down", queue_position=0, eta_seconds=0)
+                    )
+        self._queues.clear()
+
+_submission_scheduler: Optional[SubmissionScheduler] = None
+
+def get_submission_scheduler(router: Judge0Router) -> SubmissionScheduler:
+    """Return the process-wide submission scheduler, creating it on first use."""
+    global _submission_scheduler
+    if _submission_scheduler is None:
+        _submission_scheduler = SubmissionScheduler.for_router(
+            router,
+            max_queue=int(os.getenv("SUBMISSION_QUEUE_MAX", "100")),
+            max_queue_per_user=int(os.getenv("SUBMISSION_QUEUE_MAX_PER_USER", "3")),
+            max_wait_seconds=float(os.getenv("SUBMISSION_QUEUE_MAX_WAIT_SECONDS", "30")),
+        )
+    return _submission_scheduler
+
+async def close_submission_scheduler() -> None:
+    """Stop the process-wide submission scheduler, if one was created."""
+    global _submission_scheduler
+    if _submission_scheduler is not None:
+        await _submission_scheduler.aclose()
+        _submission_scheduler = None
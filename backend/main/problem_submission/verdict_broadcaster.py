@@ -0,0 +1,109 @@
+import os
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+from main.shared.deadline import request_deadline
+from .verdict_store import VerdictStore
+
+logger = logging.getLogger(__name__)
+
+# Fetches the given tokens from Judge0; returns token -> decoded verdict (or Exception)
+BatchFetcher = Callable[[List[str]], Awaitable[Dict[str, object]]]
+
+class VerdictBroadcaster:
+    """
+    Fans verdicts out to everyone watching a submission token.
+
+    Verdicts arrive either from the Judge0 callback (publish) or from a single
+    background poller shared by all watchers, which only asks Judge0 about
+    tokens that someone is watching and that have not reported yet.
+    """
+
+    def __init__(self, verdict_store: VerdictStore, poll_interval: float = 2.0):
+        self.verdict_store = verdict_store
+        self.poll_interval = poll_interval
+        self._watchers: Dict[str, Set[asyncio.Queue]] = {}
+        self._poller: Optional[asyncio.Task] = None
+        self._fetch_batch: Optional[BatchFetcher] = None
+
+    def subscribe(self, tokens: List[str]) -> asyncio.Queue:
+        """Register interest in tokens; verdicts are delivered as (token, verdict) tuples."""
+        queue: asyncio.Queue = asyncio.Queue()
+        for token in tokens:
+            self._watchers.setdefault(token, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Stop delivering verdicts to a queue."""
+        for token in list(self._watchers):
+            watchers = self._watchers[token]
+            watchers.discard(queue)
+            if not watchers:
+                del self._watchers[token]
+
+    def publish(self, token: str, verdict: dict) -> None:
+        """Deliver a verdict to every queue watching the token."""
+        for queue in self._watchers.get(token, ()):
+            queue.put_nowait((token, verdict))
+
+    def ensure_poller(self, fetch_batch: BatchFetcher) -> None:
+        """Start the shared background poller if it is not already running."""
+        self._fetch_batch = fetch_batch
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll_loop())
+
+    async def _poll_loop(self) -> None:
+        # The poller outlives the request that started it, so it must not inherit its deadline
+        request_deadline.set(None)
+        logger.info("Verdict poller started")
+        try:
+            while self._watchers:
+                await asyncio.sleep(self.poll_interval)
+                tokens = list(self._watchers)
+                stored = self.verdict_store.get_many(tokens)
+                for token, verdict in stored.items():
+                    self.publish(token, verdict)
+                pending = [token for token in tokens if token not in stored]
+                if not pending:
+                    continue
+                try:
+                    fetched = await self._fetch_batch(pending)
+                except Exception as e:
+                    logger.error(f"Verdict poller failed to fetch {len(pending)} submissions: {e}")
+                    continue
+                for token, verdict in fetched.items():
+                    # Only terminal verdicts are stored and broadcast
+                    if not isinstance(verdict, Exception) and self.verdict_store.put(token, verdict):
+                        self.publish(token, verdict)
+        finally:
+            logger.info("Verdict poller stopped")
+
+    async def aclose(self) -> None:
+        """Cancel the background poller."""
+        if self._poller is not None and not self._poller.done():
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+        self._poller = None
+
+_verdict_broadcaster: Optional[VerdictBroadcaster] = None
+
+def get_verdict_broadcaster(verdict_store: VerdictStore) -> VerdictBroadcaster:
+    """Return the process-wide broadcaster, creating it on first use."""
+    global _verdict_broadcaster
+    if _verdict_broadcaster is None:
+        _verdict_broadcaster = VerdictBroadcaster(
+            verdict_store,
+            poll_interval=float(os.getenv("VERDICT_POLL_INTERVAL_SECONDS", "2")),
+        )
+    return _verdict_broadcaster
+
+async def close_verdict_broadcaster() -> None:
+    """Stop the process-wide broadcaster, if one was created."""
+    global _verdict_broadcaster
+    if _verdict_broadcaster is not None:
+        await _verdict_broadcaster.aclose()
+        _verdict_broadcaster = None
@@ -0,0 +1,179 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Judge0 status ids 1 (In Queue) and 2 (Processing) are the only non-terminal states
+PENDING_STATUS_IDS = (1, 2)
+
+class VerdictStore:
+    """
+    Token-keyed store of terminal Judge0 verdicts.
+
+    Verdicts live in a bounded in-memory LRU map. When a SQLite path is given,
+    every verdict is also written to disk so it survives restarts and memory
+    evictions; lookups that miss memory fall back to SQLite. put() only
+    queues the write: a background thread commits queued verdicts in
+    batches, so the event loop never waits on the disk.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._verdicts: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        # Verdicts not on disk yet (token -> (verdict, created_at)); _writing is the batch being committed
+        self._pending: "OrderedDict[str, tuple]" = OrderedDict()
+        self._writing: Dict[str, tuple] = {}
+        self._closed = False
+        self._writer: Optional[threading.Thread] = None
+        # Guards the connection, shared by the writer thread and lookups
+        self._db_lock = threading.Lock()
+        self._conn = None
+        if db_path:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts ("
+                "token TEXT PRIMARY KEY, verdict TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+            logger.info(f"Verdict store backed by SQLite at {db_path}")
+
+    @staticmethod
+    def is_terminal(verdict: Optional[dict]) -> bool:
+        """Check whether a verdict is final (no longer queued or processing)."""
+        if not verdict:
+            return False
+        status_id = (verdict.get("status") or {}).get("id")
+        return status_id is not None and status_id not in PENDING_STATUS_IDS
+
+    def put(self, token: str, verdict: dict) -> bool:
+        """
+        Store a verdict for a token. Non-terminal verdicts are ignored.
+        Returns True if the verdict was stored.
+        """
+        if not self.is_terminal(verdict):
+            return False
+        with self._wakeup:
+            self._remember(token, verdict)
+            if self._conn is not None and not self._closed:
+                self._pending[token] = (verdict, time.time())
+                self._pending.move_to_end(token)
+                self._ensure_writer()
+                self._wakeup.notify()
+        return True
+
+    def get(self, token: str) -> Optional[dict]:
+        """Return the stored verdict for a token, or None if it has not reported yet."""
+        return self.get_many([token]).get(token)
+
+    def get_many(self, tokens: List[str]) -> Dict[str, dict]:
+        """Return the stored verdicts for the given tokens, skipping unknown ones."""
+        found = {}
+        missing = []
+        with self._lock:
+            for token in tokens:
+                verdict = self._verdicts.get(token)
+                if verdict is None:
+                    # Evicted from memory before the writer thread got to it
+                    unwritten = self._pending.get(token) or self._writing.get(token)
+                    verdict = unwritten[0] if unwritten else None
+                if verdict is not None:
+                    self._remember(token, verdict)
+                    found[token] = verdict
+                else:
+                    missing.append(token)
+        if not missing:
+            return found
+        with self._db_lock:
+            if self._conn is None:
+                return found
+            placeholders = ",".join("?" for _ in missing)
+            rows = self._conn.execute(
+                f"SELECT token, verdict FROM verdicts WHERE token IN ({placeholders})",
+                missing,
+            ).fetchall()
+        with self._lock:
+            for token, verdict_json in rows:
+                verdict = json.loads(verdict_json)
+                self._remember(token, verdict)
+                found[token] = verdict
+        return found
+
+    def _remember(self, token: str, verdict: dict) -> None:
+        """Insert into the in-memory LRU map, evicting the oldest entries. Caller holds the lock."""
+        self._verdicts[token] = verdict
+        self._verdicts.move_to_end(token)
+        while len(self._verdicts) > self.max_entries:
+            self._verdicts.popitem(last=False)
+
+    def _ensure_writer(self) -> None:
+        """Start the SQLite writer thread if it is not running. Caller holds the lock."""
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._run_writer, name="verdict-store-writer", daemon=True)
+            self._writer.start()
+
+    def _run_writer(self) -> None:
+        while True:
+            with self._wakeup:
+                while not self._pending and not self._closed:
+                    self._wakeup.wait()
+                if not self._pending:
+                    return
+                self._writing, self._pending = self._pending, OrderedDict()
+                batch = list(self._writing.items())
+            self._write(batch)
+            with self._lock:
+                self._writing = {}
+
+    def _write(self, batch: List[tuple]) -> None:
+        try:
+            with self._db_lock:
+                if self._conn is None:
+                    logger.error(f"Verdict store closed before {len(batch)} verdict(s) were written")
+                    return
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO verdicts (token, verdict, created_at) VALUES (?, ?, ?)",
+                    [(token, json.dumps(verdict), created_at) for token, (verdict, created_at) in batch],
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to write {len(batch)} verdict(s) to SQLite: {e}")
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write queued verdicts, stop the writer thread and close the SQLite connection, if any."""
+        with self._wakeup:
+            self._closed = True
+            self._wakeup.notify_all()
+        if self._writer is not None:
+            self._writer.join(timeout)
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+_verdict_store: Optional[VerdictStore] = None
+
+def get_verdict_store() -> VerdictStore:
+    """Return the process-wide verdict store, creating it on first use."""
+    global _verdict_store
+    if _verdict_store is None:
+        _verdict_store = VerdictStore(
+            db_path=os.getenv("VERDICT_STORE_DB") or None,
+            max_entries=int(os.getenv("VERDICT_STORE_MAX_ENTRIES", "10000")),
+        )
+    return _verdict_store
+
+def close_verdict_store() -> None:
+    """Close the process-wide verdict store, if one was created."""
+    global _verdict_store
+    if _verdict_store is not None:
+        _verdict_store.close()
+        _verdict_store = None
@@ -0,0 +1,75 @@
+import time
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Absolute time.monotonic() by which the current request must be answered (None = unbounded)
+request_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+DEADLINE_HEADER = b"x-request-timeout"
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current request's deadline, or None when there is none."""
+    deadline = request_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+def bounded_timeout(timeout: float) -> float:
+    """Shrink a per-call timeout so it does not outlive the current request's deadline."""
+    remaining = remaining_time()
+    return timeout if remaining is None else min(timeout, max(remaining, 0.0))
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]):
+    """Run the block under a deadline `seconds` from now (None lifts any deadline)."""
+    token = request_deadline.set(None if seconds is None else time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        request_deadline.reset(token)
+
+class DeadlineMiddleware:
+    """
+    ASGI middleware that gives every HTTP request a deadline.
+
+    The budget is the client's X-Request-Timeout header (in seconds) when it
+    sends one, capped at max_seconds, otherwise default_seconds. Outbound
+    calls made while handling the request (e.g. to Judge0) shrink their
+    timeouts to what is left, so a hung dependency cannot hold a handler
+    past its budget. Long-lived endpoints such as SSE streams are listed in
+    exempt_paths and keep their own timeouts.
+    """
+
+    def __init__(
+        self,
+        app,
+        default_seconds: float = 60.0,
+        max_seconds: float = 120.0,
+        exempt_paths: Iterable[str] = (),
+    ):
+        self.app = app
+        self.default_seconds = default_seconds
+        self.max_seconds = max_seconds
+        self.exempt_paths = tuple(exempt_paths)
+
+    def _budget(self, scope) -> Optional[float]:
+        if self.exempt_paths and scope["path"].endswith(self.exempt_paths):
+            return None
+        for name, value in scope.get("headers", ()):
+            if name == DEADLINE_HEADER:
+                try:
+                    return max(0.0, min(float(value), self.max_seconds))
+                except ValueError:
+                    logger.warning(f"Ignoring invalid {DEADLINE_HEADER.decode()} header: {value!r}")
+        return self.default_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with deadline_scope(self._budget(scope)):
+            await self.app(scope, receive, send)
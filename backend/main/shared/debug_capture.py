@@ -0,0 +1,134 @@
+import os
+import random
+import hashlib
+import logging
+import threading
+from collections import deque
+from typing import Callable, Deque, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CAPTURE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'debug', 'captures')
+
+class DebugCapture:
+    """
+    Sampled capture of generated sources and Judge0 payloads for debugging.
+
+    Callers ask should_sample() once per submission and then capture() each
+    artifact. Captures go into a bounded in-memory ring buffer (recent()) and
+    a background thread writes them to `directory`, named by kind and content
+    hash (e.g. `java-3f2a9c01b4d5e6f7.java`), so identical artifacts are
+    written once and concurrent submissions never overwrite each other. The
+    directory is pruned to the newest max_files captures. Nothing is written
+    on the request path.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_CAPTURE_DIR,
+        sample_rate: float = 0.0,
+        buffer_size: int = 100,
+        max_files: int = 500,
+        rng: Callable[[], float] = random.random,
+    ):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.max_files = max_files
+        self._rng = rng
+        self._recent: Deque[dict] = deque(maxlen=buffer_size)
+        self._pending: Deque[dict] = deque(maxlen=buffer_size)
+        self._wakeup = threading.Condition()
+        self._closed = False
+        self._writer: Optional[threading.Thread] = None
+
+    def should_sample(self) -> bool:
+        """Decide whether the current submission's artifacts are captured."""
+        return self.sample_rate > 0 and self._rng() < self.sample_rate
+
+    def capture(self, kind: str, content: str, extension: str) -> str:
+        """
+        Queue one artifact for writing and return its file name.
+        When the writer falls behind, the oldest unwritten captures are dropped.
+        """
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+        entry = {"name": f"{kind}-{digest}.{extension}", "content": content}
+        with self._wakeup:
+            self._recent.append(entry)
+            if not self._closed:
+                self._pending.append(entry)
+                self._ensure_writer()
+                self._wakeup.notify()
+        return entry["name"]
+
+    def recent(self) -> List[dict]:
+        """The most recent captures, oldest first, as {"name", "content"} dicts."""
+        with self._wakeup:
+            return list(self._recent)
+
+    def _ensure_writer(self) -> None:
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._run_writer, name="debug-capture-writer", daemon=True)
+            self._writer.start()
+
+    def _run_writer(self) -> None:
+        while True:
+            with self._wakeup:
+                while not self._pending and not self._closed:
+                    self._wakeup.wait()
+                if not self._pending and self._closed:
+                    return
+                batch = list(self._pending)
+                self._pending.clear()
+            self._write(batch)
+
+    def _write(self, batch: List[dict]) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            for entry in batch:
+                path = os.path.join(self.directory, entry["name"])
+                if os.path.exists(path):
+                    # Same content already captured; refresh it so pruning keeps it
+                    os.utime(path)
+                    continue
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(entry["content"])
+            self._prune()
+        except OSError as e:
+            logger.error(f"Failed to write {len(batch)} debug capture(s) to {self.directory}: {e}")
+
+    def _prune(self) -> None:
+        paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory)]
+        if len(paths) <= self.max_files:
+            return
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:len(paths) - self.max_files]:
+            os.remove(path)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush pending captures and stop the writer thread."""
+        with self._wakeup:
+            self._closed = True
+            self._wakeup.notify()
+        if self._writer is not None:
+            self._writer.join(timeout)
+
+_debug_capture: Optional[DebugCapture] = None
+
+def get_debug_capture() -> DebugCapture:
+    """Return the process-wide debug capture, creating it on first use."""
+    global _debug_capture
+    if _debug_capture is None:
+        _debug_capture = DebugCapture(
+            directory=os.getenv("DEBUG_CAPTURE_DIR", DEFAULT_CAPTURE_DIR),
+            sample_rate=float(os.getenv("DEBUG_CAPTURE_SAMPLE_RATE", "0")),
+            buffer_size=int(os.getenv("DEBUG_CAPTURE_BUFFER_SIZE", "100")),
+            max_files=int(os.getenv("DEBUG_CAPTURE_MAX_FILES", "500")),
+        )
+    return _debug_capture
+
+def close_debug_capture() -> None:
+    """Flush and stop the process-wide debug capture, if one was created."""
+    global _debug_capture
+    if _debug_capture is not None:
+        _debug_capture.close()
+        _debug_capture = None
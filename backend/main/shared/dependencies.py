@@ -0,0 +1,17 @@
+from fastapi import Request
+
+from main.problem_submission.problem_submission_service import ProblemSubmissionService
+from main.problem_generator.problem_generator_service import ProblemGeneratorService
+from main.codeassist_chat.codeassist_chat_service import CodeAssistChatService
+
+# Services are created once in the app lifespan (app.py) and stored on app.state;
+# routers receive them through these FastAPI dependencies.
+
+def get_problem_submission_service(request: Request) -> ProblemSubmissionService:
+    return request.app.state.problem_submission_service
+
+def get_problem_generator_service(request: Request) -> ProblemGeneratorService:
+    return request.app.state.problem_generator_service
+
+def get_codeassist_chat_service(request: Request) -> CodeAssistChatService:
+    return request.app.state.codeassist_chat_service
@@ -0,0 +1,188 @@
+import re
+import json
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+# Location of a value in the document: object keys and array indexes from the root
+JSONPath = Tuple[Union[str, int], ...]
+
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+# A number or true/false/null is only known to be complete once a delimiter follows it
+_SCALAR_END = re.compile(r"[ \t\r\n,\]}]")
+
+_VALUE, _VALUE_OR_END, _KEY, _KEY_OR_END, _COLON, _COMMA_OR_END, _DONE = range(7)
+
+class _Frame:
+    __slots__ = ("value", "path", "key")
+
+    def __init__(self, value, path: JSONPath):
+        self.value = value
+        self.path = path
+        self.key = None
+
+class IncrementalJSONParser:
+    """
+    JSON parser fed one chunk at a time, e.g. as a streamed LLM function call
+    arrives.
+
+    Every value is reported through on_value(path, value) as soon as its last
+    character has been read, innermost first: the elements of an array are
+    reported one by one before the array itself. A callback that raises stops
+    the parse, which is how callers abandon a stream early. Malformed input
+    raises json.JSONDecodeError as soon as it is seen.
+    """
+
+    def __init__(self, on_value: Optional[Callable[[JSONPath, Any], None]] = None):
+        self._on_value = on_value
+        self._text = ""
+        self._pos = 0
+        self._string_scan = 0
+        self._stack: List[_Frame] = []
+        self._expect = _VALUE
+        self.value = None
+
+    @property
+    def done(self) -> bool:
+        return self._expect == _DONE
+
+    def feed(self, chunk: str) -> None:
+        # Everything before _pos is consumed; a pending token always starts at _pos
+        if self._pos:
+            self._text = self._text[self._pos:]
+            self._string_scan = max(0, self._string_scan - self._pos)
+            self._pos = 0
+        self._text += chunk
+        self._parse()
+
+    def close(self) -> Any:
+        """Return the parsed document, or raise if the input ended early."""
+        if not self.done:
+            raise json.JSONDecodeError("Unexpected end of JSON input", self._text, len(self._text))
+        return self.value
+
+    def _error(self, message: str, pos: int) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._text, pos)
+
+    def _parse(self) -> None:
+        text = self._text
+        while True:
+            pos = _WHITESPACE.match(text, self._pos).end()
+            self._pos = pos
+            if pos >= len(text):
+                return
+            char = text[pos]
+            expect = self._expect
+
+            if expect == _DONE:
+                raise self._error("Extra data", pos)
+
+            if expect in (_VALUE, _VALUE_OR_END):
+                if char == "]" and expect == _VALUE_OR_END:
+                    self._pos = pos + 1
+                    self._close()
+                elif char == "{":
+                    self._pos = pos + 1
+                    self._push({})
+                    self._expect = _KEY_OR_END
+                elif char == "[":
+                    self._pos = pos + 1
+                    self._push([])
+                    self._expect = _VALUE_OR_END
+                elif char == '"':
+                    value = self._read_string(pos)
+                    if value is None:
+                        return
+                    self._complete(value)
+                else:
+                    end = _SCALAR_END.search(text, pos)
+                    if end is None:
+                        return
+                    try:
+                        value = json.loads(text[pos:end.start()])
+                    except ValueError:
+                        raise self._error(f"Invalid value {text[pos:end.start()]!r}", pos)
+                    self._pos = end.start()
+                    self._complete(value)
+
+            elif expect in (_KEY, _KEY_OR_END):
+                if char == "}" and expect == _KEY_OR_END:
+                    self._pos = pos + 1
+                    self._close()
+                elif char == '"':
+                    key = self._read_string(pos)
+                    if key is None:
+                        return
+                    self._stack[-1].key = key
+                    self._expect = _COLON
+                else:
+                    raise self._error("Expecting property name enclosed in double quotes", pos)
+
+            elif expect == _COLON:
+                if char != ":":
+                    raise self._error("Expecting ':' delimiter", pos)
+                self._pos = pos + 1
+                self._expect = _VALUE
+
+            else:
+                frame = self._stack[-1]
+                is_object = isinstance(frame.value, dict)
+                if char == ",":
+                    self._pos = pos + 1
+                    self._expect = _KEY if is_object else _VALUE
+                elif char == ("}" if is_object else "]"):
+                    self._pos = pos + 1
+                    self._close()
+                else:
+                    raise self._error("Expecting ',' delimiter", pos)
+
+    def _read_string(self, start: int) -> Optional[str]:
+        """Decode the string literal opening at start, or return None if it hasn't ended yet."""
+        text = self._text
+        index = max(start + 1, self._string_scan)
+        while True:
+            index = text.find('"', index)
+            if index < 0:
+                # Resume the search here on the next chunk (a trailing backslash may escape its quote)
+                self._string_scan = max(start + 1, len(text) - 1)
+                return None
+            backslashes = 0
+            while text[index - 1 - backslashes] == "\\":
+                backslashes += 1
+            if backslashes % 2 == 0:
+                break
+            index += 1
+        self._string_scan = 0
+        try:
+            value = json.loads(text[start:index + 1])
+        except ValueError:
+            raise self._error("Invalid string", start)
+        self._pos = index + 1
+        return value
+
+    def _child_path(self) -> JSONPath:
+        if not self._stack:
+            return ()
+        frame = self._stack[-1]
+        if isinstance(frame.value, dict):
+            return frame.path + (frame.key,)
+        return frame.path + (len(frame.value),)
+
+    def _push(self, container) -> None:
+        self._stack.append(_Frame(container, self._child_path()))
+
+    def _close(self) -> None:
+        self._complete(self._stack.pop().value)
+
+    def _complete(self, value: Any) -> None:
+        path = self._child_path()
+        if self._stack:
+            frame = self._stack[-1]
+            if isinstance(frame.value, dict):
+                frame.value[frame.key] = value
+            else:
+                frame.value.append(value)
+            self._expect = _COMMA_OR_END
+        else:
+            self.value = value
+            self._expect = _DONE
+        if self._on_value is not None:
+            self._on_value(path, value)
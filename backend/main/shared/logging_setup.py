@@ -0,0 +1,100 @@
+import os
+import json
+import queue
+import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Optional
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Longest rendering of a logged payload before it is cut off
+PAYLOAD_MAX_CHARS = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "2000"))
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+def truncate(text: str, limit: int = None) -> str:
+    """Cut text to `limit` characters, noting how much was dropped."""
+    limit = PAYLOAD_MAX_CHARS if limit is None else limit
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}... [{len(text) - limit} more chars]"
+
+class LazyPayload:
+    """
+    Log argument that renders a large value only when the record is emitted.
+
+    Pass it as a %-style argument (logger.debug("Payload: %s", log_json(x))),
+    never inside an f-string: a record below the logger's level is then
+    dropped without serializing anything, and an emitted one is capped at
+    LOG_PAYLOAD_MAX_CHARS.
+    """
+
+    __slots__ = ("value", "as_json", "limit")
+
+    def __init__(self, value: Any, as_json: bool = False, limit: int = None):
+        self.value = value
+        self.as_json = as_json
+        self.limit = limit
+
+    def __str__(self) -> str:
+        if self.as_json:
+            text = json.dumps(self.value, indent=2, default=str)
+        else:
+            text = str(self.value)
+        return truncate(text, self.limit)
+
+def log_text(value: Any, limit: int = None) -> LazyPayload:
+    """Lazily str() and truncate value for logging."""
+    return LazyPayload(value, limit=limit)
+
+def log_json(value: Any, limit: int = None) -> LazyPayload:
+    """Lazily pretty-print value as JSON and truncate it for logging."""
+    return LazyPayload(value, as_json=True, limit=limit)
+
+def configure_logging(log_file: str = "app.log") -> None:
+    """
+    Route all logging through a queue so request handlers never block on I/O.
+
+    The root logger only gets a QueueHandler; a QueueListener thread owns the
+    rotating file and stream handlers. The level comes from LOG_LEVEL
+    (default INFO). Call stop_logging() on shutdown to flush the queue; it
+    detaches the QueueHandler, so logging can be configured again afterwards.
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [
+        RotatingFileHandler(log_file, maxBytes=10000000, backupCount=5),
+        logging.StreamHandler(),
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    _queue_handler = QueueHandler(log_queue)
+    root.addHandler(_queue_handler)
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+def stop_logging() -> None:
+    """
+    Detach the QueueHandler, then flush queued records and stop the listener
+    thread, if logging was configured. Records logged afterwards go to
+    logging's last-resort handler instead of a queue nobody drains.
+    """
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
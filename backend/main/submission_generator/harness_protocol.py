@@ -0,0 +1,79 @@
+"""
+Framing protocol shared by the multi-test harness generators and the code that
+reads harness output back.
+
+A harness run reads every test case from one stdin stream, each case's input
+lines followed by CASE_DELIMITER. For every case it prints a CASE_START line,
+whatever the solution printed, an optional CASE_ERROR line and a CASE_END line.
+The CASE_ERROR line carries the error message with backslashes, newlines and
+carriage returns escaped as \\\\, \\n and \\r, so a multi-line message stays on it.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+CASE_DELIMITER = "@@END_CASE@@"
+CASE_START_PREFIX = "@@CASE_START "
+CASE_END_PREFIX = "@@CASE_END "
+CASE_ERROR_PREFIX = "@@CASE_ERROR "
+MARKER_SUFFIX = "@@"
+
+_CASE_START_RE = re.compile(r"^@@CASE_START (\d+)@@$")
+_CASE_END_RE = re.compile(r"^@@CASE_END (\d+)@@$")
+_CASE_ERROR_RE = re.compile(r"^@@CASE_ERROR (\d+)@@ ?(.*)$")
+_ERROR_ESCAPE_RE = re.compile(r"\\[\\nr]")
+_ERROR_ESCAPES = {"\\\\": "\\", "\\n": "\n", "\\r": "\r"}
+
+def encode_cases(case_inputs: List[str]) -> str:
+    """Join per-case stdin strings into a single harness stdin stream."""
+    return "".join(f"{case_input}\n{CASE_DELIMITER}\n" for case_input in case_inputs)
+
+def frame_outputs(case_outputs: List[str]) -> str:
+    """Frame per-case outputs exactly as a passing harness run would print them."""
+    framed = []
+    for index, output in enumerate(case_outputs):
+        framed.append(f"{CASE_START_PREFIX}{index}{MARKER_SUFFIX}")
+        framed.append(output)
+        framed.append(f"{CASE_END_PREFIX}{index}{MARKER_SUFFIX}")
+    return "\n".join(framed) + "\n"
+
+def split_output(stdout: Optional[str]) -> Dict[int, Dict[str, Optional[str]]]:
+    """
+    Split framed harness output into per-case results.
+
+    Returns:
+        Dict[int, Dict]: case index -> {"stdout": str, "error": str or None}.
+        Cases whose CASE_END marker never appeared (e.g. the run was killed)
+        are left out.
+    """
+    cases = {}
+    current_index = None
+    lines: List[str] = []
+    error = None
+    for line in (stdout or "").splitlines():
+        start = _CASE_START_RE.match(line)
+        if start:
+            current_index, lines, error = int(start.group(1)), [], None
+            continue
+        if current_index is None:
+            continue
+        end = _CASE_END_RE.match(line)
+        if end and int(end.group(1)) == current_index:
+            cases[current_index] = {
+                "stdout": "\n".join(lines) + "\n" if lines else "",
+                "error": error,
+            }
+            current_index = None
+            continue
+        case_error = _CASE_ERROR_RE.match(line)
+        if case_error and int(case_error.group(1)) == current_index:
+            error = _ERROR_ESCAPE_RE.sub(lambda m: _ERROR_ESCAPES[m.group(0)], case_error.group(2)) or "Unknown error"
+            continue
+        lines.append(line)
+    return cases
+
+def outputs_match(actual: Optional[str], expected: Optional[str]) -> bool:
+    """Compare outputs ignoring trailing whitespace on each line and surrounding blank lines."""
+    def normalize(text: Optional[str]) -> str:
+        return "\n".join(line.rstrip() for line in (text or "").strip().splitlines())
+    return normalize(actual) == normalize(expected)
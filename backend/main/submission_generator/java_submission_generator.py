@@ -1,10 +1,15 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
+from functools import lru_cache
 import json
-import os
 import re
 import logging
 from main.type_mapping_system.java.java_type_mapper import JavaTypeMapper
 from main.type_mapping_system.java.java_name_converter import to_java_name
+from main.type_mapping_system.problem_plan import ProblemPlan, get_problem_plan
+from main.shared.logging_setup import log_text
+from main.submission_generator.harness_protocol import (
+    CASE_DELIMITER, CASE_START_PREFIX, CASE_END_PREFIX, CASE_ERROR_PREFIX, MARKER_SUFFIX
+)
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -13,16 +18,93 @@ class JavaSubmissionGeneratorException(Exception):
     """Custom exception for errors during Java submission generation."""
     pass
 
+# Marks where the student's code goes in a rendered scaffold
+SOURCE_PLACEHOLDER = "@@SOURCE_CODE@@"
+
+SUBMISSION_TEMPLATE = """import java.util.*;
+            import java.io.*;
+            import java.text.*;
+            import java.time.*;
+            import java.math.*;
+            import java.util.regex.*;
+            
+public class {class_name} {{
+
+{source_code}
+
+
+    public static void main(String[] args) {{
+        Scanner scanner = new Scanner(System.in);
+        Main solution = new Main();
+        
+        // Parse input
+        {input_parsing_code}
+        
+        // Call the solution function
+        {return_type} result = solution.{function_name}({function_call_args});
+        
+        // Print the result
+        {output_printing}
+        scanner.close();
+    }}
+}}"""
+
+# Runs every test case from stdin in one JVM and frames each case's output
+HARNESS_SUBMISSION_TEMPLATE = """import java.util.*;
+            import java.io.*;
+            import java.text.*;
+            import java.time.*;
+            import java.math.*;
+            import java.util.regex.*;
+            
+public class {class_name} {{
+
+{source_code}
+
+
+    public static void main(String[] args) {{
+        Scanner scanner = new Scanner(System.in);
+        int harnessCaseIndex = 0;
+        
+        while (scanner.hasNextLine()) {{
+            System.out.println("{case_start}" + harnessCaseIndex + "{marker_suffix}");
+            try {{
+                Main solution = new Main();
+                
+                // Parse input
+                {input_parsing_code}
+                
+                // Call the solution function
+                {return_type} result = solution.{function_name}({function_call_args});
+                
+                // Print the result
+                {output_printing}
+            }} catch (Throwable harnessError) {{
+                // One line per error: escape backslashes and line breaks (see harness_protocol)
+                String harnessMessage = String.valueOf(harnessError)
+                    .replace("\\\\", "\\\\\\\\").replace("\\n", "\\\\n").replace("\\r", "\\\\r");
+                System.out.println("{case_error}" + harnessCaseIndex + "{marker_suffix} " + harnessMessage);
+            }}
+            System.out.println("{case_end}" + harnessCaseIndex + "{marker_suffix}");
+            
+            // Skip whatever is left of this case's input
+            while (scanner.hasNextLine() && !scanner.nextLine().equals("{case_delimiter}")) {{
+            }}
+            harnessCaseIndex++;
+        }}
+        scanner.close();
+    }}
+}}"""
+
 class JavaSubmissionGenerator:
     """Generator for Java submission code."""
 
     def __init__(self):
-        # Add a debug directory for saving generated files
-        self.debug_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'debug')
-        os.makedirs(self.debug_dir, exist_ok=True)
         self.type_mapper = JavaTypeMapper()
+        # Everything but the student's code depends only on the plan, so render it once
+        self._scaffold = lru_cache(maxsize=256)(self._render_scaffold)
 
-    def generate_submission(self, source_code: str, problem_structure: Dict[str, Any]) -> str:
+    def generate_submission(self, source_code: str, problem_structure: Dict[str, Any], harness: bool = False) -> str:
         """
         Generates a complete Java submission by combining the user's source code
         with the problem structure details (function name, input/output details).
@@ -30,6 +112,9 @@ class JavaSubmissionGenerator:
         Args:
             source_code (str): The user's source code implementation.
             problem_structure (Dict[str, Any]): Contains function and input/output details.
+            harness (bool): If True, generate a multi-test harness that reads every
+                test case from stdin (see harness_protocol) and prints framed
+                per-case results, so all cases run in a single JVM.
 
         Returns:
             str: Complete Java code ready for compilation and execution.
@@ -40,8 +125,8 @@ class JavaSubmissionGenerator:
         try:
             # Log incoming data for debugging.
             logger.info("Generating Java submission:")
-            logger.info(f"Source code: {source_code}")
-            logger.info(f"Problem structure: {problem_structure}")
+            logger.debug("Source code: %s", log_text(source_code))
+            logger.debug("Problem structure: %s", log_text(problem_structure))
             
             # Validate the structure of the problem JSON.
             self._validate_problem_structure(problem_structure)
@@ -49,110 +134,12 @@ class JavaSubmissionGenerator:
             # Validate that the source code contains the expected function.
             self._validate_source_code(source_code, problem_structure)
             
-            # Convert the Python function name to Java's naming convention.
-            python_function_name = problem_structure.get("function_name")
-            java_function_name = to_java_name(python_function_name)
-            
-            # Log the function name conversion
-            logger.info(f"Checking for function name: {java_function_name} (original: {python_function_name})")
-            logger.info(f"Function name: {java_function_name}")
-
-            # Extract input and output structure
-            input_structure = problem_structure.get("input_structure", [])
-            output_structure = problem_structure.get("output_structure", {})
-            
-            logger.info(f"Input structure: {input_structure}")
-            logger.info(f"Output structure: {output_structure}")
-
-            # Generate parameter list for function signature
-            param_list = []
-            for param in input_structure:
-                param_type = param["Input_Field"].split()[0]
-                param_name = param["Input_Field"].split()[1]
-                java_type = self._convert_type_to_java(param_type)
-                java_param_name = to_java_name(param_name)
-                param_list.append(f"{java_type} {java_param_name}")
-
-            logger.info(f"Parameter list: {param_list}")
-
-            # Get return type
-            return_type = output_structure["Output_Field"].split()[0]
-            return_type = self._convert_type_to_java(return_type)
-            logger.info(f"Return type: {return_type}")
-
-            # Extract the function body from the source code
-            code_body = source_code
-
-            # Generate input parsing code
-            input_parsing_code = []
-            total_inputs = len(input_structure)
-            for i, param in enumerate(input_structure):
-                param_type = param["Input_Field"].split()[0]
-                param_name = param["Input_Field"].split()[1]
-                java_type = self._convert_type_to_java(param_type)
-                java_param_name = to_java_name(param_name)
-                input_parsing_code.append(
-                    self._generate_input_parsing(java_type, java_param_name, i, total_inputs)
-                )
-
-            # Join all the parts together
-            function_params = ", ".join(param_list)
-            function_call_args = ", ".join(to_java_name(p["Input_Field"].split()[1]) for p in input_structure)
-            class_name = "Main"
-
-            submission_template = """import java.util.*;
-            import java.io.*;
-            import java.text.*;
-            import java.time.*;
-            import java.math.*;
-            import java.util.regex.*;
-            
-public class {class_name} {{
-
-{source_code}
-
-
-    public static void main(String[] args) {{
-        Scanner scanner = new Scanner(System.in);
-        Main solution = new Main();
-        
-        // Parse input
-        {input_parsing_code}
-        
-        // Call the solution function
-        {return_type} result = solution.{function_name}({function_call_args});
-        
-        // Print the result
-        {output_printing}
-        scanner.close();
-    }}
-}}"""
-
-            submission = submission_template.format(
-                class_name=class_name,
-                return_type=return_type,
-                function_name=java_function_name,
-                function_params=function_params,
-                source_code=code_body.strip(),
-                input_parsing_code="\n        ".join(input_parsing_code),
-                function_call_args=function_call_args,
-                output_printing=self._generate_output_printing(return_type, 'result')
-            )
-            
-            # Save the generated code to a file for debugging with full path
-            debug_file_path = os.path.join(self.debug_dir, 'Main.java')
-            try:
-                with open(debug_file_path, 'w', encoding='utf-8') as f:
-                    f.write(submission.strip())
-                logger.info(f"Successfully saved generated Java code to {debug_file_path}")
-                # Also log the content being written
-                logger.info("Content being written to file:")
-                logger.info(submission.strip())
-            except Exception as e:
-                logger.error(f"Failed to save {debug_file_path}: {str(e)}")
+            plan = get_problem_plan(problem_structure)
+            prefix, suffix = self._scaffold(plan, harness)
+            submission = prefix + source_code.strip() + suffix
             
             logger.info("=== Generated Java Submission ===")
-            logger.info(f"Generated submission:\n{submission}")
+            logger.debug("Generated submission:\n%s", log_text(submission))
             
             return submission.strip()
 
@@ -160,6 +147,34 @@ public class {class_name} {{
             logger.error(f"Error generating Java submission: {str(e)}")
             raise JavaSubmissionGeneratorException(f"Failed to generate Java submission: {str(e)}")
 
+    def _render_scaffold(self, plan: ProblemPlan, harness: bool) -> Tuple[str, str]:
+        """
+        Render the submission around the student's code for one plan: the
+        text before and after it. Cached per (plan, harness) in __init__.
+        """
+        input_parsing_code = [
+            self._generate_input_parsing(param.java_type, param.java_name, i, len(plan.params))
+            for i, param in enumerate(plan.params)
+        ]
+        logger.info(f"Rendering Java scaffold for plan {plan.key} (harness={harness})")
+        template = HARNESS_SUBMISSION_TEMPLATE if harness else SUBMISSION_TEMPLATE
+        rendered = template.format(
+            class_name="Main",
+            return_type=plan.output.java_type,
+            function_name=plan.java_function_name,
+            source_code=SOURCE_PLACEHOLDER,
+            input_parsing_code=("\n                " if harness else "\n        ").join(input_parsing_code),
+            function_call_args=", ".join(param.java_name for param in plan.params),
+            output_printing=self._generate_output_printing(plan.output.java_type, 'result'),
+            case_delimiter=CASE_DELIMITER,
+            case_start=CASE_START_PREFIX,
+            case_end=CASE_END_PREFIX,
+            case_error=CASE_ERROR_PREFIX,
+            marker_suffix=MARKER_SUFFIX
+        ).strip()
+        prefix, suffix = rendered.split(SOURCE_PLACEHOLDER)
+        return prefix, suffix
+
     def _validate_problem_structure(self, problem_structure: Dict[str, Any]):
         """
         Validates that the problem structure contains all required fields.
@@ -1,5 +1,10 @@
 import logging
 from typing import Dict, Any, List, Union
+from main.submission_generator.harness_protocol import encode_cases, frame_outputs
+from main.shared.logging_setup import log_text
+from main.type_mapping_system.problem_plan import (
+    encode_input, field_of, get_problem_plan, is_array_type, param_plan
+)
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -22,8 +27,7 @@ class Judge0TestCaseGenerator:
         Check if a type string represents an array/list type.
         This now includes Java native arrays (e.g., 'int[]').
         """
-        logger.debug(f"Checking if type is array: {type_str}")
-        return type_str.startswith(("List[", "list[", "Array[", "array[")) or type_str.endswith("[]")
+        return is_array_type(type_str)
 
     def _get_base_type(self, type_str: str) -> str:
         """Extract base type from an array/list type."""
@@ -43,105 +47,12 @@ class Judge0TestCaseGenerator:
             "[85, 90, 78, 85, 92, 88]\n85"
         then the first line is converted to:
             "85|90|78|85|92|88"
-        so that it can be split in the Java code.
+        so that it can be split in the Java code. The parsing and encoding
+        rules live in the problem's ProblemPlan (see problem_plan).
         """
-        logger.debug(f"Raw input_data received in format_test_case_input: {input_data}")
         try:
-            # Handle empty input
-            if not input_data:
-                return ""
-            
-            # --- Case 1: Input provided as a multi-line string ---
-            if isinstance(input_data, str) and "\n" in input_data:
-                parts = input_data.strip().split("\n")
-                logger.debug(f"Split input into parts: {parts}")
-                if len(parts) != len(input_structure):
-                    raise Judge0TestCaseGeneratorException(
-                        f"Expected {len(input_structure)} lines but got {len(parts)}"
-                    )
-                processed_parts = []
-                for i, part in enumerate(parts):
-                    field_type = input_structure[i]["Input_Field"].split()[0]
-                    logger.debug(f"Processing part: '{part}' with field type: {field_type}")
-                    if self._is_array_type(field_type):
-                        part = part.strip()
-                        if part.startswith("[") and part.endswith("]"):
-                            part = part[1:-1]  # Remove '[' and ']'
-                        tokens = [t.strip() for t in part.split(",") if t.strip()]
-                        part = "|".join(tokens)
-                        logger.debug(f"Transformed array input (string branch): {part}")
-                    processed_parts.append(part)
-                formatted = "\n".join(processed_parts)
-                logger.debug(f"Formatted input_data (string branch): {formatted}")
-                return formatted
-
-            # --- Case 2: Single parameter that is an array ---
-            if len(input_structure) == 1 and self._is_array_type(input_structure[0]["Input_Field"].split()[0]):
-                if isinstance(input_data, (list, tuple)):
-                    formatted = "|".join(str(x) for x in input_data)
-                    logger.debug(f"Formatted single array input from list: {formatted}")
-                    return formatted
-                elif isinstance(input_data, str):
-                    s = input_data.strip()
-                    if s.startswith("[") and s.endswith("]"):
-                        s = s[1:-1]
-                        tokens = [t.strip() for t in s.split(",") if t.strip()]
-                        formatted = "|".join(tokens)
-                        logger.debug(f"Formatted single array input from string: {formatted}")
-                        return formatted
-                    else:
-                        return s
-                else:
-                    return str(input_data)
-            
-            # --- Case 3: Multiple parameters provided as a list/tuple ---
-            if isinstance(input_data, (list, tuple)):
-                if len(input_data) != len(input_structure):
-                    raise Judge0TestCaseGeneratorException(
-                        f"Expected {len(input_structure)} parameters but got {len(input_data)}"
-                    )
-                processed_parts = []
-                for i, value in enumerate(input_data):
-                    field_type = input_structure[i]["Input_Field"].split()[0]
-                    logger.debug(f"Processing parameter {i}: {value} with field type: {field_type}")
-                    if self._is_array_type(field_type):
-                        # If the value is already a list/tuple, join its elements with '|'
-                        if isinstance(value, (list, tuple)):
-                            part = "|".join(str(x) for x in value)
-                        elif isinstance(value, str):
-                            s = value.strip()
-                            if s.startswith("[") and s.endswith("]"):
-                                s = s[1:-1]
-                                tokens = [t.strip() for t in s.split(",") if t.strip()]
-                                part = "|".join(tokens)
-                            else:
-                                part = s
-                        else:
-                            part = str(value)
-                        logger.debug(f"Transformed array input (list branch): {part}")
-                    else:
-                        part = str(value)
-                    processed_parts.append(part)
-                formatted = "\n".join(processed_parts)
-                logger.debug(f"Formatted input_data (list branch): {formatted}")
-                return formatted
-            
-            # --- Case 4: Single parameter provided as a string without newlines ---
-            if isinstance(input_data, str):
-                values = input_data.strip().split()
-                if len(values) != len(input_structure):
-                    raise Judge0TestCaseGeneratorException(
-                        f"Expected {len(input_structure)} values but got {len(values)}"
-                    )
-                formatted = "\n".join(values)
-                logger.debug(f"Formatted single line string input: {formatted}")
-                return formatted
-            
-            # Fallback: Convert to string directly
-            formatted = str(input_data)
-            logger.debug(f"Fallback formatted input: {formatted}")
-            return formatted
-        
+            params = tuple(param_plan(field_of(entry, "Input")) for entry in input_structure)
+            return encode_input(params, input_data)
         except Exception as e:
             logger.error(f"Error formatting test case input: {str(e)}")
             raise Judge0TestCaseGeneratorException(f"Error formatting test case input: {str(e)}")
@@ -165,23 +76,16 @@ class Judge0TestCaseGenerator:
         This function applies the formatting defined in format_test_case_input and
         ensures the expected output is a string.
         """
-        logger.debug(f"Raw test_cases received in generate_test_cases: {test_cases}")
+        logger.debug("Raw test_cases received in generate_test_cases: %s", log_text(test_cases))
         try:
+            plan = get_problem_plan(problem_structure)
             formatted_cases = []
             for i, test_case in enumerate(test_cases, 1):
                 try:
-                    formatted_input = self.format_test_case_input(
-                        test_case["input"],
-                        problem_structure["input_structure"]
-                    )
+                    formatted_input = plan.encode_input(test_case["input"])
                     # Use "output" if available, otherwise fallback to "expected_output"
                     output_value = test_case.get("output", test_case.get("expected_output"))
-                    formatted_output = self.format_test_case_output(
-                        output_value,
-                        problem_structure["output_structure"]
-                    )
-                    logger.debug(f"Test case {i} - Formatted input: {formatted_input}")
-                    logger.debug(f"Test case {i} - Formatted expected output: {formatted_output}")
+                    formatted_output = plan.encode_output(output_value)
                     formatted_cases.append({
                         "input": formatted_input,
                         "expected_output": formatted_output
@@ -190,9 +94,24 @@ class Judge0TestCaseGenerator:
                     logger.error(f"Error formatting test case {i}: {str(e)}")
                     raise Judge0TestCaseGeneratorException(f"Test case {i} has invalid format: {str(e)}")
                     
-            logger.debug(f"Final formatted test cases: {formatted_cases}")
+            logger.debug("Final formatted test cases: %s", log_text(formatted_cases))
             return formatted_cases
 
         except Exception as e:
             logger.error(f"Error generating test cases: {str(e)}")
             raise Judge0TestCaseGeneratorException(f"Failed to generate test cases: {str(e)}")
+
+    def generate_harness_input(self, formatted_cases: List[Dict[str, str]]) -> str:
+        """
+        Encode already formatted test cases (see generate_test_cases) into one
+        stdin stream for a multi-test harness run, delimited per case.
+        """
+        return encode_cases([case["input"] for case in formatted_cases])
+
+    def generate_harness_expected_output(self, formatted_cases: List[Dict[str, str]]) -> str:
+        """
+        Build the framed stdout a harness run prints when every case passes.
+        Splitting it with harness_protocol.split_output gives back each
+        case's expected output.
+        """
+        return frame_outputs([case["expected_output"] for case in formatted_cases])
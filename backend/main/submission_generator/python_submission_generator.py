@@ -0,0 +1,189 @@
+from typing import Dict, Any
+import re
+import logging
+from main.shared.logging_setup import log_text
+from main.type_mapping_system.problem_plan import get_problem_plan
+from main.submission_generator.harness_protocol import (
+    CASE_DELIMITER, CASE_START_PREFIX, CASE_END_PREFIX, CASE_ERROR_PREFIX, MARKER_SUFFIX
+)
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+class PythonSubmissionGeneratorException(Exception):
+    """Custom exception for errors during Python submission generation."""
+    pass
+
+# Parses one line of input into a scalar value
+SCALAR_PARSERS = {
+    "int": "int({value})",
+    "float": "float({value})",
+    "double": "float({value})",
+    "long": "int({value})",
+    "bool": "({value}).strip().lower() == 'true'",
+    "boolean": "({value}).strip().lower() == 'true'",
+    "str": "{value}",
+    "string": "{value}",
+    "String": "{value}",
+}
+
+LIST_TYPE_PATTERN = re.compile(r"^(?:List|list|Array|array)\[(.+)\]$")
+
+SUBMISSION_TEMPLATE = """import sys
+from typing import *
+
+sys.setrecursionlimit(10 ** 6)
+
+{source_code}
+
+
+def _parse_case(_lines):
+    _lines = _lines + [""] * ({input_count} - len(_lines))
+    {input_parsing_code}
+    return ({function_call_args})
+
+
+if __name__ == "__main__":
+    _lines = sys.stdin.buffer.read().decode("utf-8").split("\\n")
+    result = {function_name}(*_parse_case(_lines))
+    print(result)
+"""
+
+# Runs every test case from stdin in one interpreter and frames each case's output
+HARNESS_SUBMISSION_TEMPLATE = """import sys
+from typing import *
+
+sys.setrecursionlimit(10 ** 6)
+
+{source_code}
+
+
+def _parse_case(_lines):
+    _lines = _lines + [""] * ({input_count} - len(_lines))
+    {input_parsing_code}
+    return ({function_call_args})
+
+
+def _run_case(_index, _lines):
+    print("{case_start}" + str(_index) + "{marker_suffix}")
+    try:
+        result = {function_name}(*_parse_case(_lines))
+        print(result)
+    except Exception as harness_error:
+        _message = type(harness_error).__name__ + ": " + str(harness_error)
+        # One line per error: escape backslashes and line breaks (see harness_protocol)
+        _message = _message.replace("\\\\", "\\\\\\\\").replace("\\n", "\\\\n").replace("\\r", "\\\\r")
+        print("{case_error}" + str(_index) + "{marker_suffix} " + _message)
+    print("{case_end}" + str(_index) + "{marker_suffix}")
+
+
+if __name__ == "__main__":
+    _case_lines = []
+    _case_index = 0
+    for _line in sys.stdin.buffer.read().decode("utf-8").split("\\n"):
+        if _line == "{case_delimiter}":
+            _run_case(_case_index, _case_lines)
+            _case_lines = []
+            _case_index += 1
+        else:
+            _case_lines.append(_line)
+"""
+
+class PythonSubmissionGenerator:
+    """Generator for Python submission code."""
+
+    def generate_submission(self, source_code: str, problem_structure: Dict[str, Any], harness: bool = False) -> str:
+        """
+        Generates a complete Python program by combining the user's function
+        with input parsing and output printing driven by the problem structure.
+        Inputs use the same line format as the Java submissions (one parameter
+        per line, list items separated by '|').
+
+        Args:
+            source_code (str): The user's source code implementation.
+            problem_structure (Dict[str, Any]): Contains function and input/output details.
+            harness (bool): If True, generate a multi-test harness that reads every
+                test case from stdin (see harness_protocol) and prints framed
+                per-case results, so all cases run in a single interpreter.
+
+        Returns:
+            str: Complete Python code ready for execution.
+
+        Raises:
+            PythonSubmissionGeneratorException: If validation fails.
+        """
+        try:
+            logger.info("Generating Python submission:")
+            logger.debug("Source code: %s", log_text(source_code))
+            logger.debug("Problem structure: %s", log_text(problem_structure))
+
+            self._validate_problem_structure(problem_structure)
+            self._validate_source_code(source_code, problem_structure)
+
+            plan = get_problem_plan(problem_structure)
+            input_parsing_code = []
+            arg_names = []
+            for i, param in enumerate(plan.params):
+                arg_name = f"_arg{i}"
+                arg_names.append(arg_name)
+                input_parsing_code.append(
+                    f"{arg_name} = {self._parse_value(param.python_type, f'_lines[{i}]')}  # {param.name}"
+                )
+
+            template = HARNESS_SUBMISSION_TEMPLATE if harness else SUBMISSION_TEMPLATE
+            submission = template.format(
+                source_code=source_code.strip(),
+                function_name=plan.function_name,
+                input_count=len(plan.params),
+                input_parsing_code="\n    ".join(input_parsing_code) or "pass",
+                function_call_args="".join(f"{name}, " for name in arg_names),
+                case_delimiter=CASE_DELIMITER,
+                case_start=CASE_START_PREFIX,
+                case_end=CASE_END_PREFIX,
+                case_error=CASE_ERROR_PREFIX,
+                marker_suffix=MARKER_SUFFIX
+            )
+
+            logger.debug("Generated submission:\n%s", log_text(submission))
+            return submission
+
+        except Exception as e:
+            logger.error(f"Error generating Python submission: {str(e)}")
+            raise PythonSubmissionGeneratorException(f"Failed to generate Python submission: {str(e)}")
+
+    def _validate_problem_structure(self, problem_structure: Dict[str, Any]):
+        """
+        Validates that the problem structure contains all required fields.
+        """
+        required_fields = ["problem_name", "function_name", "input_structure", "output_structure"]
+        for field in required_fields:
+            if field not in problem_structure:
+                raise PythonSubmissionGeneratorException(f"Missing required field: {field}")
+
+    def _validate_source_code(self, source_code: str, problem_structure: Dict[str, Any]):
+        """
+        Validates that the source code defines the expected function.
+        """
+        if not source_code or not source_code.strip():
+            raise PythonSubmissionGeneratorException("Source code is empty")
+
+        function_name = problem_structure.get("function_name")
+        if not function_name:
+            raise PythonSubmissionGeneratorException("Function name not found in problem structure")
+
+        if not re.search(rf"\bdef\s+{re.escape(function_name)}\s*\(", source_code):
+            raise PythonSubmissionGeneratorException(
+                f"Source code does not define the expected function: {function_name}"
+            )
+
+    def _parse_value(self, param_type: str, value_expr: str) -> str:
+        """
+        Generate a Python expression that parses one input line into param_type.
+        Unknown types are passed through as the raw string.
+        """
+        list_match = LIST_TYPE_PATTERN.match(param_type)
+        if list_match or param_type.endswith("[]"):
+            item_type = list_match.group(1) if list_match else param_type[:-2]
+            item_parser = SCALAR_PARSERS.get(item_type, "{value}").format(value="_item")
+            return f"[{item_parser} for _item in {value_expr}.split('|')] if {value_expr} else []"
+        return SCALAR_PARSERS.get(param_type, "{value}").format(value=value_expr)
@@ -1,7 +1,17 @@
 import json
 import os
+from functools import lru_cache
 from typing import Dict, Any
 
+@lru_cache(maxsize=None)
+def load_java_type_mappings() -> Dict[str, Any]:
+    """Load Java type mappings from the JSON configuration file (parsed once per process)."""
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    mapping_file = os.path.join(current_dir, "java_type_mappings.json")
+
+    with open(mapping_file, "r") as f:
+        return json.load(f)
+
 class JavaTypeMapper:
     """A type mapper specifically for converting Python types to Java types."""
     
@@ -10,11 +20,7 @@ class JavaTypeMapper:
 
     def _load_type_mappings(self) -> Dict[str, Any]:
         """Load Java type mappings from the JSON configuration file."""
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        mapping_file = os.path.join(current_dir, "java_type_mappings.json")
-        
-        with open(mapping_file, "r") as f:
-            return json.load(f)
+        return load_java_type_mappings()
 
     def to_java_type(self, python_type: str) -> str:
         """Convert Python type notation to Java type notation."""
@@ -0,0 +1,185 @@
+"""
+Parsed, immutable view of a problem structure shared by the generators.
+
+The boilerplate, submission and test-case generators all need the same facts
+about a problem: each parameter's name and declared type, its Java and Python
+types, and how a test case value is written on its stdin line. ProblemPlan
+computes them once per structure; get_problem_plan() memoizes plans by a hash
+of the structure so later calls skip parsing and type mapping entirely.
+"""
+
+import json
+import hashlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .java.java_type_mapper import JavaTypeMapper
+from .java.java_name_converter import to_java_name
+
+# Structure keys a plan depends on; anything else (problem_name, ...) is ignored
+PLAN_FIELDS = ("function_name", "input_structure", "output_structure")
+
+class ProblemPlanException(Exception):
+    """Raised when a problem structure cannot be parsed into a plan."""
+    pass
+
+def is_array_type(type_str: str) -> bool:
+    """Whether a declared type is a list/array (List[int], list[str], int[], ...)."""
+    return type_str.startswith(("List[", "list[", "Array[", "array[")) or type_str.endswith("[]")
+
+def parse_field(field: str) -> Tuple[str, str]:
+    """
+    Split a field such as "Dict[str, int] counts" into its type and name.
+    Bracketed types may contain spaces; a missing name defaults to "result".
+    """
+    field = field.strip()
+    if "[" in field:
+        last_bracket = field.rindex("]")
+        return field[:last_bracket + 1], field[last_bracket + 1:].strip() or "result"
+    parts = field.split()
+    if len(parts) == 1:
+        return parts[0], "result"
+    if len(parts) == 2:
+        return parts[0], parts[1]
+    raise ProblemPlanException(f"Invalid field format: {field}")
+
+def field_of(entry: Dict[str, str], kind: str) -> str:
+    """Read an "Input_Field"/"Output_Field" entry; generated problems use "Input Field"."""
+    for key in (f"{kind}_Field", f"{kind} Field"):
+        if key in entry:
+            return entry[key]
+    raise ProblemPlanException(f"Missing {kind}_Field in {entry}")
+
+def encode_scalar(value: Any) -> str:
+    return str(value)
+
+def encode_array(value: Any) -> str:
+    """Write a list as one '|'-separated line; "[1, 2]" strings are accepted too."""
+    if isinstance(value, (list, tuple)):
+        return "|".join(str(x) for x in value)
+    if isinstance(value, str):
+        s = value.strip()
+        if s.startswith("[") and s.endswith("]"):
+            s = s[1:-1]
+        return "|".join(t.strip() for t in s.split(",") if t.strip())
+    return str(value)
+
+@dataclass(frozen=True)
+class ParamPlan:
+    """One parameter (or the output) of a problem, parsed and type-mapped."""
+    name: str
+    java_name: str
+    type: str
+    java_type: str
+    python_type: str
+    is_array: bool
+    encode: Callable[[Any], str]
+
+@lru_cache(maxsize=1024)
+def param_plan(field: str) -> ParamPlan:
+    """Parse and type-map one field string such as "List[int] nums"; memoized per string."""
+    param_type, name = parse_field(field)
+    array = is_array_type(param_type)
+    return ParamPlan(
+        name=name,
+        java_name=to_java_name(name),
+        type=param_type,
+        java_type=JavaTypeMapper().to_java_type(param_type),
+        python_type=param_type.replace(" ", ""),
+        is_array=array,
+        encode=encode_array if array else encode_scalar,
+    )
+
+def encode_input(params: Tuple[ParamPlan, ...], input_data: Any) -> str:
+    """
+    Write a test case's input as stdin: one line per parameter, arrays '|'-separated.
+
+    input_data is normally a list with one value per parameter. A string
+    with one line per parameter, or a whitespace-separated string of
+    scalars, is accepted as well. For a single array parameter, a flat
+    list is taken as the array itself.
+    """
+    if not input_data:
+        return ""
+
+    if isinstance(input_data, str) and "\n" in input_data:
+        lines = input_data.strip().split("\n")
+        if len(lines) != len(params):
+            raise ProblemPlanException(f"Expected {len(params)} lines but got {len(lines)}")
+        return "\n".join(
+            param.encode(line) if param.is_array else line for param, line in zip(params, lines)
+        )
+
+    if len(params) == 1 and params[0].is_array:
+        if (
+            isinstance(input_data, (list, tuple))
+            and len(input_data) == 1
+            and isinstance(input_data[0], (list, tuple))
+        ):
+            input_data = input_data[0]
+        return params[0].encode(input_data)
+
+    if isinstance(input_data, (list, tuple)):
+        if len(input_data) != len(params):
+            raise ProblemPlanException(f"Expected {len(params)} parameters but got {len(input_data)}")
+        return "\n".join(param.encode(value) for param, value in zip(params, input_data))
+
+    if isinstance(input_data, str):
+        values = input_data.strip().split()
+        if len(values) != len(params):
+            raise ProblemPlanException(f"Expected {len(params)} values but got {len(values)}")
+        return "\n".join(values)
+
+    return str(input_data)
+
+@dataclass(frozen=True)
+class ProblemPlan:
+    """Everything the generators derive from a problem structure, computed once."""
+    key: str
+    function_name: Optional[str]
+    java_function_name: Optional[str]
+    params: Tuple[ParamPlan, ...]
+    output: ParamPlan
+
+    def encode_input(self, input_data: Any) -> str:
+        """Write a test case's input as stdin (see encode_input)."""
+        return encode_input(self.params, input_data)
+
+    def encode_output(self, output_data: Any) -> str:
+        """Write a test case's expected output as the program prints it."""
+        return str(output_data)
+
+def plan_key(structure: Dict[str, Any]) -> str:
+    """Canonical JSON of the parts of a structure a plan depends on."""
+    return json.dumps({name: structure.get(name) for name in PLAN_FIELDS}, sort_keys=True)
+
+@lru_cache(maxsize=1024)
+def _compile_plan(canonical: str) -> ProblemPlan:
+    structure = json.loads(canonical)
+    input_structure = structure.get("input_structure")
+    output_structure = structure.get("output_structure")
+    if input_structure is None or output_structure is None:
+        raise ProblemPlanException("Structure needs input_structure and output_structure")
+    function_name = structure.get("function_name")
+    return ProblemPlan(
+        key=hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16],
+        function_name=function_name,
+        java_function_name=to_java_name(function_name) if function_name else None,
+        params=tuple(param_plan(field_of(entry, "Input")) for entry in input_structure),
+        output=param_plan(field_of(output_structure, "Output")),
+    )
+
+def get_problem_plan(structure: Dict[str, Any]) -> ProblemPlan:
+    """
+    Return the plan for a problem structure, compiling it on first use.
+
+    Raises:
+        ProblemPlanException: If a field is missing or malformed.
+    """
+    try:
+        return _compile_plan(plan_key(structure))
+    except ProblemPlanException:
+        raise
+    except (TypeError, ValueError, AttributeError) as e:
+        raise ProblemPlanException(f"Invalid problem structure: {e}")
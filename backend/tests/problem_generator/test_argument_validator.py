@@ -0,0 +1,75 @@
+import os
+import sys
+import json
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from main.problem_generator.argument_validator import GenerationAborted, ProblemArgumentValidator
+from main.shared.incremental_json import IncrementalJSONParser
+
+TAGS = ["arrays", "counting"]
+
+def arguments(**overrides):
+    document = {
+        "problem_title": "Count Matches",
+        "structure": {
+            "function_name": "count_matches",
+            "input_structure": [{"Input Field": "List[int] nums"}, {"Input Field": "int target"}],
+            "output_structure": {"Output Field": "int result"},
+        },
+        "test_cases": [{"input": [[1, 2, 1], 1], "output": 2}],
+        "tags": ["arrays", "counting"],
+    }
+    document.update(overrides)
+    return json.dumps(document)
+
+def parse(text):
+    parser = IncrementalJSONParser(ProblemArgumentValidator(TAGS))
+    parser.feed(text)
+    return parser.close()
+
+def test_valid_arguments_pass():
+    assert parse(arguments())["tags"] == ["arrays", "counting"]
+
+@pytest.mark.parametrize("field", ["char letter", "Set[int] seen", "Any value"])
+def test_unsupported_input_type_aborts(field):
+    structure = json.loads(arguments())["structure"]
+    structure["input_structure"][1] = {"Input Field": field}
+    with pytest.raises(GenerationAborted, match="Unsupported input type"):
+        parse(arguments(structure=structure))
+
+def test_output_with_alternatives_aborts():
+    structure = json.loads(arguments())["structure"]
+    structure["output_structure"] = {"Output Field": "int or str result"}
+    with pytest.raises(GenerationAborted, match="one type"):
+        parse(arguments(structure=structure))
+
+@pytest.mark.parametrize("inputs", [[[1, 2, 1]], [[1, 2], 1, 3], []])
+def test_test_case_arity_must_match_input_structure(inputs):
+    with pytest.raises(GenerationAborted, match="Test case 0"):
+        parse(arguments(test_cases=[{"input": inputs, "output": 2}]))
+
+def test_test_cases_before_structure_are_checked_once_it_arrives():
+    text = json.dumps({
+        "test_cases": [{"input": [[1, 2]], "output": 3}],
+        "structure": json.loads(arguments())["structure"],
+    })
+    parser = IncrementalJSONParser(ProblemArgumentValidator(TAGS))
+    structure_start = text.index('"structure"')
+    parser.feed(text[:structure_start])
+    with pytest.raises(GenerationAborted, match="Test case 0"):
+        parser.feed(text[structure_start:])
+
+def test_single_array_parameter_accepts_bare_array():
+    structure = {
+        "function_name": "total",
+        "input_structure": [{"Input Field": "List[int] nums"}],
+        "output_structure": {"Output Field": "int result"},
+    }
+    test_cases = [{"input": [[1, 2, 3]], "output": 6}, {"input": [4, 5], "output": 9}]
+    assert len(parse(arguments(structure=structure, test_cases=test_cases))["test_cases"]) == 2
+
+def test_unknown_tag_aborts():
+    with pytest.raises(GenerationAborted, match="Unknown tag 'graphs'"):
+        parse(arguments(tags=["arrays", "graphs"]))
@@ -0,0 +1,213 @@
+import os
+import gc
+import sys
+import json
+import asyncio
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from main.problem_generator.problem_generator_service import ProblemGeneratorService
+from main.problem_generator.similarity_index import ProblemSimilarityIndex
+from main.problem_submission.problem_registry import ProblemRegistry
+
+def function_call_arguments(title, output_field="int result", test_cases=None, tags=("arrays",)):
+    return json.dumps({
+        "concept": "array",
+        "difficulty": "Easy",
+        "problem_title": title,
+        "problem_statement": f"Given a list of numbers, {title.lower()} and return the result of the whole computation.",
+        "structure": {
+            "problem_name": title,
+            "function_name": "solve",
+            "input_structure": [{"Input Field": "List[int] nums"}],
+            "output_structure": {"Output Field": output_field},
+        },
+        "test_cases": test_cases or [{"input": [[1, 2, 3]], "output": 6}],
+        "tags": list(tags),
+    })
+
+class FakeChunk:
+    def __init__(self, arguments):
+        self.additional_kwargs = {"function_call": {"name": "generate_programming_problem", "arguments": arguments}}
+
+class FakeLLM:
+    """
+    Streams each call's function-call arguments from the next (delay, arguments)
+    script entry, in small chunks after delay seconds; arguments None raises.
+    """
+
+    def __init__(self, script, chunk_size=16):
+        self.script = list(script)
+        self.chunk_size = chunk_size
+        self.calls = 0
+        self.cancelled = 0
+        self.streamed = []
+
+    async def astream(self, messages, **kwargs):
+        delay, arguments = self.script[self.calls]
+        self.calls += 1
+        streamed = []
+        self.streamed.append(streamed)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if arguments is None:
+            raise RuntimeError("rate limited")
+        for i in range(0, len(arguments), self.chunk_size):
+            streamed.append(arguments[i:i + self.chunk_size])
+            yield FakeChunk(arguments[i:i + self.chunk_size])
+
+@pytest.fixture
+def service(monkeypatch):
+    for name in ("AZURE_OPENAI_API_KEY", "AZURE_OPENAI_DEPLOYMENT_NAME", "AZURE_OPENAI_API_VERSION"):
+        monkeypatch.setenv(name, "test")
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com")
+    monkeypatch.setenv("PROBLEM_REPOSITORY", "none")
+    return ProblemGeneratorService(
+        problem_registry=ProblemRegistry(),
+        similarity_index=ProblemSimilarityIndex(),
+    )
+
+def test_first_valid_generation_wins_and_others_are_cancelled(service):
+    service.llm = FakeLLM([
+        (0.5, function_call_arguments("Sum Slowly")),
+        (0.0, None),
+        (0.05, function_call_arguments("Sum Quickly")),
+    ])
+
+    problem = asyncio.run(service.generate_new_problem("array", "EASY", speculation=3))
+
+    assert problem["problem_title"] == "Sum Quickly"
+    assert problem["problem_id"]
+    assert service.llm.calls == 3
+    assert service.llm.cancelled == 1
+
+def test_duplicate_result_loses_to_a_later_original(service):
+    existing = json.loads(function_call_arguments("Sum Values"))
+    service.similarity_index.add("array", "existing", f"Sum Values\n{existing['problem_statement']}")
+    service.llm = FakeLLM([
+        (0.0, function_call_arguments("Sum Values")),
+        (0.05, function_call_arguments("Multiply Every Element Together")),
+    ])
+
+    problem = asyncio.run(service.generate_new_problem("array", "EASY", speculation=2))
+
+    assert problem["problem_title"] == "Multiply Every Element Together"
+
+def test_only_duplicates_are_rejected_when_asked(service):
+    existing = json.loads(function_call_arguments("Sum Values"))
+    service.similarity_index.add("array", "existing", f"Sum Values\n{existing['problem_statement']}")
+    service.llm = FakeLLM([(0.0, function_call_arguments("Sum Values"))] * 2)
+
+    with pytest.raises(ValueError, match="sufficiently different"):
+        asyncio.run(service.generate_new_problem("array", "EASY", reject_duplicates=True, speculation=2))
+
+def test_all_generations_failing_raises(service):
+    service.llm = FakeLLM([(0.0, None), (0.0, None)])
+
+    with pytest.raises(ValueError, match="All 2 speculative generations failed"):
+        asyncio.run(service.generate_new_problem("array", "EASY", speculation=2))
+
+def test_failures_finishing_alongside_the_winner_are_retrieved(service, monkeypatch):
+    service.llm = FakeLLM([(0.0, function_call_arguments("Sum Quickly")), (0.0, None), (0.0, None)])
+    wait = asyncio.wait
+
+    async def winner_first_wait(tasks, **kwargs):
+        done, pending = await wait(tasks, **kwargs)
+        # Hand back finished tasks in start order, so the winner (the first call) is read first
+        return sorted(done, key=lambda task: int(task.get_name().rpartition("-")[2])), pending
+
+    monkeypatch.setattr(asyncio, "wait", winner_first_wait)
+
+    async def scenario():
+        unretrieved = []
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: unretrieved.append(context["message"]))
+        problem = await service.generate_new_problem("array", "EASY", speculation=3)
+        gc.collect()
+        return problem, unretrieved
+
+    problem, unretrieved = asyncio.run(scenario())
+
+    assert problem["problem_title"] == "Sum Quickly"
+    assert unretrieved == []
+
+def test_speculation_of_one_generates_sequentially(service):
+    service.llm = FakeLLM([(0.0, function_call_arguments("Sum Values"))])
+
+    problem = asyncio.run(service.generate_new_problem("array", "EASY", speculation=1))
+
+    assert problem["problem_title"] == "Sum Values"
+    assert service.llm.calls == 1
+
+def test_invalid_output_field_aborts_mid_stream_and_retries(service):
+    invalid = function_call_arguments("Sum Values", output_field="int or str result")
+    service.llm = FakeLLM([
+        (0.0, invalid),
+        (0.0, function_call_arguments("Sum Values")),
+    ])
+
+    problem = asyncio.run(service.generate_new_problem("array", "EASY", speculation=1))
+
+    assert problem["structure"]["output_structure"]["Output_Field"] == "int result"
+    assert service.llm.calls == 2
+    # The aborted stream stopped right after the structure, well before the test cases
+    assert len("".join(service.llm.streamed[0])) < invalid.index('"test_cases"') + 16
+
+def test_mismatched_test_case_and_unknown_tag_abort(service):
+    service.abort_retries = 1
+    service.llm = FakeLLM([
+        (0.0, function_call_arguments("Sum Values", test_cases=[{"input": [[1], 2], "output": 1}])),
+        (0.0, function_call_arguments("Sum Values", tags=["arrays", "graphs"])),
+    ])
+
+    with pytest.raises(ValueError, match="Unknown tag 'graphs'"):
+        asyncio.run(service.generate_new_problem("array", "EASY", speculation=1))
+    assert service.llm.calls == 2
+
+def test_negative_abort_retries_still_generates_once(service, monkeypatch):
+    monkeypatch.setenv("PROBLEM_GENERATION_ABORT_RETRIES", "-1")
+    service = ProblemGeneratorService(problem_registry=ProblemRegistry(), similarity_index=ProblemSimilarityIndex())
+    service.llm = FakeLLM([(0.0, function_call_arguments("Sum Values", tags=["graphs"]))])
+
+    with pytest.raises(ValueError, match="Unknown tag 'graphs'"):
+        asyncio.run(service.generate_new_problem("array", "EASY", speculation=1))
+    assert service.abort_retries == 0
+    assert service.llm.calls == 1
+
+async def collect_events(service):
+    return [event async for event in service.stream_problem("array", "EASY")]
+
+def test_stream_delivers_title_and_statement_before_the_rest(service):
+    service.llm = FakeLLM([(0.0, function_call_arguments("Sum Values"))])
+
+    events = asyncio.run(collect_events(service))
+
+    names = [event for event, _ in events]
+    assert names == ["title", "statement", "structure", "boilerplate", "test_case", "tags", "problem"]
+    assert events[0][1] == {"problem_title": "Sum Values"}
+    assert "public int solve(int[] nums)" in events[3][1]["java_boilerplate"]
+    assert events[4][1] == {"index": 0, "test_case": {"input": [[1, 2, 3]], "output": 6}}
+    assert events[-1][1]["problem_id"]
+
+def test_stream_resets_after_an_aborted_generation(service):
+    service.llm = FakeLLM([
+        (0.0, function_call_arguments("Sum Values", tags=["graphs"])),
+        (0.0, function_call_arguments("Sum Values")),
+    ])
+
+    names = [event for event, _ in asyncio.run(collect_events(service))]
+
+    assert names[:5] == ["title", "statement", "structure", "boilerplate", "test_case"]
+    assert names[5] == "reset"
+    assert names[6:] == ["title", "statement", "structure", "boilerplate", "test_case", "tags", "problem"]
+
+def test_stream_ends_with_error_when_generation_fails(service):
+    service.abort_retries = 0
+    service.llm = FakeLLM([(0.0, None)])
+
+    events = asyncio.run(collect_events(service))
+
+    assert events == [("error", {"detail": "Failed to generate problem: rate limited"})]
@@ -0,0 +1,179 @@
+import os
+import sys
+import asyncio
+import threading
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from main.problem_generator.problem_pool import ProblemPool
+
+KEY = ("array_search", "EASY")
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class FakeGenerator:
+    def __init__(self, fail_times=0, register=True):
+        self.calls = 0
+        self.fail_times = fail_times
+        self.register = register
+
+    async def __call__(self, concept, complexity):
+        self.calls += 1
+        if self.calls <= self.fail_times:
+            raise ValueError("LLM unavailable")
+        return {
+            "problem_title": f"{concept} {complexity} #{self.calls}",
+            "concept": concept,
+            "problem_id": f"id-{self.calls}" if self.register else None,
+        }
+
+async def settle(pool):
+    """Let scheduled refills run to completion."""
+    for _ in range(20):
+        await asyncio.sleep(0)
+    await asyncio.gather(*pool._refills.values(), return_exceptions=True)
+
+def test_key_normalizes_concept_and_complexity():
+    assert ProblemPool.key_for("Array Search", "easy") == KEY
+
+def test_start_fills_every_key_to_min_depth():
+    async def run():
+        generate = FakeGenerator()
+        pool = ProblemPool(generate, keys=[KEY, ("recursion", "HARD")], min_depth=2)
+        pool.start()
+        await settle(pool)
+        assert pool.depth(KEY) == 2
+        assert pool.depth(("recursion", "HARD")) == 2
+        assert generate.calls == 4
+        await pool.close()
+
+    asyncio.run(run())
+
+def test_take_serves_instantly_and_refills():
+    async def run():
+        generate = FakeGenerator()
+        pool = ProblemPool(generate, keys=[KEY], min_depth=1)
+        pool.start()
+        await settle(pool)
+
+        problem = pool.take("Array Search", "EASY")
+        assert problem["problem_title"] == "array_search EASY #1"
+        # The problem carries the concept the student asked for
+        assert problem["concept"] == "Array Search"
+        assert pool.depth(KEY) == 0
+
+        await settle(pool)
+        assert pool.depth(KEY) >= 1
+        await pool.close()
+
+    asyncio.run(run())
+
+def test_take_unknown_or_empty_returns_none():
+    async def run():
+        pool = ProblemPool(FakeGenerator(), keys=[KEY])
+        assert pool.take("Graph Theory", "EASY") is None
+        assert pool.take("Array Search", "EASY") is None
+        await pool.close()
+
+    asyncio.run(run())
+
+def test_target_depth_adapts_to_demand():
+    clock = FakeClock()
+    pool = ProblemPool(
+        FakeGenerator(), keys=[KEY], min_depth=1, max_depth=4,
+        demand_window_seconds=100, initial_generation_seconds=20, clock=clock,
+    )
+    assert pool.target_depth(KEY) == 1
+
+    # Five takes per 100s while a problem takes 20s to generate: one more in reserve
+    for _ in range(5):
+        pool.take("array_search", "EASY")
+    assert pool.target_depth(KEY) == 2
+
+    for _ in range(50):
+        pool.take("array_search", "EASY")
+    assert pool.target_depth(KEY) == 4
+
+    # Demand outside the window no longer counts
+    clock.now = 101
+    assert pool.target_depth(KEY) == 1
+
+def test_unregistered_problems_are_not_pooled_and_failures_back_off():
+    async def run():
+        pool = ProblemPool(FakeGenerator(register=False), keys=[KEY], retry_base_delay=0.01)
+        pool.start()
+        await asyncio.sleep(0.05)
+        assert pool.depth(KEY) == 0
+        await pool.close()
+
+        generate = FakeGenerator(fail_times=2)
+        pool = ProblemPool(generate, keys=[KEY], retry_base_delay=0.001)
+        pool.start()
+        await settle(pool)
+        assert generate.calls == 3
+        assert pool.depth(KEY) == 1
+        await pool.close()
+
+    asyncio.run(run())
+
+def test_pool_persists_across_restarts(tmp_path):
+    db_path = str(tmp_path / "pool.db")
+
+    async def fill():
+        pool = ProblemPool(FakeGenerator(), keys=[KEY], min_depth=2, db_path=db_path)
+        pool.start()
+        await settle(pool)
+        pool.take("array_search", "EASY")
+        # Stop before the refill replaces the served problem
+        await pool.close()
+
+    asyncio.run(fill())
+
+    restarted = ProblemPool(FakeGenerator(), keys=[KEY], min_depth=2, db_path=db_path)
+    assert restarted.depth(KEY) == 1
+    assert restarted.take("array_search", "EASY")["problem_title"] == "array_search EASY #2"
+    assert restarted.depth(KEY) == 0
+    asyncio.run(restarted.close())
+
+def test_take_and_refill_leave_sqlite_to_the_writer_thread(tmp_path):
+    class RecordingConnection:
+        def __init__(self, conn):
+            self.conn = conn
+            self.threads = set()
+
+        def execute(self, *args):
+            self.threads.add(threading.current_thread())
+            return self.conn.execute(*args)
+
+        def commit(self):
+            self.threads.add(threading.current_thread())
+            self.conn.commit()
+
+        def close(self):
+            self.conn.close()
+
+    async def run():
+        pool = ProblemPool(FakeGenerator(), keys=[KEY], min_depth=1, db_path=str(tmp_path / "pool.db"))
+        conn = pool._conn = RecordingConnection(pool._conn)
+        pool.start()
+        await settle(pool)
+        assert pool.take("array_search", "EASY")["problem_title"] == "array_search EASY #1"
+        await settle(pool)
+        depth = pool.depth(KEY)
+        await pool.close()
+        return conn.threads, depth
+
+    threads, depth = asyncio.run(run())
+
+    assert threads and threading.current_thread() not in threads
+    # The writer applied every queued change before close() returned
+    restarted = ProblemPool(FakeGenerator(), keys=[KEY], min_depth=1, db_path=str(tmp_path / "pool.db"))
+    assert restarted.depth(KEY) == depth
+    assert restarted.take("array_search", "EASY")["problem_title"] == "array_search EASY #2"
+    asyncio.run(restarted.close())
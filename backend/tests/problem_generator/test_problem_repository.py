@@ -0,0 +1,71 @@
+import os
+import sys
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from main.problem_generator.problem_repository import SQLiteProblemRepository
+
+def make_problem(title, concept="Array Search", difficulty="Easy", tags=("arrays",)):
+    return {
+        "problem_title": title,
+        "problem_statement": f"Solve {title}.",
+        "concept": concept,
+        "difficulty": difficulty,
+        "tags": list(tags),
+        "structure": {"function_name": "solve"},
+        "test_cases": [{"input": [1], "output": 1}],
+    }
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = SQLiteProblemRepository(str(tmp_path / "problems.db"))
+    yield repository
+    repository.close()
+
+def test_save_and_get_round_trip(repository):
+    problem = dict(make_problem("Find Max"), problem_id="abc123")
+
+    assert repository.save(problem) == "abc123"
+    stored = repository.get("abc123")
+    assert stored["problem_title"] == "Find Max"
+    assert stored["created_at"] > 0
+    assert repository.get("missing") is None
+
+def test_save_without_id_uses_registry_id_and_is_idempotent(repository):
+    problem = make_problem("Count Evens")
+
+    first = repository.save(problem)
+    assert repository.save(problem) == first
+    assert len(repository.find()) == 1
+    assert repository.get(first)["problem_id"] == first
+
+def test_find_filters_and_orders_newest_first(repository):
+    repository.save(make_problem("A", concept="array_search", difficulty="EASY", tags=["arrays", "searching"]))
+    repository.save(make_problem("B", concept="Recursion", difficulty="Hard", tags=["numbers"]))
+    repository.save(make_problem("C", concept="Array Search", difficulty="easy", tags=["arrays"]))
+
+    assert [p["problem_title"] for p in repository.find()] == ["C", "B", "A"]
+    # Concept and difficulty match regardless of spelling and case
+    assert [p["problem_title"] for p in repository.find(concept="array search", difficulty="EASY")] == ["C", "A"]
+    assert [p["problem_title"] for p in repository.find(tag="searching")] == ["A"]
+    assert [p["problem_title"] for p in repository.find(difficulty="HARD")] == ["B"]
+    assert [p["problem_title"] for p in repository.find(limit=1)] == ["C"]
+
+def test_find_pages_with_before(repository):
+    for title in ("A", "B", "C"):
+        repository.save(make_problem(title))
+    first_page = repository.find(limit=2)
+    second_page = repository.find(limit=2, before=first_page[-1]["created_at"])
+    assert [p["problem_title"] for p in first_page + second_page] == ["C", "B", "A"]
+
+def test_repository_persists_across_reopen(tmp_path):
+    db_path = str(tmp_path / "problems.db")
+    repository = SQLiteProblemRepository(db_path)
+    problem_id = repository.save(make_problem("Persisted"))
+    repository.close()
+
+    reopened = SQLiteProblemRepository(db_path)
+    assert reopened.get(problem_id)["problem_title"] == "Persisted"
+    assert reopened.find(tag="arrays")[0]["problem_id"] == problem_id
+    reopened.close()
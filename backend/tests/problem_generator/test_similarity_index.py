@@ -0,0 +1,93 @@
+import os
+import sys
+import threading
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from main.problem_generator.similarity_index import MinHasher, ProblemSimilarityIndex, similarity_text
+
+STATEMENT = (
+    "Given a list of daily temperatures and a threshold, return the index of the first day "
+    "whose temperature is above the threshold. If no day is warmer than the threshold, return -1. "
+    "For example, temperatures [3, 5, 9] with threshold 4 give 1."
+)
+REWORDED = STATEMENT.replace("daily temperatures", "weekly temperatures").replace("For example", "Example")
+UNRELATED = (
+    "Write a function that reverses the words of a sentence while keeping each word's letters "
+    "in order, then returns how many vowels the reversed sentence contains."
+)
+
+def test_signature_is_deterministic_and_word_based():
+    hasher = MinHasher(num_perm=32)
+    assert (hasher.signature("Sum the Numbers!") == MinHasher(num_perm=32).signature("sum the numbers")).all()
+    assert hasher.signature("  ") is None
+
+def test_near_duplicate_is_found_and_unrelated_is_not():
+    index = ProblemSimilarityIndex()
+    index.add("Array Search", "p1", STATEMENT)
+
+    match = index.find_similar("array_search", REWORDED)
+    assert match is not None and match[0] == "p1"
+    assert match[1] >= index.threshold
+    assert index.find_similar("Array Search", UNRELATED) is None
+
+def test_concepts_are_indexed_separately():
+    index = ProblemSimilarityIndex()
+    index.add("array", "p1", STATEMENT)
+    assert index.find_similar("recursion", STATEMENT) is None
+
+def test_readding_an_id_replaces_it_and_old_entries_are_evicted():
+    index = ProblemSimilarityIndex(max_per_concept=2)
+    index.add("array", "p1", STATEMENT)
+    index.add("array", "p1", UNRELATED)
+    assert index.find_similar("array", STATEMENT) is None
+    assert index.size("array") == 1
+
+    index.add("array", "p2", STATEMENT)
+    index.add("array", "p3", "Count how many times each character appears in a string and return the most common one.")
+    assert index.size("array") == 2
+    # p1 was the oldest, so its text no longer matches anything
+    assert index.find_similar("array", UNRELATED) is None
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "similarity.json")
+    index = ProblemSimilarityIndex(snapshot_path=path, snapshot_every=100)
+    index.add("array", "p1", STATEMENT)
+    assert not os.path.exists(path)
+    index.close()
+
+    restored = ProblemSimilarityIndex(snapshot_path=path)
+    assert restored.find_similar("array", REWORDED)[0] == "p1"
+
+    # A snapshot from different MinHash parameters is ignored
+    assert ProblemSimilarityIndex(num_perm=32, bands=8, snapshot_path=path).size("array") == 0
+
+def test_periodic_snapshots_are_written_off_the_calling_thread(tmp_path):
+    path = str(tmp_path / "similarity.json")
+    index = ProblemSimilarityIndex(snapshot_path=path, snapshot_every=1)
+    started, release = threading.Event(), threading.Event()
+    writers = []
+    write_snapshot = index._write_snapshot
+
+    def slow_write(signatures):
+        writers.append(threading.current_thread())
+        started.set()
+        release.wait(timeout=5)
+        write_snapshot(signatures)
+
+    index._write_snapshot = slow_write
+    # A slow write doesn't hold up add()
+    index.add("array", "p1", STATEMENT)
+    index.add("array", "p2", UNRELATED)
+    assert started.wait(timeout=5)
+    assert not os.path.exists(path)
+    release.set()
+    index.close()
+
+    assert writers and threading.current_thread() is not writers[0]
+    restored = ProblemSimilarityIndex(snapshot_path=path)
+    assert restored.size("array") == 2
+
+def test_similarity_text_uses_title_and_statement():
+    assert similarity_text({"problem_title": "Warm Day", "problem_statement": "Find it."}) == "Warm Day\nFind it."
@@ -0,0 +1,66 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from main.problem_submission.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN, TRIAL_RETRY_AFTER
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("judge0", failure_threshold=3, reset_timeout=10, clock=FakeClock())
+
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_success()
+    for _ in range(3):
+        breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.retry_after() == 10
+
+def test_half_open_allows_one_trial():
+    clock = FakeClock()
+    breaker = CircuitBreaker("judge0", failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 10
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+def test_failed_trial_reopens():
+    clock = FakeClock()
+    breaker = CircuitBreaker("judge0", failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+    assert breaker.allow()
+
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert breaker.retry_after() == 10
+
+def test_half_open_rejection_suggests_a_backoff():
+    clock = FakeClock()
+    breaker = CircuitBreaker("judge0", failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+    assert breaker.allow()
+
+    assert not breaker.allow()
+    assert breaker.retry_after() == TRIAL_RETRY_AFTER > 0
+
+    breaker.record_success()
+    assert breaker.retry_after() == 0.0
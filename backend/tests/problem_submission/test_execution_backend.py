@@ -0,0 +1,147 @@
+import os
+import sys
+import base64
+import shutil
+import socket
+import asyncio
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from main.problem_submission.execution_backend import (
+    ExecutionLimits,
+    LocalExecutionBackend,
+    SandboxPolicy,
+    run_submission,
+)
+from main.problem_submission.verdict_store import VerdictStore
+
+PYTHON = 71
+JAVA = 91
+LIMITS = ExecutionLimits(cpu_seconds=1, wall_seconds=3)
+# Keeps the server's uid: the test interpreter may live where the sandbox user can't run it
+SERVER_USER = SandboxPolicy(uid=None, gid=None)
+
+def status_id(verdict):
+    return verdict["status"]["id"]
+
+def test_accepted(tmp_path):
+    verdict = run_submission(PYTHON, "print(int(input()) * 2)", "21\n", "42\n", LIMITS, str(tmp_path))
+    assert status_id(verdict) == 3
+    assert verdict["stdout"] == "42\n"
+    assert verdict["exit_code"] == 0
+    assert float(verdict["time"]) >= 0
+
+def test_wrong_answer(tmp_path):
+    verdict = run_submission(PYTHON, "print(1)", "", "2\n", LIMITS, str(tmp_path))
+    assert status_id(verdict) == 4
+
+def test_runtime_error(tmp_path):
+    verdict = run_submission(PYTHON, "raise ValueError('boom')", "", "", LIMITS, str(tmp_path))
+    assert status_id(verdict) == 11
+    assert "ValueError: boom" in verdict["stderr"]
+
+def test_time_limit(tmp_path):
+    verdict = run_submission(PYTHON, "while True:\n    pass\n", "", "", LIMITS, str(tmp_path))
+    assert status_id(verdict) == 5
+
+def test_memory_limit(tmp_path):
+    verdict = run_submission(PYTHON, "x = [0] * (10 ** 9)", "", "", LIMITS, str(tmp_path))
+    assert status_id(verdict) not in (3, 4)
+    assert "MemoryError" in verdict["stderr"]
+
+@pytest.mark.skipif(shutil.which("javac") is None, reason="JDK not installed")
+def test_java_compilation_error_is_cached(tmp_path):
+    source = "public class Main { public static void main(String[] args) { int x = } }"
+    first = run_submission(JAVA, source, "", "", LIMITS, str(tmp_path))
+    second = run_submission(JAVA, source, "", "", LIMITS, str(tmp_path))
+    assert status_id(first) == status_id(second) == 6
+    assert first["compile_output"] == second["compile_output"]
+
+def test_backend_stores_verdicts(tmp_path):
+    def encode(text):
+        return base64.b64encode(text.encode()).decode()
+
+    async def run():
+        store = VerdictStore()
+        backend = LocalExecutionBackend(store, pool_size=1, limits=LIMITS, build_root=str(tmp_path))
+        try:
+            submission = {
+                "language_id": PYTHON,
+                "source_code": encode("print(input())"),
+                "stdin": encode("hi"),
+                "expected_output": encode("hi"),
+            }
+            result = await backend.run(submission)
+            assert status_id(result) == 3
+            assert store.get(result["token"])["stdout"] == "hi\n"
+
+            fetched = await backend.fetch([result["token"], "missing"])
+            assert status_id(fetched[result["token"]]) == 3
+            assert isinstance(fetched["missing"], Exception)
+        finally:
+            await backend.aclose()
+
+    asyncio.run(run())
+
+def test_frontend_python_language_id_runs_locally(tmp_path):
+    verdict = run_submission(28, "print(input())", "hi\n", "hi\n", LIMITS, str(tmp_path))
+    assert status_id(verdict) == 3
+
+def test_python_without_fork_runner(tmp_path):
+    verdict = run_submission(
+        PYTHON, "print(input())", "hi\n", "hi\n", LIMITS, str(tmp_path), use_fork_runner=False, sandbox=SERVER_USER
+    )
+    assert status_id(verdict) == 3
+
+def test_run_does_not_inherit_server_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("JUDGE0_RAPIDAPI_KEY", "server-secret")
+    source = "import os\nprint(sorted(os.environ))\nprint(os.environ.get('JUDGE0_RAPIDAPI_KEY'))"
+    verdict = run_submission(PYTHON, source, "", None, LIMITS, str(tmp_path), use_fork_runner=False, sandbox=SERVER_USER)
+    assert status_id(verdict) == 3
+    assert verdict["stdout"] == "['HOME', 'LANG', 'PATH']\nNone\n"
+
+@pytest.mark.parametrize("use_fork_runner", [False, True])
+def test_run_has_no_network(tmp_path, use_fork_runner):
+    # Reachable from the server, so only the sandbox's network namespace can stop the connection
+    with socket.socket() as listener:
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        source = (
+            "import socket\n"
+            "try:\n"
+            f"    socket.create_connection(('127.0.0.1', {listener.getsockname()[1]}), timeout=2)\n"
+            "    print('connected')\n"
+            "except OSError:\n"
+            "    print('blocked')\n"
+        )
+        verdict = run_submission(
+            PYTHON, source, "", None, LIMITS, str(tmp_path), use_fork_runner=use_fork_runner, sandbox=SERVER_USER
+        )
+    assert verdict["stdout"] == "blocked\n"
+
+def test_fork_runner_syntax_error(tmp_path):
+    verdict = run_submission(PYTHON, "def broken(:\n", "", "", LIMITS, str(tmp_path))
+    assert status_id(verdict) == 11
+    assert "SyntaxError" in verdict["stderr"]
+
+def test_fork_runner_sheds_worker_environment_and_descriptors(tmp_path, monkeypatch):
+    monkeypatch.setenv("AZURE_OPENAI_API_KEY", "server-secret")
+    with open(tmp_path / "worker_file.txt", "w") as worker_file:
+        source = (
+            "import os\n"
+            "print(sorted(os.environ), os.environ.get('AZURE_OPENAI_API_KEY'))\n"
+            "try:\n"
+            f"    os.fstat({worker_file.fileno()})\n"
+            "    print('open')\n"
+            "except OSError:\n"
+            "    print('closed')\n"
+        )
+        verdict = run_submission(PYTHON, source, "", None, LIMITS, str(tmp_path))
+    assert status_id(verdict) == 3
+    assert verdict["stdout"] == "['HOME', 'LANG', 'PATH'] None\nclosed\n"
+
+@pytest.mark.skipif(os.geteuid() != 0, reason="Privileges are only dropped when running as root")
+def test_fork_runner_drops_privileges(tmp_path):
+    verdict = run_submission(PYTHON, "import os\nprint(os.getuid(), os.getgid())", "", None, LIMITS, str(tmp_path))
+    assert verdict["stdout"] == "65534 65534\n"
@@ -0,0 +1,177 @@
+import os
+import sys
+import asyncio
+import httpx
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from main.problem_submission.circuit_breaker import CircuitBreaker
+from main.problem_submission.judge0_client import (
+    CircuitOpenException, DeadlineExceededException, Judge0Client, Judge0ClientException
+)
+from main.shared.deadline import deadline_scope
+
+def make_client(handler, **kwargs):
+    """A Judge0Client whose HTTP calls are answered by handler(request) instead of the network."""
+    kwargs.setdefault("retry_base_delay", 0.001)
+    client = Judge0Client("https://judge0.test", {}, **kwargs)
+    client._client = httpx.AsyncClient(base_url=client.base_url, transport=httpx.MockTransport(handler))
+    return client
+
+def test_get_retries_server_errors():
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        if len(calls) < 3:
+            return httpx.Response(502, text="bad gateway")
+        return httpx.Response(200, json={"token": "abc"})
+
+    async def scenario():
+        client = make_client(handler, get_retries=2)
+        return await client.get("/submissions/abc")
+
+    assert asyncio.run(scenario()) == {"token": "abc"}
+    assert len(calls) == 3
+
+def test_get_does_not_retry_client_errors_and_post_never_retries():
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        return httpx.Response(404 if request.method == "GET" else 503, text="nope")
+
+    async def scenario():
+        client = make_client(handler, get_retries=2)
+        with pytest.raises(Judge0ClientException):
+            await client.get("/submissions/missing")
+        with pytest.raises(Judge0ClientException):
+            await client.post("/submissions/batch", {"submissions": []})
+
+    asyncio.run(scenario())
+    assert calls == ["GET", "POST"]
+
+def test_open_circuit_fails_fast():
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        return httpx.Response(500, text="down")
+
+    async def scenario():
+        client = make_client(handler, get_retries=0, breaker=CircuitBreaker("test", failure_threshold=2))
+        for _ in range(2):
+            with pytest.raises(Judge0ClientException):
+                await client.get("/submissions/abc")
+        with pytest.raises(CircuitOpenException) as error:
+            await client.get("/submissions/abc")
+        return error.value
+
+    error = asyncio.run(scenario())
+    assert len(calls) == 2
+    assert error.retry_after > 0
+
+def test_expired_deadline_skips_the_call():
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        return httpx.Response(200, json={})
+
+    async def scenario():
+        client = make_client(handler)
+        with deadline_scope(0):
+            with pytest.raises(DeadlineExceededException):
+                await client.get("/submissions/abc")
+
+    asyncio.run(scenario())
+    assert calls == []
+
+def test_slow_get_is_hedged():
+    calls = []
+
+    async def handler(request):
+        calls.append(request.method)
+        # The first attempt hangs; the hedge answers straight away
+        if len(calls) == 1:
+            await asyncio.sleep(5)
+        return httpx.Response(200, json={"attempt": len(calls)})
+
+    async def scenario():
+        client = make_client(handler)
+        for _ in range(client.get_latency.min_samples):
+            client.get_latency.record(0.01)
+        return await asyncio.wait_for(client.get("/submissions/abc"), timeout=1)
+
+    assert asyncio.run(scenario()) == {"attempt": 2}
+    assert len(calls) == 2
+
+def test_timeout_maps_to_client_exception():
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        raise httpx.ReadTimeout("read timed out", request=request)
+
+    async def scenario():
+        client = make_client(handler, get_retries=1)
+        with pytest.raises(Judge0ClientException, match="timed out") as error:
+            await client.get("/submissions/abc")
+        return error.value
+
+    error = asyncio.run(scenario())
+    assert error.status_code is None
+    # Timeouts are transient, so the GET was retried once
+    assert calls == ["GET", "GET"]
+
+def test_connection_error_maps_to_client_exception():
+    def handler(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    async def scenario():
+        client = make_client(handler, get_retries=0)
+        with pytest.raises(Judge0ClientException, match="connection refused") as error:
+            await client.post("/submissions/batch", {"submissions": []})
+        return error.value
+
+    error = asyncio.run(scenario())
+    assert error.status_code is None
+    assert not isinstance(error, CircuitOpenException)
+
+def test_non_2xx_maps_to_client_exception_with_status():
+    def handler(request):
+        return httpx.Response(422, text="language_id is invalid")
+
+    async def scenario():
+        client = make_client(handler)
+        with pytest.raises(Judge0ClientException, match="language_id is invalid") as error:
+            await client.post("/submissions/batch", {"submissions": []})
+        return error.value
+
+    assert asyncio.run(scenario()).status_code == 422
+
+def test_calls_share_one_async_client(monkeypatch):
+    created = []
+    real_async_client = httpx.AsyncClient
+
+    def tracking_async_client(**kwargs):
+        client = real_async_client(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, json=[])), **kwargs
+        )
+        created.append(client)
+        return client
+
+    monkeypatch.setattr(httpx, "AsyncClient", tracking_async_client)
+
+    async def scenario():
+        client = Judge0Client("https://judge0.test", {"x-rapidapi-key": "key"}, hedge_gets=False)
+        await asyncio.gather(*(client.get("/submissions/batch") for _ in range(5)))
+        await client.post("/submissions/batch", {"submissions": []})
+        assert len(created) == 1
+        assert not created[0].is_closed
+        await client.aclose()
+
+    asyncio.run(scenario())
+    assert created[0].is_closed
+    assert created[0].headers["x-rapidapi-key"] == "key"
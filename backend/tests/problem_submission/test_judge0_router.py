@@ -0,0 +1,129 @@
+import os
+import sys
+import asyncio
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from main.problem_submission.judge0_client import Judge0ClientException
+from main.problem_submission.judge0_router import (
+    Judge0Backend, Judge0Router, close_judge0_router, get_judge0_router
+)
+
+class FakeClient:
+    """Stands in for Judge0Client; serves tokens prefixed with its name."""
+
+    def __init__(self, name, fail=False, fail_with=None):
+        self.name = name
+        self.fail = fail or fail_with is not None
+        self.fail_with = fail_with
+        self.calls = []
+        self.created = 0
+
+    async def request(self, method, path, params=None, payload=None, timeout=None):
+        self.calls.append((method, path, dict(params or {})))
+        if self.fail:
+            raise Judge0ClientException("boom", status_code=self.fail_with)
+        if method == "POST":
+            tokens = []
+            for _ in payload["submissions"]:
+                self.created += 1
+                tokens.append({"token": f"{self.name}-{self.created}"})
+            return tokens
+        if path == "/submissions/batch":
+            return {"submissions": [
+                {"token": token, "owner": self.name} if token.startswith(self.name) else None
+                for token in params["tokens"].split(",")
+            ]}
+        token = path.rsplit("/", 1)[1]
+        if not token.startswith(self.name):
+            raise Judge0ClientException("not found", status_code=404)
+        return {"token": token, "owner": self.name}
+
+    async def aclose(self):
+        pass
+
+def submit(router, count=1):
+    payload = {"submissions": [{"source_code": "x"}] * count}
+    return asyncio.run(router.post("/submissions/batch", payload))
+
+def test_prefers_healthier_backend():
+    slow, fast = Judge0Backend("a", FakeClient("a")), Judge0Backend("b", FakeClient("b"))
+    slow.latency, fast.latency = 2.0, 0.1
+    router = Judge0Router([slow, fast])
+    assert submit(router) == [{"token": "b-1"}]
+
+def test_fails_over_on_server_error():
+    broken, healthy = Judge0Backend("a", FakeClient("a", fail_with=503)), Judge0Backend("b", FakeClient("b"))
+    router = Judge0Router([broken, healthy])
+    assert submit(router) == [{"token": "b-1"}]
+    assert broken.error_rate > 0
+    assert not broken.is_available()
+
+def test_fails_over_on_timeout_and_raises_when_all_fail():
+    timed_out, healthy = Judge0Backend("a", FakeClient("a", fail=True)), Judge0Backend("b", FakeClient("b"))
+    assert submit(Judge0Router([timed_out, healthy])) == [{"token": "b-1"}]
+
+    router = Judge0Router([
+        Judge0Backend("a", FakeClient("a", fail=True)),
+        Judge0Backend("b", FakeClient("b", fail_with=500)),
+    ])
+    with pytest.raises(Judge0ClientException):
+        submit(router)
+
+def test_client_errors_do_not_fail_over():
+    bad_request, other = Judge0Backend("a", FakeClient("a", fail_with=422)), Judge0Backend("b", FakeClient("b"))
+    router = Judge0Router([bad_request, other])
+    with pytest.raises(Judge0ClientException):
+        submit(router)
+    assert other.client.calls == []
+
+def test_skips_backend_without_quota():
+    limited, spare = Judge0Backend("a", FakeClient("a"), daily_quota=2), Judge0Backend("b", FakeClient("b"))
+    spare.latency = 5.0
+    router = Judge0Router([limited, spare])
+    assert submit(router, 2) == [{"token": "a-1"}, {"token": "a-2"}]
+    assert submit(router) == [{"token": "b-1"}]
+    assert limited.remaining_quota() == 0
+
+def test_quota_error_exhausts_backend():
+    limited, spare = Judge0Backend("a", FakeClient("a", fail_with=429), daily_quota=100), Judge0Backend("b", FakeClient("b"))
+    router = Judge0Router([limited, spare])
+    assert submit(router) == [{"token": "b-1"}]
+    assert limited.remaining_quota() == 0
+
+def test_polls_are_routed_to_token_owner():
+    a, b = Judge0Backend("a", FakeClient("a")), Judge0Backend("b", FakeClient("b"))
+    router = Judge0Router([a, b])
+    first = submit(router)[0]["token"]
+    a.latency, b.latency = 5.0, 0.1
+    second = submit(router)[0]["token"]
+    assert (first, second) == ("a-1", "b-1")
+
+    result = asyncio.run(router.get("/submissions/batch", params={"tokens": f"{second},{first}"}))
+    assert [entry["owner"] for entry in result["submissions"]] == ["b", "a"]
+
+    single = asyncio.run(router.get(f"/submissions/{first}"))
+    assert single["owner"] == "a"
+
+def test_unknown_single_token_is_looked_up_on_every_backend():
+    router = Judge0Router([Judge0Backend("a", FakeClient("a")), Judge0Backend("b", FakeClient("b"))])
+    result = asyncio.run(router.get("/submissions/b-7"))
+    assert result["owner"] == "b"
+    assert router.owner_of("b-7").name == "b"
+
+def test_router_and_its_clients_are_shared_until_closed(monkeypatch):
+    monkeypatch.setenv("JUDGE0_BASE_URL", "https://judge0.test")
+    monkeypatch.delenv("SULU_BASE_URL", raising=False)
+
+    async def scenario():
+        router = get_judge0_router()
+        assert get_judge0_router() is router
+        client = router.backends[0].client
+        await close_judge0_router()
+        assert client._client.is_closed
+        reopened = get_judge0_router()
+        assert reopened is not router
+        await close_judge0_router()
+
+    asyncio.run(scenario())
@@ -0,0 +1,91 @@
+import os
+import sys
+import base64
+import asyncio
+import threading
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from main.problem_submission.problem_registry import ProblemNotFoundException, ProblemRegistry
+from main.problem_submission.shard_planner import ShardPlanner
+from main.problem_generator.problem_repository import SQLiteProblemRepository
+
+PROBLEM = {
+    "problem_title": "Add Two Numbers",
+    "problem_statement": "Return a + b.",
+    "structure": {
+        "problem_name": "Add Two Numbers",
+        "function_name": "add_numbers",
+        "input_structure": [{"Input_Field": "int a"}, {"Input_Field": "int b"}],
+        "output_structure": {"Output_Field": "int result"},
+    },
+    "test_cases": [
+        {"input": [1, 2], "output": 3},
+        {"input": [5, 7], "output": 12},
+    ],
+}
+
+def decode(text):
+    return base64.b64decode(text).decode()
+
+def test_register_returns_stable_id():
+    registry = ProblemRegistry()
+
+    first = registry.register(dict(PROBLEM))
+    second = registry.register(dict(PROBLEM))
+
+    assert first == second
+    assert asyncio.run(registry.get(first))["problem_title"] == "Add Two Numbers"
+
+def test_plan_is_precompiled_per_shard():
+    registry = ProblemRegistry(shard_planner=ShardPlanner(mode="per_test"))
+
+    plan = asyncio.run(registry.get_plan(registry.register(PROBLEM)))
+
+    assert plan.shards == [[0], [1]]
+    assert decode(plan.runs[0].stdin) == "1\n2"
+    assert decode(plan.runs[1].expected_output) == "12"
+    assert not plan.runs[0].harness
+
+def test_single_mode_plan_uses_one_harness_run():
+    registry = ProblemRegistry(shard_planner=ShardPlanner(mode="single"))
+
+    plan = asyncio.run(registry.get_plan(registry.register(PROBLEM)))
+
+    assert plan.shards == [[0, 1]]
+    assert plan.runs[0].harness
+
+def test_unknown_problem_raises():
+    with pytest.raises(ProblemNotFoundException):
+        asyncio.run(ProblemRegistry().get_plan("missing"))
+
+def test_evicted_and_restarted_problems_load_from_the_repository(tmp_path):
+    repository = SQLiteProblemRepository(str(tmp_path / "problems.db"))
+    registry = ProblemRegistry(load=repository.get, max_entries=1)
+    problem_id = registry.register(PROBLEM)
+    repository.save(dict(PROBLEM, problem_id=problem_id))
+    registry.register(dict(PROBLEM, problem_statement="Return a - b."))
+
+    # Evicted from memory, so the plan is rebuilt from the repository's copy
+    assert asyncio.run(registry.get_plan(problem_id)).structure == PROBLEM["structure"]
+    assert asyncio.run(ProblemRegistry(load=repository.get).get_plan(problem_id)).structure == PROBLEM["structure"]
+    with pytest.raises(ProblemNotFoundException):
+        asyncio.run(registry.get_plan("missing"))
+    repository.close()
+
+def test_loading_runs_off_the_event_loop_thread():
+    load_threads = []
+
+    def load(problem_id):
+        load_threads.append(threading.current_thread())
+        return PROBLEM
+
+    registry = ProblemRegistry(load=load)
+    problem_id = ProblemRegistry.problem_id_for(PROBLEM)
+
+    assert asyncio.run(registry.get_plan(problem_id)).structure == PROBLEM["structure"]
+    assert asyncio.run(registry.get_plan(problem_id)).structure == PROBLEM["structure"]
+    # Loaded once, in a worker thread; the second lookup was served from memory
+    assert len(load_threads) == 1
+    assert load_threads[0] is not threading.main_thread()
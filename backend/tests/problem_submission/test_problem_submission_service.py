@@ -0,0 +1,254 @@
+import os
+import sys
+import base64
+import asyncio
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from main.problem_submission.judge0_client import Judge0ClientException
+from main.problem_submission.problem_submission_service import STATUS_FIELDS, ProblemSubmissionService
+from main.problem_submission.problem_registry import ProblemRegistry
+from main.problem_submission.submission_cache import SubmissionCache
+from main.problem_submission.verdict_store import VerdictStore
+from main.problem_submission.verdict_broadcaster import VerdictBroadcaster
+from main.submission_generator.python_submission_generator import PythonSubmissionGenerator
+from main.shared.debug_capture import DebugCapture
+
+STRUCTURE = {
+    "problem_name": "Add Two Numbers",
+    "function_name": "add_numbers",
+    "input_structure": [{"Input_Field": "int a"}, {"Input_Field": "int b"}],
+    "output_structure": {"Output_Field": "int result"},
+}
+TEST_CASES = [
+    {"input": [1, 2], "output": 3},
+    {"input": [5, 7], "output": 12},
+]
+PYTHON_SOURCE = "def add_numbers(a, b):\n    return a + b\n"
+JAVA_SOURCE = "public int addNumbers(int a, int b) { return a + b }"
+
+def encode(text):
+    return base64.b64encode(text.encode()).decode()
+
+def decode(text):
+    return base64.b64decode(text).decode()
+
+class FakeJudge0Client:
+    """Records every call and answers it with handler(method, path, params, payload)."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.calls = []
+
+    async def get(self, path, params=None, timeout=None):
+        self.calls.append(("GET", path, params, None))
+        return await self.handler("GET", path, params, None)
+
+    async def post(self, path, payload, params=None, timeout=None):
+        self.calls.append(("POST", path, params, payload))
+        return await self.handler("POST", path, params, payload)
+
+ACCEPTED = {"id": 3, "description": "Accepted"}
+
+async def batch_tokens(method, path, params, payload):
+    return [{"token": f"token-{i}"} for i in range(len(payload["submissions"]))]
+
+def accepted(token):
+    return {"token": token, "status": ACCEPTED, "stdout": encode("3")}
+
+@pytest.fixture
+def make_service(monkeypatch):
+    for name, value in {
+        "JUDGE0_BASE_URL": "https://judge0.example",
+        "JUDGE0_RAPIDAPI_KEY": "key",
+        "JUDGE0_RAPIDAPI_HOST": "judge0.example",
+        "SULU_BASE_URL": "https://sulu.example",
+        "SULU_API_KEY": "key",
+    }.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.delenv("EXECUTION_BACKEND", raising=False)
+    monkeypatch.delenv("JUDGE0_CALLBACK_URL", raising=False)
+    monkeypatch.delenv("JUDGE0_PREFLIGHT", raising=False)
+
+    def make(handler=batch_tokens, **kwargs):
+        verdict_store = kwargs.pop("verdict_store", None) or VerdictStore()
+        return ProblemSubmissionService(
+            judge0_client=FakeJudge0Client(handler),
+            verdict_store=verdict_store,
+            verdict_broadcaster=VerdictBroadcaster(verdict_store, poll_interval=0.01),
+            submission_cache=SubmissionCache(),
+            debug_capture=DebugCapture(sample_rate=0.0),
+            problem_registry=ProblemRegistry(),
+            **kwargs
+        )
+
+    return make
+
+def test_frontend_python_language_id_uses_python_generator(make_service):
+    service = make_service()
+
+    tokens = asyncio.run(service.submit_code(28, PYTHON_SOURCE, None, STRUCTURE, TEST_CASES, shard_mode="single"))
+
+    assert tokens == [{"token": "token-0:0"}, {"token": "token-0:1"}]
+    (method, path, params, payload), = service.judge0_client.calls
+    submission, = payload["submissions"]
+    assert submission["language_id"] == 28
+    expected = PythonSubmissionGenerator().generate_submission(PYTHON_SOURCE, STRUCTURE, harness=True)
+    assert decode(submission["source_code"]) == expected
+
+class BatchStatusSource:
+    """Answers batch GETs with Accepted, tracking overlap; tokens in failing raise instead."""
+
+    def __init__(self, failing=(), delay=0.01):
+        self.failing = set(failing)
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, method, path, params, payload):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        tokens = params["tokens"].split(",")
+        failed = self.failing.intersection(tokens)
+        if failed:
+            raise Judge0ClientException(f"Judge0 lost {', '.join(sorted(failed))}", status_code=500)
+        return {"submissions": [accepted(token) for token in tokens]}
+
+def test_status_lookups_respect_the_concurrency_cap(make_service):
+    source = BatchStatusSource()
+    service = make_service(source)
+    service.batch_size = 1
+    tokens = [f"token-{i}" for i in range(8)]
+
+    status = asyncio.run(service.get_submissions_status(tokens, max_concurrency=3))
+
+    assert status["completed"] and status["passed"]
+    assert len(service.judge0_client.calls) == 8
+    assert source.max_in_flight == 3
+
+def test_one_failed_token_does_not_affect_the_others(make_service):
+    service = make_service(BatchStatusSource(failing={"token-2"}))
+    service.batch_size = 1
+    tokens = [f"token-{i}" for i in range(4)]
+
+    status = asyncio.run(service.get_submissions_status(tokens))
+
+    results = status["results"]
+    assert "Judge0 lost token-2" in results[2]["error"]
+    assert not results[2]["passed"]
+    assert [result["passed"] for i, result in enumerate(results) if i != 2] == [True] * 3
+    assert all(results[i]["stdout"] == "3" for i in (0, 1, 3))
+    assert not status["passed"]
+    # Only the healthy verdicts were stored, so the failed token is fetched again next time
+    assert service.verdict_store.get("token-2") is None
+    assert service.verdict_store.get("token-0")["status"] == ACCEPTED
+
+def test_batch_lookup_chunks_tokens_and_requests_only_status_fields(make_service):
+    service = make_service(BatchStatusSource())
+    service.batch_size = 20
+    tokens = [f"token-{i}" for i in range(45)]
+
+    results = asyncio.run(service.get_submissions_batch(tokens + tokens[:5]))
+
+    requested = [params["tokens"].split(",") for _, _, params, _ in service.judge0_client.calls]
+    assert [len(chunk) for chunk in requested] == [20, 20, 5]
+    assert [token for chunk in requested for token in chunk] == tokens
+    for method, path, params, _ in service.judge0_client.calls:
+        assert (method, path) == ("GET", "/submissions/batch")
+        assert params["fields"] == STATUS_FIELDS
+        assert "source_code" not in params["fields"].split(",")
+        assert params["base64_encoded"] == "true"
+    assert set(results) == set(tokens)
+    assert results["token-44"]["stdout"] == "3"
+
+def test_tokens_missing_from_the_batch_response_are_errors(make_service):
+    async def partial_batch(method, path, params, payload):
+        # Judge0 answers null for tokens it doesn't know and may drop others entirely
+        return {"submissions": [accepted("token-0"), None]}
+
+    service = make_service(partial_batch)
+
+    results = asyncio.run(service.get_submissions_batch(["token-0", "token-1", "token-2"]))
+
+    assert results["token-0"]["status"] == ACCEPTED
+    for token in ("token-1", "token-2"):
+        assert isinstance(results[token], Exception)
+        assert f"Submission {token} not found" in str(results[token])
+
+class ScriptedStatusSource:
+    """Answers batch GETs with Processing for the first `pending_rounds` lookups, then Accepted."""
+
+    def __init__(self, pending_rounds):
+        self.pending_rounds = pending_rounds
+
+    async def __call__(self, method, path, params, payload):
+        tokens = params["tokens"].split(",")
+        if self.pending_rounds > 0:
+            self.pending_rounds -= 1
+            return {"submissions": [
+                {"token": token, "status": {"id": 2, "description": "Processing"}} for token in tokens
+            ]}
+        return {"submissions": [accepted(token) for token in tokens]}
+
+def test_stream_closes_once_every_verdict_is_terminal(make_service):
+    service = make_service(ScriptedStatusSource(pending_rounds=1))
+
+    async def scenario():
+        events = [event async for event in service.stream_submissions_status(["token-0", "token-1:0", "token-1:1"])]
+        # The shared poller winds down once the stream has unsubscribed
+        await asyncio.wait_for(service.verdict_broadcaster._poller, timeout=1)
+        return events
+
+    events = asyncio.run(scenario())
+
+    assert [event for event, _ in events if event != "heartbeat"] == ["result"] * 3 + ["done"]
+    done = events[-1][1]
+    assert done["completed"] and len(done["results"]) == 3
+    assert [result["test_case_index"] for result in done["results"]] == [0, 1, 2]
+    assert service.verdict_broadcaster._watchers == {}
+
+def test_disconnected_stream_unsubscribes(make_service):
+    service = make_service(ScriptedStatusSource(pending_rounds=1000))
+    service.stream_heartbeat = 0.01
+
+    async def scenario():
+        stream = service.stream_submissions_status(["token-0"])
+        assert await stream.__anext__() == ("heartbeat", None)
+        assert list(service.verdict_broadcaster._watchers) == ["token-0"]
+        # Starlette closes the generator when the client goes away
+        await stream.aclose()
+        assert service.verdict_broadcaster._watchers == {}
+        await asyncio.wait_for(service.verdict_broadcaster._poller, timeout=1)
+
+    asyncio.run(scenario())
+
+def test_compile_error_in_preflight_skips_the_other_runs(make_service):
+    async def compile_error(method, path, params, payload):
+        assert (method, path, params["wait"]) == ("POST", "/submissions", "true")
+        return {
+            "token": "preflight",
+            "status": {"id": 6, "description": "Compilation Error"},
+            "compile_output": encode("Main.java:3: error: ';' expected"),
+        }
+
+    service = make_service(compile_error)
+    test_cases = TEST_CASES + [{"input": [2, 2], "output": 4}]
+
+    tokens = asyncio.run(service.submit_code(91, JAVA_SOURCE, None, STRUCTURE, test_cases, shard_mode="per_test"))
+
+    # One preflight run; the other two shards are never submitted
+    assert len(service.judge0_client.calls) == 1
+    assert len(tokens) == 3
+    for entry in tokens:
+        assert entry["token"] == "preflight"
+        assert entry["status"]["id"] == 6
+        assert entry["compile_output"] == "Main.java:3: error: ';' expected"
+    assert service.verdict_store.get("preflight")["status"]["id"] == 6
+    status = asyncio.run(service.get_submissions_status([entry["token"] for entry in tokens]))
+    assert [result["status"]["id"] for result in status["results"]] == [6, 6, 6]
+    assert len(service.judge0_client.calls) == 1
@@ -0,0 +1,58 @@
+import os
+import sys
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from main.problem_submission.shard_planner import ShardPlanner
+
+def make_cases(*input_sizes):
+    return [{"input": "x" * size, "expected_output": "1"} for size in input_sizes]
+
+def flatten(shards):
+    return [i for shard in shards for i in shard]
+
+def test_per_test_mode():
+    planner = ShardPlanner(mode="per_test")
+    assert planner.plan(make_cases(1, 1, 1)) == [[0], [1], [2]]
+
+def test_single_mode():
+    planner = ShardPlanner(mode="single")
+    assert planner.plan(make_cases(1, 1, 1)) == [[0, 1, 2]]
+
+def test_mode_override():
+    planner = ShardPlanner(mode="single")
+    assert planner.plan(make_cases(1, 1), mode="per_test") == [[0], [1]]
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        ShardPlanner(mode="bogus")
+    with pytest.raises(ValueError):
+        ShardPlanner().plan(make_cases(1), mode="bogus")
+
+def test_empty_cases():
+    assert ShardPlanner().plan([]) == []
+
+def test_auto_packs_cheap_cases_together():
+    planner = ShardPlanner(mode="auto")
+    assert planner.plan(make_cases(10, 10, 10, 10)) == [[0, 1, 2, 3]]
+
+def test_auto_isolates_expensive_cases():
+    planner = ShardPlanner(mode="auto", time_limit=5.0)
+    # 1MB of input is estimated at ~2s, well over half the per-shard budget
+    shards = planner.plan(make_cases(10, 1_000_000, 10, 10))
+    assert [1] in shards
+    assert sorted(flatten(shards)) == [0, 1, 2, 3]
+
+def test_auto_splits_when_budget_exceeded():
+    planner = ShardPlanner(mode="auto", time_limit=1.0, case_seconds=0.02)
+    # Budget per shard is 1.0 * 0.5 - 0.5 -> clamped to one case's cost
+    shards = planner.plan(make_cases(*([1] * 10)))
+    assert len(shards) > 1
+    assert flatten(shards) == list(range(10))
+
+def test_auto_respects_max_shards():
+    planner = ShardPlanner(mode="auto", time_limit=1.0, max_shards=3)
+    shards = planner.plan(make_cases(*([500_000] * 10)))
+    assert len(shards) <= 3
+    assert sorted(flatten(shards)) == list(range(10))
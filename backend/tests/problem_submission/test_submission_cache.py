@@ -0,0 +1,83 @@
+import os
+import sys
+import asyncio
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from main.problem_submission.submission_cache import SubmissionCache
+
+STRUCTURE = {"function_name": "add_numbers", "input_structure": [], "output_structure": {}}
+TEST_CASES = [{"input": [1, 2], "output": 3}]
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_key_ignores_whitespace_differences():
+    key = SubmissionCache.key_for(91, "int f() {\n  return 1;\n}\n", STRUCTURE, TEST_CASES)
+    assert key == SubmissionCache.key_for(91, "int f() {  \r\n  return 1;\r\n}", STRUCTURE, TEST_CASES)
+    assert key != SubmissionCache.key_for(91, "int f() {\n  return 2;\n}\n", STRUCTURE, TEST_CASES)
+    assert key != SubmissionCache.key_for(62, "int f() {\n  return 1;\n}\n", STRUCTURE, TEST_CASES)
+
+def test_key_accepts_structure_as_json_string():
+    import json
+    assert SubmissionCache.key_for(91, "x", STRUCTURE, TEST_CASES) == \
+        SubmissionCache.key_for(91, "x", json.dumps(STRUCTURE), TEST_CASES)
+
+def test_lru_bound():
+    cache = SubmissionCache(max_entries=2)
+    cache.put("a", [{"token": "1"}])
+    cache.put("b", [{"token": "2"}])
+    cache.get("a")
+    cache.put("c", [{"token": "3"}])
+    assert cache.get("b") is None
+    assert cache.get("a") == [{"token": "1"}]
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = SubmissionCache(ttl_seconds=10, clock=clock)
+    cache.put("a", [{"token": "1"}])
+    clock.now = 5
+    assert cache.get("a") == [{"token": "1"}]
+    clock.now = 11
+    assert cache.get("a") is None
+
+def test_get_returns_copies():
+    cache = SubmissionCache()
+    cache.put("a", [{"token": "1"}])
+    cache.get("a")[0]["token"] = "changed"
+    assert cache.get("a") == [{"token": "1"}]
+
+def test_concurrent_identical_submits_are_coalesced():
+    cache = SubmissionCache()
+    calls = []
+
+    async def submit():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return [{"token": "t1"}, {"token": "t2"}]
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_submit("k", submit) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(result == [{"token": "t1"}, {"token": "t2"}] for result in results)
+    assert cache.get("k") == [{"token": "t1"}, {"token": "t2"}]
+
+def test_failures_are_not_cached():
+    cache = SubmissionCache()
+
+    async def fail():
+        raise RuntimeError("judge0 down")
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await cache.get_or_submit("k", fail)
+
+    asyncio.run(run())
+    assert cache.get("k") is None
@@ -0,0 +1,102 @@
+import os
+import sys
+import asyncio
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from main.problem_submission.judge0_router import Judge0Backend, Judge0Router
+from main.problem_submission.submission_scheduler import (
+    SchedulerSaturatedException, SubmissionScheduler, TokenBucket
+)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_scheduler(rate=1.0, capacity=1, **kwargs):
+    router = Judge0Router([Judge0Backend("rapidapi", client=None)])
+    return SubmissionScheduler(router, {"rapidapi": TokenBucket(rate, capacity)}, **kwargs)
+
+def test_token_bucket_refills_at_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, capacity=4, clock=clock)
+
+    assert bucket.consume(4)
+    assert not bucket.consume(1)
+    assert bucket.delay(2) == pytest.approx(1.0)
+    clock.now = 1.0
+    assert bucket.consume(2)
+
+def test_token_bucket_caps_cost_at_capacity():
+    bucket = TokenBucket(rate=1.0, capacity=2, clock=FakeClock())
+
+    # A batch larger than the burst still goes through once the bucket is full
+    assert bucket.consume(10)
+    assert bucket.tokens == 0
+
+def test_acquire_fast_path_returns_backend():
+    scheduler = make_scheduler(capacity=5)
+
+    assert asyncio.run(scheduler.acquire("alice", 3)) == "rapidapi"
+    assert scheduler.queued == 0
+
+def test_rejects_when_user_has_too_many_waiting():
+    async def scenario():
+        scheduler = make_scheduler(rate=5.0, capacity=1, max_queue_per_user=1)
+        await scheduler.acquire("alice")
+        first = asyncio.create_task(scheduler.acquire("alice"))
+        await asyncio.sleep(0)
+        with pytest.raises(SchedulerSaturatedException) as error:
+            await scheduler.acquire("alice")
+        await first
+        return error.value
+
+    error = asyncio.run(scenario())
+    assert error.queue_position == 2
+    assert error.eta_seconds > 0
+
+def test_rejects_when_expected_wait_is_too_long():
+    async def scenario():
+        scheduler = make_scheduler(rate=0.1, capacity=1, max_wait_seconds=5)
+        await scheduler.acquire("alice")
+        with pytest.raises(SchedulerSaturatedException) as error:
+            await scheduler.acquire("bob")
+        return error.value
+
+    error = asyncio.run(scenario())
+    assert error.queue_position == 1
+    assert error.eta_seconds == pytest.approx(10.0, abs=0.5)
+
+def test_queue_is_served_round_robin_across_users():
+    async def scenario():
+        scheduler = make_scheduler(rate=100.0, capacity=1)
+        await scheduler.acquire("alice")
+        served = []
+
+        async def submit(user):
+            await scheduler.acquire(user)
+            served.append(user)
+
+        tasks = [asyncio.create_task(submit(user)) for user in ("alice", "alice", "alice", "bob")]
+        await asyncio.gather(*tasks)
+        return served
+
+    served = asyncio.run(scenario())
+    # bob queued last but is served before alice's remaining submissions
+    assert served.index("bob") <= 1
+
+def test_aclose_fails_waiters():
+    async def scenario():
+        scheduler = make_scheduler(rate=0.5, capacity=1)
+        await scheduler.acquire("alice")
+        waiting = asyncio.create_task(scheduler.acquire("bob"))
+        await asyncio.sleep(0)
+        await scheduler.aclose()
+        with pytest.raises(SchedulerSaturatedException):
+            await waiting
+
+    asyncio.run(scenario())
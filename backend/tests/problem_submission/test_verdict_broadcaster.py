@@ -0,0 +1,70 @@
+import os
+import sys
+import asyncio
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from main.problem_submission.verdict_broadcaster import VerdictBroadcaster
+from main.problem_submission.verdict_store import VerdictStore
+
+PROCESSING = {"status": {"id": 2, "description": "Processing"}}
+ACCEPTED = {"status": {"id": 3, "description": "Accepted"}, "stdout": "3"}
+
+class FakeStatusSource:
+    """Stands in for get_submissions_batch: each token reports its scripted verdicts in turn, then the last one."""
+
+    def __init__(self, script):
+        self.script = {token: list(verdicts) for token, verdicts in script.items()}
+        self.calls = []
+
+    async def __call__(self, tokens):
+        self.calls.append(sorted(tokens))
+        return {
+            token: self.script[token].pop(0) if len(self.script[token]) > 1 else self.script[token][0]
+            for token in tokens
+        }
+
+async def receive_until_done(queue, tokens):
+    """Collect (token, verdict) deliveries until every token has a terminal verdict."""
+    verdicts = {}
+    while set(verdicts) != set(tokens):
+        token, verdict = await asyncio.wait_for(queue.get(), timeout=1)
+        if VerdictStore.is_terminal(verdict):
+            verdicts[token] = verdict
+    return verdicts
+
+def test_one_poller_serves_every_subscriber():
+    async def scenario():
+        broadcaster = VerdictBroadcaster(VerdictStore(), poll_interval=0.01)
+        source = FakeStatusSource({"a": [PROCESSING, ACCEPTED], "b": [ACCEPTED]})
+        first = broadcaster.subscribe(["a", "b"])
+        second = broadcaster.subscribe(["a"])
+        broadcaster.ensure_poller(source)
+        poller = broadcaster._poller
+        broadcaster.ensure_poller(source)
+        assert broadcaster._poller is poller
+
+        assert await receive_until_done(first, ["a", "b"]) == {"a": ACCEPTED, "b": ACCEPTED}
+        assert await receive_until_done(second, ["a"]) == {"a": ACCEPTED}
+
+        broadcaster.unsubscribe(first)
+        broadcaster.unsubscribe(second)
+        # With nobody watching, the poller stops on its own
+        await asyncio.wait_for(poller, timeout=1)
+        return source.calls
+
+    # One fetch per round for the union of watched tokens; settled tokens are not asked again
+    assert asyncio.run(scenario()) == [["a", "b"], ["a"]]
+
+def test_unsubscribed_queue_gets_no_more_verdicts():
+    broadcaster = VerdictBroadcaster(VerdictStore())
+    leaving = broadcaster.subscribe(["a", "b"])
+    staying = broadcaster.subscribe(["a"])
+
+    broadcaster.unsubscribe(leaving)
+    broadcaster.publish("a", ACCEPTED)
+    broadcaster.publish("b", ACCEPTED)
+
+    assert leaving.empty()
+    assert staying.get_nowait() == ("a", ACCEPTED)
+    assert list(broadcaster._watchers) == ["a"]
@@ -0,0 +1,72 @@
+import os
+import sys
+import pytest
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from main.problem_submission.verdict_store import VerdictStore
+
+ACCEPTED = {"status": {"id": 3, "description": "Accepted"}, "stdout": "2"}
+PROCESSING = {"status": {"id": 2, "description": "Processing"}}
+
+@pytest.fixture
+def store():
+    return VerdictStore()
+
+def test_is_terminal():
+    assert VerdictStore.is_terminal(ACCEPTED)
+    assert VerdictStore.is_terminal({"status": {"id": 6, "description": "Compilation Error"}})
+    assert not VerdictStore.is_terminal(PROCESSING)
+    assert not VerdictStore.is_terminal({"status": {"id": 1}})
+    assert not VerdictStore.is_terminal(None)
+    assert not VerdictStore.is_terminal({})
+
+def test_put_and_get(store):
+    assert store.put("t1", ACCEPTED)
+    assert store.get("t1") == ACCEPTED
+    assert store.get("unknown") is None
+
+def test_non_terminal_verdicts_are_ignored(store):
+    assert not store.put("t1", PROCESSING)
+    assert store.get("t1") is None
+
+def test_get_many_skips_unknown_tokens(store):
+    store.put("t1", ACCEPTED)
+    store.put("t2", ACCEPTED)
+    assert store.get_many(["t1", "t3", "t2"]) == {"t1": ACCEPTED, "t2": ACCEPTED}
+
+def test_lru_eviction():
+    store = VerdictStore(max_entries=2)
+    store.put("t1", ACCEPTED)
+    store.put("t2", ACCEPTED)
+    store.get("t1")  # t1 becomes most recently used
+    store.put("t3", ACCEPTED)
+    assert store.get("t2") is None
+    assert store.get("t1") == ACCEPTED
+    assert store.get("t3") == ACCEPTED
+
+def test_sqlite_backing_survives_restart(tmp_path):
+    db_path = str(tmp_path / "verdicts.db")
+    store = VerdictStore(db_path=db_path)
+    store.put("t1", ACCEPTED)
+    store.close()
+
+    reopened = VerdictStore(db_path=db_path)
+    assert reopened.get("t1") == ACCEPTED
+    reopened.close()
+
+def test_put_does_not_wait_for_sqlite(tmp_path):
+    db_path = str(tmp_path / "verdicts.db")
+    store = VerdictStore(db_path=db_path, max_entries=1)
+    # While the writer thread is stuck on the database, puts still return at once
+    with store._db_lock:
+        assert store.put("t1", ACCEPTED)
+        assert store.put("t2", ACCEPTED)
+        # t1 was evicted from memory before it reached the disk
+        assert store.get_many(["t1", "t2"]) == {"t1": ACCEPTED, "t2": ACCEPTED}
+    store.close()
+
+    reopened = VerdictStore(db_path=db_path)
+    assert reopened.get_many(["t1", "t2"]) == {"t1": ACCEPTED, "t2": ACCEPTED}
+    reopened.close()
@@ -0,0 +1,42 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from main.shared.debug_capture import DebugCapture
+
+def test_sampling_follows_rate():
+    assert not DebugCapture(sample_rate=0.0).should_sample()
+    assert DebugCapture(sample_rate=0.5, rng=lambda: 0.2).should_sample()
+    assert not DebugCapture(sample_rate=0.5, rng=lambda: 0.7).should_sample()
+
+def test_captures_are_named_by_content_hash(tmp_path):
+    capture = DebugCapture(directory=str(tmp_path), sample_rate=1.0)
+
+    first = capture.capture("java", "class Main {}", "java")
+    again = capture.capture("java", "class Main {}", "java")
+    other = capture.capture("java", "class Other {}", "java")
+    capture.close()
+
+    assert first == again != other
+    assert first.startswith("java-") and first.endswith(".java")
+    assert sorted(os.listdir(tmp_path)) == sorted([first, other])
+    assert (tmp_path / first).read_text() == "class Main {}"
+
+def test_ring_buffer_keeps_most_recent(tmp_path):
+    capture = DebugCapture(directory=str(tmp_path), buffer_size=2)
+
+    for i in range(5):
+        capture.capture("submission", f'{{"n": {i}}}', "json")
+    capture.close()
+
+    assert [entry["content"] for entry in capture.recent()] == ['{"n": 3}', '{"n": 4}']
+
+def test_directory_is_pruned_to_max_files(tmp_path):
+    capture = DebugCapture(directory=str(tmp_path), max_files=3)
+
+    for i in range(6):
+        capture.capture("py", f"print({i})", "py")
+    capture.close()
+
+    assert len(os.listdir(tmp_path)) <= 3
@@ -0,0 +1,63 @@
+import os
+import sys
+import json
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from main.shared.incremental_json import IncrementalJSONParser
+
+DOCUMENT = {
+    "title": "Quote \" and backslash \\ and é",
+    "values": [1, -2.5, 3e2, True, False, None],
+    "nested": {"empty": [], "inner": {"key": "value"}},
+}
+
+def feed_in_chunks(parser, text, size):
+    for i in range(0, len(text), size):
+        parser.feed(text[i:i + size])
+    return parser.close()
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+def test_parses_same_as_json_loads_for_any_chunking(size):
+    text = json.dumps(DOCUMENT, indent=2)
+    assert feed_in_chunks(IncrementalJSONParser(), text, size) == DOCUMENT
+
+def test_escaped_quote_split_across_chunks():
+    parser = IncrementalJSONParser()
+    parser.feed('{"a": "x\\')
+    parser.feed('"y"}')
+    assert parser.close() == {"a": 'x"y'}
+
+def test_values_are_reported_as_soon_as_complete():
+    events = []
+    parser = IncrementalJSONParser(lambda path, value: events.append((path, value)))
+
+    parser.feed('{"title": "Sum", "items": [1, {"k": "v"}')
+    assert events == [(("title",), "Sum"), (("items", 0), 1), (("items", 1, "k"), "v"), (("items", 1), {"k": "v"})]
+
+    parser.feed('], "n": 12')
+    # A number is only complete once something follows it
+    assert events[-1] == (("items",), [1, {"k": "v"}])
+    parser.feed("}")
+    assert events[-2:] == [(("n",), 12), ((), {"title": "Sum", "items": [1, {"k": "v"}], "n": 12})]
+
+def test_callback_exception_stops_the_parse():
+    def reject(path, value):
+        if path == ("bad",):
+            raise ValueError("rejected")
+
+    parser = IncrementalJSONParser(reject)
+    with pytest.raises(ValueError, match="rejected"):
+        parser.feed('{"ok": 1, "bad": 2, "never": ')
+
+@pytest.mark.parametrize("text", ['{"a" 1}', '{"a": tru}', '{a: 1}', '{"a": 1}}', '[1 2]'])
+def test_malformed_input_raises_when_seen(text):
+    with pytest.raises(json.JSONDecodeError):
+        IncrementalJSONParser().feed(text)
+
+def test_close_raises_on_truncated_input():
+    parser = IncrementalJSONParser()
+    parser.feed('{"a": [1, 2')
+    with pytest.raises(json.JSONDecodeError):
+        parser.close()
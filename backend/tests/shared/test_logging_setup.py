@@ -0,0 +1,48 @@
+import os
+import sys
+import logging
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from logging.handlers import QueueHandler
+
+from main.shared.logging_setup import configure_logging, log_json, log_text, stop_logging, truncate
+
+class Exploding:
+    def __str__(self):
+        raise AssertionError("rendered a payload for a record that was filtered out")
+
+def test_truncate_notes_dropped_length():
+    assert truncate("abcdef", 10) == "abcdef"
+    assert truncate("abcdef", 2) == "ab... [4 more chars]"
+
+def test_payload_renders_only_when_emitted(caplog):
+    logger = logging.getLogger("tests.lazy_payload")
+    with caplog.at_level(logging.INFO, logger="tests.lazy_payload"):
+        logger.debug("Payload: %s", log_text(Exploding()))
+        logger.info("Payload: %s", log_json({"source_code": "x" * 50}, limit=20))
+
+    assert len(caplog.records) == 1
+    assert caplog.records[0].getMessage().endswith("more chars]")
+
+def test_logging_can_be_stopped_and_configured_again(tmp_path):
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    log_file = str(tmp_path / "app.log")
+    try:
+        for cycle in range(2):
+            configure_logging(log_file)
+            logging.getLogger("tests.lifespan").warning("cycle %d", cycle)
+            stop_logging()
+            # Nothing is left queuing records that no listener will drain
+            assert not any(isinstance(handler, QueueHandler) for handler in root.handlers)
+    finally:
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(saved_level)
+
+    with open(log_file) as f:
+        lines = f.read().splitlines()
+    assert [line.rsplit(" - ", 1)[1] for line in lines] == ["cycle 0", "cycle 1"]
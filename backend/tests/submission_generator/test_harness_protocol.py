@@ -0,0 +1,70 @@
+import os
+import sys
+import pytest
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from main.submission_generator.harness_protocol import encode_cases, frame_outputs, split_output, outputs_match
+from main.submission_generator.judge0_test_case_generator import Judge0TestCaseGenerator
+
+def test_encode_cases():
+    assert encode_cases(["1|2|3\n4", "5"]) == "1|2|3\n4\n@@END_CASE@@\n5\n@@END_CASE@@\n"
+    assert encode_cases([]) == ""
+
+def test_frame_and_split_round_trip():
+    framed = frame_outputs(["2", "1 2 3"])
+    cases = split_output(framed)
+    assert cases == {
+        0: {"stdout": "2\n", "error": None},
+        1: {"stdout": "1 2 3\n", "error": None},
+    }
+
+def test_split_output_with_error_and_unfinished_case():
+    stdout = (
+        "@@CASE_START 0@@\n"
+        "debug line\n"
+        "@@CASE_ERROR 0@@ java.lang.ArithmeticException: / by zero\n"
+        "@@CASE_END 0@@\n"
+        "@@CASE_START 1@@\n"
+        "partial\n"
+    )
+    cases = split_output(stdout)
+    assert cases == {0: {"stdout": "debug line\n", "error": "java.lang.ArithmeticException: / by zero"}}
+
+def test_split_output_unescapes_multi_line_error():
+    # As printed by the harnesses: line breaks and backslashes escaped so the message stays on one line
+    stdout = (
+        "@@CASE_START 0@@\n"
+        "@@CASE_ERROR 0@@ java.lang.IllegalStateException: first line\\nsecond line\\r\\nC:\\\\tmp\\\\new\n"
+        "@@CASE_END 0@@\n"
+        "@@CASE_START 1@@\n"
+        "3\n"
+        "@@CASE_END 1@@\n"
+    )
+    cases = split_output(stdout)
+    assert cases == {
+        0: {"stdout": "", "error": "java.lang.IllegalStateException: first line\nsecond line\r\nC:\\tmp\\new"},
+        1: {"stdout": "3\n", "error": None},
+    }
+
+def test_split_output_handles_empty_stdout():
+    assert split_output(None) == {}
+    assert split_output("") == {}
+
+def test_outputs_match():
+    assert outputs_match("2\n", "2")
+    assert outputs_match("1 2 \n3\n\n", "1 2\n3")
+    assert not outputs_match("2\n", "3")
+    assert not outputs_match(None, "3")
+
+def test_judge0_harness_encoders():
+    generator = Judge0TestCaseGenerator()
+    formatted_cases = [
+        {"input": "1|2\n3", "expected_output": "4"},
+        {"input": "5|6\n7", "expected_output": "8"},
+    ]
+    assert generator.generate_harness_input(formatted_cases) == "1|2\n3\n@@END_CASE@@\n5|6\n7\n@@END_CASE@@\n"
+    expected = split_output(generator.generate_harness_expected_output(formatted_cases))
+    assert expected[0]["stdout"] == "4\n"
+    assert expected[1]["stdout"] == "8\n"
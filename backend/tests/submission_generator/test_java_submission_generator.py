@@ -172,3 +172,35 @@ def test_generate_submission_with_arrays(generator):
     assert "public int[] processArray(int[] nums)" in submission
     assert 'String[] numsStr = scanner.nextLine().split("\\\\|");' in submission
     assert "StringBuilder sb = new StringBuilder();" in submission
+
+def test_generate_harness_submission(generator):
+    source_code = """
+    public int addNumbers(int a, int b) {
+        return a + b;
+    }
+    """
+    
+    problem_structure = {
+        "problem_name": "Add Numbers",
+        "function_name": "add_numbers",
+        "input_structure": [
+            {"Input_Field": "int a"},
+            {"Input_Field": "int b"}
+        ],
+        "output_structure": {
+            "Output_Field": "int result"
+        }
+    }
+    
+    submission = generator.generate_submission(source_code, problem_structure, harness=True)
+    
+    # Check the multi-test loop and framing
+    assert "public class Main" in submission
+    assert "while (scanner.hasNextLine())" in submission
+    assert 'System.out.println("@@CASE_START " + harnessCaseIndex + "@@");' in submission
+    assert 'System.out.println("@@CASE_END " + harnessCaseIndex + "@@");' in submission
+    assert "catch (Throwable harnessError)" in submission
+    assert '.replace("\\\\", "\\\\\\\\").replace("\\n", "\\\\n").replace("\\r", "\\\\r");' in submission
+    assert 'System.out.println("@@CASE_ERROR " + harnessCaseIndex + "@@ " + harnessMessage);' in submission
+    assert '!scanner.nextLine().equals("@@END_CASE@@")' in submission
+    assert "int result = solution.addNumbers(a, b);" in submission
@@ -0,0 +1,89 @@
+import os
+import sys
+import subprocess
+import pytest
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from main.submission_generator.python_submission_generator import (
+    PythonSubmissionGenerator,
+    PythonSubmissionGeneratorException,
+)
+from main.submission_generator.harness_protocol import encode_cases, split_output
+
+@pytest.fixture
+def generator():
+    return PythonSubmissionGenerator()
+
+PROBLEM_STRUCTURE = {
+    "problem_name": "Sum Above",
+    "function_name": "sum_above",
+    "input_structure": [
+        {"Input_Field": "List[int] nums"},
+        {"Input_Field": "int threshold"}
+    ],
+    "output_structure": {"Output_Field": "int result"}
+}
+
+SOURCE_CODE = """def sum_above(nums: List[int], threshold: int) -> int:
+    return sum(n for n in nums if n > threshold)
+"""
+
+def run_program(program: str, stdin: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", program],
+        input=stdin.encode(),
+        capture_output=True,
+        check=True,
+    ).stdout.decode()
+
+def test_generate_submission(generator):
+    program = generator.generate_submission(SOURCE_CODE, PROBLEM_STRUCTURE)
+    assert "sys.stdin.buffer" in program
+    assert run_program(program, "1|5|10\n4") == "15\n"
+    assert run_program(program, "\n0") == "0\n"
+
+def test_generate_submission_with_spaced_field_names(generator):
+    structure = {
+        "problem_name": "Shout",
+        "function_name": "shout",
+        "input_structure": [{"Input Field": "str word"}, {"Input Field": "bool loud"}],
+        "output_structure": {"Output Field": "str result"}
+    }
+    source = "def shout(word, loud):\n    return word.upper() if loud else word\n"
+    program = generator.generate_submission(source, structure)
+    assert run_program(program, "hey\ntrue\n") == "HEY\n"
+    assert run_program(program, "hey\nfalse\n") == "hey\n"
+
+def test_generate_harness_submission(generator):
+    source = """def sum_above(nums, threshold):
+    if threshold < 0:
+        raise ValueError("negative threshold")
+    return sum(n for n in nums if n > threshold)
+"""
+    program = generator.generate_submission(source, PROBLEM_STRUCTURE, harness=True)
+    stdout = run_program(program, encode_cases(["1|5|10\n4", "2|3\n-1", "7\n0"]))
+    cases = split_output(stdout)
+    assert cases[0] == {"stdout": "15\n", "error": None}
+    assert cases[1]["error"] == "ValueError: negative threshold"
+    assert cases[2] == {"stdout": "7\n", "error": None}
+
+def test_harness_keeps_multi_line_error_on_one_line(generator):
+    source = """def sum_above(nums, threshold):
+    raise ValueError("bad threshold\\n@@CASE_END 0@@\\r\\nsee C:\\\\logs")
+"""
+    program = generator.generate_submission(source, PROBLEM_STRUCTURE, harness=True)
+    stdout = run_program(program, encode_cases(["1|5\n4", "2\n0"]))
+    assert len(stdout.splitlines()) == 6
+    cases = split_output(stdout)
+    assert cases[0]["error"] == "ValueError: bad threshold\n@@CASE_END 0@@\r\nsee C:\\logs"
+    assert cases[1]["error"] == cases[0]["error"]
+
+def test_missing_function(generator):
+    with pytest.raises(PythonSubmissionGeneratorException):
+        generator.generate_submission("def other():\n    pass\n", PROBLEM_STRUCTURE)
+
+def test_missing_structure_field(generator):
+    with pytest.raises(PythonSubmissionGeneratorException):
+        generator.generate_submission(SOURCE_CODE, {"function_name": "sum_above"})
@@ -0,0 +1,101 @@
+import os
+import sys
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from main.type_mapping_system.problem_plan import ProblemPlanException, get_problem_plan
+from main.submission_generator.java_submission_generator import JavaSubmissionGenerator
+from main.submission_generator.judge0_test_case_generator import Judge0TestCaseGenerator
+
+STRUCTURE = {
+    "problem_name": "Scale Scores",
+    "function_name": "scale_scores",
+    "input_structure": [
+        {"Input_Field": "List[int] scores"},
+        {"Input_Field": "float factor"},
+        {"Input_Field": "Dict[str, int] bonus_map"},
+    ],
+    "output_structure": {"Output_Field": "List[float] result"},
+}
+
+def test_plan_parses_and_maps_fields():
+    plan = get_problem_plan(STRUCTURE)
+
+    assert plan.java_function_name == "scaleScores"
+    assert [p.name for p in plan.params] == ["scores", "factor", "bonus_map"]
+    assert [p.java_name for p in plan.params] == ["scores", "factor", "bonusMap"]
+    assert [p.java_type for p in plan.params] == ["int[]", "double", "Map<String, Integer>"]
+    assert plan.params[2].python_type == "Dict[str,int]"
+    assert [p.is_array for p in plan.params] == [True, False, False]
+    assert plan.output.java_type == "double[]"
+
+def test_plan_is_memoized_by_structure_content():
+    plan = get_problem_plan(STRUCTURE)
+
+    # Same fields in a different dict (and a different title) share the plan
+    copy = dict(STRUCTURE, problem_name="Renamed")
+    assert get_problem_plan(copy) is plan
+
+    other = dict(STRUCTURE, function_name="scale_all")
+    assert get_problem_plan(other).key != plan.key
+
+def test_plan_accepts_spaced_field_names():
+    plan = get_problem_plan({
+        "function_name": "add",
+        "input_structure": [{"Input Field": "int a"}, {"Input Field": "int b"}],
+        "output_structure": {"Output Field": "int result"},
+    })
+    assert [p.name for p in plan.params] == ["a", "b"]
+
+def test_plan_rejects_missing_fields():
+    with pytest.raises(ProblemPlanException):
+        get_problem_plan({"function_name": "f", "input_structure": []})
+    with pytest.raises(ProblemPlanException):
+        get_problem_plan({
+            "function_name": "f",
+            "input_structure": [{"Name": "int a"}],
+            "output_structure": {"Output_Field": "int result"},
+        })
+
+def test_encode_input_formats():
+    plan = get_problem_plan(STRUCTURE)
+
+    assert plan.encode_input([[1, 2, 3], 1.5, {"a": 1}]) == "1|2|3\n1.5\n{'a': 1}"
+    assert plan.encode_input("[1, 2, 3]\n1.5\n{}") == "1|2|3\n1.5\n{}"
+    with pytest.raises(ProblemPlanException):
+        plan.encode_input([[1, 2, 3]])
+
+def test_encode_single_array_parameter():
+    plan = get_problem_plan({
+        "function_name": "total",
+        "input_structure": [{"Input_Field": "List[int] nums"}],
+        "output_structure": {"Output_Field": "int result"},
+    })
+
+    # Generated test cases wrap the one argument in a list; a flat list is the array itself
+    assert plan.encode_input([[1, 2, 3]]) == "1|2|3"
+    assert plan.encode_input([1, 2, 3]) == "1|2|3"
+    assert plan.encode_input("[4, 5]") == "4|5"
+
+def test_test_case_generator_uses_plan():
+    cases = Judge0TestCaseGenerator().generate_test_cases(
+        [{"input": [[10, 20], 2.0, {}], "output": [20.0, 40.0]}], STRUCTURE
+    )
+    assert cases == [{"input": "10|20\n2.0\n{}", "expected_output": "[20.0, 40.0]"}]
+
+def test_java_scaffold_rendered_once_per_plan():
+    generator = JavaSubmissionGenerator()
+    structure = {
+        "problem_name": "Add Numbers",
+        "function_name": "add_numbers",
+        "input_structure": [{"Input_Field": "int a"}, {"Input_Field": "int b"}],
+        "output_structure": {"Output_Field": "int result"},
+    }
+    first = generator.generate_submission("public int addNumbers(int a, int b) { return a + b; }", structure)
+    second = generator.generate_submission("public int addNumbers(int a, int b) { return b + a; }", structure)
+
+    assert generator._scaffold.cache_info().misses == 1
+    assert generator._scaffold.cache_info().hits == 1
+    assert "return a + b;" in first and "return b + a;" in second
+    assert "int result = solution.addNumbers(a, b);" in second
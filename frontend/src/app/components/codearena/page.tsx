@@ -5,7 +5,7 @@ import { ProblemDescription } from "@/app/components/codearena/problem-descripti
 import { CodeEditor } from "@/app/components/codearena/code-editor"
 import { submitCode } from "@/lib/submission_api"
 import { pollSubmission } from "@/lib/fetch_submission_api"
-import { generateProblem } from "@/lib/get_problem_api"
+import { streamProblem } from "@/lib/get_problem_api"
 import { getCachedProblem, setCachedProblem, clearProblemCache } from "@/lib/problem-cache"
 import { Panel, PanelGroup, PanelResizeHandle } from "react-resizable-panels"
 import { Loader2, ArrowLeft, GripHorizontal, Play, Moon, Sun, Copy, Check } from "lucide-react"
@@ -77,6 +77,7 @@ export default function CodeArena({ category, onBack }: CodeArenaProps) {
     pythonBoilerplate: string;
     tags?: string[];
     concept?: string;
+    problemId?: string | null;
   }>({
     title: "",
     difficulty: "Medium",
@@ -157,7 +158,8 @@ export default function CodeArena({ category, onBack }: CodeArenaProps) {
           javaBoilerplate: cachedProblem.java_boilerplate,
           pythonBoilerplate: cachedProblem.python_boilerplate,
           tags: cachedProblem.tags,
-          concept: cachedProblem.concept
+          concept: cachedProblem.concept,
+          problemId: cachedProblem.problem_id
         };
         
         setProblem(newProblem);
@@ -167,7 +169,23 @@ export default function CodeArena({ category, onBack }: CodeArenaProps) {
       } else {
         console.log('No cache found, fetching from API');
         setIsGenerating(true);
-        const apiProblem = await generateProblem(concept, complexity);
+        setProblem(prev => ({ ...prev, title: "", description: "", tags: [] }));
+        // Show the title and statement as soon as they stream in; the rest arrives with the full problem
+        let streamedBoilerplate = "";
+        const apiProblem = await streamProblem(concept, complexity, (partial) => {
+          setLoading(false);
+          setProblem(prev => ({
+            ...prev,
+            title: partial.problem_title ?? "",
+            description: partial.problem_statement ?? "",
+            tags: partial.tags ?? [],
+          }));
+          const boilerplate = (language === "91" ? partial.java_boilerplate : partial.python_boilerplate) ?? "";
+          if (boilerplate !== streamedBoilerplate) {
+            streamedBoilerplate = boilerplate;
+            setCode(boilerplate);
+          }
+        });
         
         const newProblem = {
           title: apiProblem.problem_title,
@@ -178,7 +196,8 @@ export default function CodeArena({ category, onBack }: CodeArenaProps) {
           javaBoilerplate: apiProblem.java_boilerplate,
           pythonBoilerplate: apiProblem.python_boilerplate,
           tags: apiProblem.tags,
-          concept: apiProblem.concept
+          concept: apiProblem.concept,
+          problemId: apiProblem.problem_id
         };
         
         setProblem(newProblem);
@@ -233,11 +252,22 @@ export default function CodeArena({ category, onBack }: CodeArenaProps) {
         code,
         language,
         JSON.stringify(problem.structure),
-        problem.testCases || []
+        problem.testCases || [],
+        problem.problemId
       );
 
-      // 2. Poll for results with concept and difficulty
-      const result = await pollSubmission(tokens.map(t => t.token), category, problem.difficulty);
+      // 2. Wait for results (streamed per test case, polling as fallback)
+      const result = await pollSubmission(
+        tokens.map(t => t.token),
+        category,
+        problem.difficulty,
+        (partialResults) => setTestResults({
+          submitted: true,
+          completed: false,
+          passed: false,
+          results: partialResults
+        })
+      );
 
       // 3. Update the test results
       setTestResults({
@@ -289,7 +319,7 @@ export default function CodeArena({ category, onBack }: CodeArenaProps) {
   return (
     <div id="code-arena-container" className="relative flex flex-col h-[calc(100vh-73px)]">
       {/* Loading overlay */}
-      {isGenerating && (
+      {isGenerating && !problem.title && (
         <LoadingOverlay message="Loading new challenge..." />
       )}
 
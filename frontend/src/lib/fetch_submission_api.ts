@@ -14,7 +14,7 @@ export interface SubmissionStatus {
   }[];
 }
 
-interface TestCaseResult {
+export interface TestCaseResult {
   test_case_index: number;
   token: string;
   status: {
@@ -37,11 +37,60 @@ interface BatchSubmissionStatus {
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api';
 
-export async function pollSubmission(tokens: string[], concept?: string, complexity?: string): Promise<BatchSubmissionStatus> {
+/**
+ * Waits for all test case verdicts over Server-Sent Events.
+ * onResult is called with the results received so far, each time a test case finishes.
+ */
+export function streamSubmission(
+  tokens: string[],
+  onResult?: (results: TestCaseResult[]) => void
+): Promise<BatchSubmissionStatus> {
+  return new Promise((resolve, reject) => {
+    const url = `${API_BASE_URL}/problem-submission/submissions-stream?tokens=${encodeURIComponent(tokens.join(','))}`;
+    const source = new EventSource(url);
+    const results: TestCaseResult[] = [];
+
+    source.addEventListener('result', (event) => {
+      const result = JSON.parse((event as MessageEvent).data) as TestCaseResult;
+      results.push(result);
+      results.sort((a, b) => a.test_case_index - b.test_case_index);
+      onResult?.([...results]);
+    });
+
+    source.addEventListener('done', (event) => {
+      source.close();
+      resolve(JSON.parse((event as MessageEvent).data) as BatchSubmissionStatus);
+    });
+
+    source.onerror = () => {
+      source.close();
+      reject(new Error('Submission stream closed unexpectedly'));
+    };
+  });
+}
+
+export async function pollSubmission(
+  tokens: string[],
+  concept?: string,
+  complexity?: string,
+  onResult?: (results: TestCaseResult[]) => void
+): Promise<BatchSubmissionStatus> {
   if (!tokens.length) {
     throw new Error('No submission tokens provided');
   }
 
+  // Prefer the push stream; fall back to polling if it is unavailable
+  if (typeof EventSource !== 'undefined') {
+    try {
+      const result = await streamSubmission(tokens, onResult);
+      if (result.completed) {
+        return result;
+      }
+    } catch (error) {
+      console.warn('Submission stream failed, falling back to polling:', error);
+    }
+  }
+
   while (true) {
     console.log('Polling submissions...');
     
@@ -20,6 +20,8 @@ interface ProblemResponse {
   };
   java_boilerplate: string;
   python_boilerplate: string;
+  // Server-side registry id; /submit only needs this and the code
+  problem_id?: string | null;
 }
 
 export type { ProblemResponse };
@@ -87,4 +89,91 @@ export async function generateProblem(concept: string, complexity: string): Prom
     console.error('Network or processing error:', error);
     throw error;
   }
-} 
\ No newline at end of file
+} 
+type PartialProblem = Partial<ProblemResponse>;
+
+export type { PartialProblem };
+
+function parseStreamEvent(frame: string): { event?: string; data?: string } {
+  let event: string | undefined;
+  const data: string[] = [];
+  for (const line of frame.split('\n')) {
+    if (line.startsWith('event:')) {
+      event = line.slice(6).trim();
+    } else if (line.startsWith('data:')) {
+      data.push(line.slice(5).trim());
+    }
+  }
+  return { event, data: data.length ? data.join('\n') : undefined };
+}
+
+/**
+ * Generates a problem over the streaming endpoint (Server-Sent Events).
+ * onUpdate is called with the fields received so far, so the title and
+ * statement can be shown while test cases and boilerplate are still being
+ * generated. Resolves with the complete problem, as generateProblem would.
+ */
+export async function streamProblem(
+  concept: string,
+  complexity: string,
+  onUpdate?: (partial: PartialProblem) => void
+): Promise<ProblemResponse> {
+  const response = await fetch(`${API_BASE_URL}/problem-generator/generate/stream`, {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+    },
+    body: JSON.stringify({ concept, complexity }),
+  });
+
+  if (!response.ok || !response.body) {
+    const errorText = await response.text();
+    console.error('API Error:', errorText);
+    throw new Error(`Failed to generate problem: ${errorText}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let partial: PartialProblem = {};
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) >= 0) {
+      const frame = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      const { event, data } = parseStreamEvent(frame);
+      // Keep-alive comments carry no event
+      if (!event || data === undefined) continue;
+      const payload = JSON.parse(data);
+
+      switch (event) {
+        case 'problem':
+          await reader.cancel();
+          return payload as ProblemResponse;
+        case 'error':
+          throw new Error(`Failed to generate problem: ${payload.detail}`);
+        case 'reset':
+          // The server dropped the fields so far and is generating again
+          partial = {};
+          break;
+        case 'test_case': {
+          const testCases = [...(partial.test_cases || [])];
+          testCases[payload.index] = payload.test_case;
+          partial = { ...partial, test_cases: testCases };
+          break;
+        }
+        default:
+          // title, statement, structure, boilerplate and tags carry problem fields as-is
+          partial = { ...partial, ...payload };
+      }
+      onUpdate?.(partial);
+    }
+  }
+
+  throw new Error('Problem stream closed unexpectedly');
+}
@@ -15,35 +15,47 @@ export async function submitCode(
   language: string, 
   structure: string,
   test_cases: TestCase[],
-  concept?: string,
-  complexity?: string
+  problemId?: string | null
 ): Promise<SubmissionResponse[]> {
   console.log('=== Submission API ===');
   console.log('Request payload:', {
     language_id: language,
     source_code: code,
-    problem_id: "123",
-    structure,
-    test_cases,
-    concept,
-    complexity
+    problem_id: problemId,
+    test_case_count: test_cases.length
   });
 
-  const response = await fetch(`${API_BASE_URL}/problem-submission/submit`, {
+  // Registered problems are submitted by id; the server already holds the structure and test cases
+  const post = (body: object) => fetch(`${API_BASE_URL}/problem-submission/submit`, {
     method: "POST",
     headers: {
       "Content-Type": "application/json",
     },
-    body: JSON.stringify({
-      language_id: language,
-      source_code: code,
-      problem_id: "123",
-      structure,
-      test_cases,
-      concept,
-      complexity
-    }),
+    body: JSON.stringify(body),
   });
+  const fullBody = {
+    language_id: language,
+    source_code: code,
+    problem_id: problemId || "123",
+    structure,
+    test_cases
+  };
+
+  let response = problemId
+    ? await post({ language_id: language, source_code: code, problem_id: problemId })
+    : await post(fullBody);
+  if (problemId && response.status === 404) {
+    // The server no longer knows this problem (e.g. restarted without persistence)
+    response = await post(fullBody);
+  }
+
+  if (response.status === 429) {
+    // The judge is saturated; the backend says where we'd be in line and for how long
+    const error = await response.json().catch(() => null);
+    const message = error?.detail?.message
+      ?? `The judge is busy. Please retry in ${response.headers.get('Retry-After') ?? 'a few'} seconds.`;
+    throw new Error(message);
+  }
 
   if (!response.ok) {
     const errorText = await response.text();